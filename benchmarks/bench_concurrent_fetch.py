@@ -0,0 +1,86 @@
+"""
+Benchmark sequential vs. concurrent scheduled workout fetching.
+
+A fake Garmin client injects a fixed latency on every call, so the measured wall time
+reflects the number of sequential round trips rather than the actual Garmin Connect API.
+
+Usage: python -m benchmarks.bench_concurrent_fetch [--workouts N] [--latency SECONDS]
+"""
+
+import argparse
+import json
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from pywhooshconnect.garmin.model.garmin_workout_dto import GarminSport
+from pywhooshconnect.garmin.service.garmin_training_plan_service import (
+    GarminTrainingPlanService,
+)
+
+RESOURCES = Path(__file__).parents[1] / "tests" / "resources" / "garmin"
+START_DATE = date(2025, 1, 1)
+
+
+class LatencyGarminClient:
+    """Fake Garmin client answering every request after `latency` seconds."""
+
+    def __init__(self, workouts: int, latency: float):
+        self.workouts = workouts
+        self.latency = latency
+        with open(
+            RESOURCES / "garmin_scheduled_workout_1408447427.json", encoding="utf-8"
+        ) as f:
+            self.scheduled_workout = json.load(f)
+
+    def get_training_plans(self, active=False, sport=None):
+        time.sleep(self.latency)
+        return [{"trainingPlanId": 1}]
+
+    def get_training_plan_by_id(self, training_plan_id):
+        time.sleep(self.latency)
+        return {
+            "taskList": [
+                {
+                    "calendarDate": (START_DATE + timedelta(days=i)).isoformat(),
+                    "taskWorkout": {"workoutId": i + 1, "workoutScheduleId": i + 1},
+                }
+                for i in range(self.workouts)
+            ]
+        }
+
+    def get_scheduled_workout_by_id(self, scheduled_workout_id):
+        time.sleep(self.latency)
+        return {**self.scheduled_workout, "workoutScheduleId": scheduled_workout_id}
+
+
+def run(workouts: int, latency: float, max_workers: int) -> float:
+    service = GarminTrainingPlanService(
+        LatencyGarminClient(workouts, latency), max_workers=max_workers
+    )
+    start = time.perf_counter()
+    result = service.get_scheduled_workouts(
+        GarminSport.CYCLING,
+        from_date=START_DATE,
+        to_date=START_DATE + timedelta(days=workouts),
+    )
+    elapsed = time.perf_counter() - start
+    assert [w.workoutScheduleId for w in result] == list(range(1, workouts + 1))
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workouts", type=int, default=24)
+    parser.add_argument("--latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    baseline = run(args.workouts, args.latency, max_workers=1)
+    print(f"max_workers=1: {baseline:.3f}s")
+    for max_workers in (2, 4, 8, 16):
+        elapsed = run(args.workouts, args.latency, max_workers)
+        print(f"max_workers={max_workers}: {elapsed:.3f}s ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
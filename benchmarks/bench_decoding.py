@@ -0,0 +1,92 @@
+"""
+Benchmark the decoding of Garmin API responses into DTOs.
+
+Compares decoding the response body to dicts then validating them (`json.loads` then
+`GarminScheduledWorkout(**data)`, as the client and service do by default) with the
+single-pass validation of the raw bytes by a prebuilt `TypeAdapter`
+(`decode(GarminScheduledWorkout, data)`, the `decode_raw` path), over the fixtures in
+tests/resources/garmin. Scheduled workouts are also validated as projections
+(`GarminValidation.PROJECTION`), which skip the fields unused by the mappers.
+
+Usage: python -m benchmarks.bench_decoding [--repeat N]
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import List
+
+from pywhooshconnect.garmin.model.decoding import decode
+from pywhooshconnect.garmin.model.garmin_projection_dto import (
+    GarminScheduledWorkoutProjection,
+)
+from pywhooshconnect.garmin.model.garmin_power_zones_dto import GarminPowerZones
+from pywhooshconnect.garmin.model.garmin_scheduled_workout_dto import (
+    GarminScheduledWorkout,
+)
+from pywhooshconnect.garmin.model.garmin_training_plan_dto import (
+    GarminTrainingPlanDetail,
+)
+
+RESOURCES = Path(__file__).parents[1] / "tests" / "resources" / "garmin"
+
+# Fixture, DTO type, and the default decoding of a response to that type
+FIXTURES = [
+    (
+        "garmin_scheduled_workout_1408447448.json",
+        GarminScheduledWorkout,
+        lambda data: GarminScheduledWorkout(**json.loads(data)),
+    ),
+    (
+        "garmin_scheduled_workout_1408447427.json",
+        GarminScheduledWorkout,
+        lambda data: GarminScheduledWorkout(**json.loads(data)),
+    ),
+    (
+        "garmin_power_zones.json",
+        List[GarminPowerZones],
+        lambda data: [GarminPowerZones(**p) for p in json.loads(data)],
+    ),
+    (
+        "training_plan_details.json",
+        GarminTrainingPlanDetail,
+        json.loads,
+    ),
+]
+
+
+def measure(fn, data: bytes, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(data)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    for filename, type_, decode_dict in FIXTURES:
+        data = (RESOURCES / filename).read_bytes()
+        from_dict = measure(decode_dict, data, args.repeat)
+        from_bytes = measure(lambda d: decode(type_, d), data, args.repeat)
+        print(
+            f"{filename:>42}: dict {from_dict * 1e6:8.1f} us, "
+            f"raw {from_bytes * 1e6:8.1f} us ({from_dict / from_bytes:4.1f}x)"
+        )
+        if type_ is GarminScheduledWorkout:
+            projection = measure(
+                lambda d: decode(GarminScheduledWorkoutProjection, d),
+                data,
+                args.repeat,
+            )
+            print(
+                f"{'':>42}  raw projection {projection * 1e6:8.1f} us "
+                f"({from_dict / projection:4.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark MyWhoosh workout serialization to a file.
+
+Compares the former three-pass encoding (`pydantic_encoder` dump, parse back, re-encode
+with indentation) with the single-pass `MyWhooshWorkout.to_json_bytes`, on a workout with
+many steps. Reports the wall time and the peak memory allocated by each.
+
+Usage: python -m benchmarks.bench_serialization [--steps N] [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+from pywhooshconnect.mywhoosh.model.mywhoosh_workout_dto import (
+    MyWhooshWorkout,
+    MyWhooshWorkoutStep,
+    MyWhooshWorkoutSteps,
+)
+
+
+def build_workout(steps: int) -> MyWhooshWorkout:
+    return MyWhooshWorkout(
+        Name="Benchmark",
+        Description="Workout with many steps",
+        StepCount=steps,
+        Time=steps * 60,
+        WorkoutStepsArray=[
+            MyWhooshWorkoutStep(
+                IntervalId=0,
+                StepType="E_Normal",
+                Id=i,
+                WorkoutMessage=[f"Step {i}"],
+                Rpm=90,
+                Power=0.5 + (i % 7) / 10,
+                Pace=0,
+                StartPower=0,
+                EndPower=0,
+                Time=60,
+                IsManualGrade=False,
+                ManualGradeValue=0,
+                ShowAveragePower=True,
+                FlatRoad=0,
+            )
+            for i in range(1, steps + 1)
+        ],
+    )
+
+
+def write_three_pass(workout: MyWhooshWorkout, path: str) -> None:
+    from pydantic.json import pydantic_encoder
+
+    def encoder(value):
+        # Steps were a plain list when this encoding was used
+        if isinstance(value, MyWhooshWorkoutSteps):
+            return list(value)
+        return pydantic_encoder(value)
+
+    data = json.loads(json.dumps(workout, default=encoder))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+
+
+def write_single_pass(workout: MyWhooshWorkout, path: str) -> None:
+    with open(path, "wb") as f:
+        f.write(workout.to_json_bytes(pretty=True))
+
+
+def measure(write, workout: MyWhooshWorkout, path: str, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        write(workout, path)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    write(workout, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    workout = build_workout(args.steps)
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        for label, write in (
+            ("three-pass", write_three_pass),
+            ("single-pass", write_single_pass),
+        ):
+            elapsed, peak = measure(write, workout, path, args.repeat)
+            print(
+                f"{label:>12}: {elapsed * 1000:8.1f} ms, "
+                f"peak {peak / 1024 / 1024:6.1f} MiB ({args.steps} steps)"
+            )
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark the memory held by generic workout steps and MyWhoosh workout steps.
+
+Builds a season-sized number of steps and reports the bytes allocated per step, as
+measured by tracemalloc, for the slotted step classes and for equivalent dataclasses
+with a per-instance __dict__ (the former layout).
+
+Usage: python -m benchmarks.bench_step_memory [--steps N]
+"""
+
+import argparse
+import dataclasses
+import tracemalloc
+
+import pydantic.dataclasses
+
+from pywhooshconnect.common.model.generic_workout import (
+    GenericAtomicStep,
+    GenericIntervalStep,
+)
+from pywhooshconnect.common.model.generic_workout_step import StepType
+from pywhooshconnect.mywhoosh.model.mywhoosh_workout_dto import MyWhooshWorkoutStep
+
+DESCRIPTIONS = ["Warm up", "Hard interval", "Recovery", "Cool down"]
+
+
+def unslotted(cls, pydantic_dataclass: bool = False):
+    """Copy of a slotted dataclass whose instances have a __dict__."""
+    fields = dataclasses.fields(cls)
+    namespace = {
+        "__annotations__": {f.name: f.type for f in fields},
+        **{f.name: f.default for f in fields if f.default is not dataclasses.MISSING},
+    }
+    plain = dataclasses.dataclass(type(cls.__name__, (), namespace))
+    return pydantic.dataclasses.dataclass(plain) if pydantic_dataclass else plain
+
+
+def generic_steps(count: int, atomic=GenericAtomicStep, interval=GenericIntervalStep):
+    return [
+        (interval if i % 2 else atomic)(
+            step_id=i,
+            duration_in_seconds=60 + i % 300,
+            power_zone=1 + i % 7,
+            type=StepType.INTERVAL,
+            description=DESCRIPTIONS[i % len(DESCRIPTIONS)],
+            rpm=90,
+        )
+        for i in range(count)
+    ]
+
+
+def mywhoosh_steps(count: int, step_class=MyWhooshWorkoutStep) -> list:
+    return [
+        step_class(
+            IntervalId=0,
+            StepType="E_Normal",
+            Id=i,
+            WorkoutMessage=[DESCRIPTIONS[i % len(DESCRIPTIONS)]],
+            Rpm=90.0,
+            Power=0.5 + (i % 7) / 10,
+            Pace=0.0,
+            StartPower=0.0,
+            EndPower=0.0,
+            Time=60 + i % 300,
+            IsManualGrade=False,
+            ManualGradeValue=0.0,
+            ShowAveragePower=True,
+            FlatRoad=0,
+        )
+        for i in range(count)
+    ]
+
+
+def bytes_per_object(build, count: int) -> float:
+    tracemalloc.start()
+    objects = build(count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=200_000)
+    args = parser.parse_args()
+
+    dict_atomic, dict_interval = unslotted(GenericAtomicStep), unslotted(
+        GenericIntervalStep
+    )
+    dict_mywhoosh = unslotted(MyWhooshWorkoutStep, pydantic_dataclass=True)
+
+    for label, build in (
+        ("generic step", generic_steps),
+        (
+            "generic step (__dict__)",
+            lambda n: generic_steps(n, dict_atomic, dict_interval),
+        ),
+        ("MyWhoosh step", mywhoosh_steps),
+        ("MyWhoosh step (__dict__)", lambda n: mywhoosh_steps(n, dict_mywhoosh)),
+    ):
+        print(f"{label:>24}: {bytes_per_object(build, args.steps):6.0f} bytes per step")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ import os
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from dotenv import load_dotenv
 from garminconnect import GarminConnectAuthenticationError
@@ -12,8 +12,24 @@ from rich.console import Console
 
 from pywhooshconnect import __title__, __version__, __description__
 from pywhooshconnect.garmin.client.GarminClient import GarminClient
+from pywhooshconnect.garmin.client.response_cache import ResponseCache
+from pywhooshconnect.garmin.client.token_store import TokenStore
+from pywhooshconnect.garmin.model.decoding import GarminValidation
 from pywhooshconnect.garmin.model.garmin_workout_dto import GarminSport
-from pywhooshconnect.service.workout_sync_service import GarminToMyWhooshWorkoutSyncService
+from pywhooshconnect.garmin.service.garmin_training_plan_service import GarminFetchStrategy
+from pywhooshconnect.service.conversion_cache import ConversionCache
+from pywhooshconnect.service.job_queue import JobQueue, JobStatus, run_worker_processes
+from pywhooshconnect.service.roster_sync_service import (
+    RosterAccount,
+    RosterError,
+    RosterSyncService,
+    format_report,
+    load_roster,
+)
+from pywhooshconnect.service.workout_sync_service import (
+    GarminToMyWhooshWorkoutSyncService,
+    rerender_workouts,
+)
 
 console = Console()
 load_dotenv()
@@ -27,6 +43,13 @@ def run_sync_logic(
         to_date: Optional[str],
         output_dir: Optional[str],
         config_file: Optional[str],
+        jobs: int = 1,
+        no_cache: bool = False,
+        refresh: bool = False,
+        token_dir: Optional[str] = None,
+        fetch_strategy: str = "training_plan",
+        full_sync: bool = False,
+        validation: str = "full",
 ):
     """
     Main function containing the application's synchronization and integration logic.
@@ -51,9 +74,11 @@ def run_sync_logic(
         if not user:
             user = input("Enter Garmin username: ")
 
+    # The password is only needed when there is no saved login session
+    token_store = TokenStore(token_dir, user=user)
     if not password:
         password = os.getenv("GARMIN_PASSWORD")
-        if not password:
+        if not password and not token_store.has_tokens():
             password = getpass.getpass("Enter Garmin password: ")
 
     config_path = Path(config_file).expanduser() if config_file else None
@@ -62,6 +87,10 @@ def run_sync_logic(
     else:
         print("Configuration file not found or not specified. Using default values.")
 
+    if jobs < 1:
+        print("Error: --jobs must be at least 1.")
+        sys.exit(1)
+
     if not output_dir:
         output_dir = "~/downloads/"
 
@@ -74,7 +103,13 @@ def run_sync_logic(
     # Authenticate with Garmin Connect
     try:
         with console.status(f"[bold green]Logging in as '{user}'...", spinner="dots"):
-            client = GarminClient(user, password)
+            response_cache = None if no_cache else ResponseCache(refresh=refresh)
+            client = GarminClient(
+                user,
+                password,
+                response_cache=response_cache,
+                token_store=token_store,
+            )
             client.login()
         console.print(f"[green]✓[/green] Successfully logged in as '{user}'")
     except GarminConnectAuthenticationError as e:
@@ -82,14 +117,131 @@ def run_sync_logic(
         sys.exit(1)
 
     # Sync and download workouts
-    sync_service = GarminToMyWhooshWorkoutSyncService(client)
+    sync_service = GarminToMyWhooshWorkoutSyncService(
+        client,
+        max_workers=jobs,
+        fetch_strategy=GarminFetchStrategy(fetch_strategy),
+        validation=GarminValidation(validation),
+        conversion_cache=None if no_cache else ConversionCache(),
+    )
     sync_service.sync_and_download_workouts(
         sport=sport,
         from_date=start_date,
         to_date=end_date,
         output_dir=str(output_path),
         config_file=config_file,
+        full_sync=full_sync,
+    )
+
+
+def run_rerender_logic(output_dir: Optional[str], config_file: Optional[str]):
+    """
+    Render the workouts of an output directory again with a new configuration, from the
+    cached conversions of the last synchronization and without Garmin Connect.
+    """
+    output_path = Path(output_dir or "~/downloads/").expanduser()
+    config_path = Path(config_file).expanduser() if config_file else None
+    try:
+        written = rerender_workouts(output_path, ConversionCache(), config_file=config_path)
+    except ValueError as e:
+        print(f"Error: {e}. Run a synchronization first.")
+        sys.exit(1)
+    print(f"{len(written)} workouts rendered again")
+
+
+def run_roster_logic(
+        roster_file: str,
+        from_date: Optional[str],
+        to_date: Optional[str],
+        jobs: int = 1,
+        max_accounts: int = RosterSyncService.DEFAULT_MAX_CONCURRENT_ACCOUNTS,
+        no_cache: bool = False,
+        refresh: bool = False,
+        full_sync: bool = False,
+        queue_file: Optional[str] = None,
+        processes: int = 1,
+        requeue: bool = False,
+):
+    """
+    Synchronize the workouts of every account of a roster file concurrently.
+    """
+    try:
+        start_date = datetime.strptime(from_date, "%Y-%m-%d") if from_date else None
+        end_date = datetime.strptime(to_date, "%Y-%m-%d") if to_date else None
+    except ValueError:
+        print("Error: Date format must be YYYY-MM-DD.")
+        sys.exit(1)
+
+    if jobs < 1 or max_accounts < 1:
+        print("Error: --jobs and --max-accounts must be at least 1.")
+        sys.exit(1)
+
+    try:
+        accounts = load_roster(roster_file)
+    except (FileNotFoundError, RosterError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Synchronizing {len(accounts)} accounts from: {roster_file}")
+
+    if queue_file:
+        run_queue_logic(queue_file, roster_file, accounts, start_date, end_date, jobs, processes,
+                        no_cache, refresh, requeue)
+        return
+
+    roster_service = RosterSyncService(
+        accounts,
+        max_concurrent_accounts=max_accounts,
+        max_workers=jobs,
+        response_cache=None if no_cache else ResponseCache(refresh=refresh),
+        conversion_cache=None if no_cache else ConversionCache(),
     )
+    results = roster_service.sync_and_download_workouts(
+        from_date=start_date,
+        to_date=end_date,
+        full_sync=full_sync,
+    )
+    print(format_report(results))
+    if not all(result.succeeded for result in results):
+        sys.exit(1)
+
+
+def run_queue_logic(
+        queue_file: str,
+        roster_file: str,
+        accounts: List[RosterAccount],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        jobs: int = 1,
+        processes: int = 1,
+        no_cache: bool = False,
+        refresh: bool = False,
+        requeue: bool = False,
+):
+    """
+    Add a job per roster account to a persistent job queue, and run the unfinished jobs
+    of the queue in worker processes. Jobs left by an interrupted run are resumed, and
+    jobs already done are not run again unless `requeue`.
+    """
+    if processes < 1:
+        print("Error: --processes must be at least 1.")
+        sys.exit(1)
+
+    start_date = start_date or datetime.today()
+    end_date = end_date or (start_date + timedelta(days=7))
+    queue = JobQueue(queue_file)
+    job_ids = [queue.enqueue(account.name, start_date, end_date, requeue) for account in accounts]
+    print(f"Running {queue.unfinished()} jobs of {queue.path} in {processes} processes")
+
+    run_worker_processes(queue.path, roster_file, processes=processes, max_workers=jobs,
+                         use_cache=not no_cache, refresh=refresh)
+
+    failed = 0
+    for job_id in job_ids:
+        job = queue.get(job_id)
+        print(f"{job.account}: {job.status.value}" + (f" ({job.error})" if job.error else ""))
+        failed += job.status == JobStatus.FAILED
+    if failed:
+        sys.exit(1)
 
 
 def default_from_date():
@@ -152,9 +304,113 @@ def main():
         default=None,
         help="Path to the YAML configuration file (power zones, lap button duration, etc.)",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Maximum number of workouts fetched concurrently from Garmin Connect.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or store Garmin Connect responses and converted workouts in the on-disk caches.",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached Garmin Connect responses and refresh the cache.",
+    )
+    parser.add_argument(
+        "--fetch-strategy",
+        type=str,
+        choices=[s.value for s in GarminFetchStrategy],
+        default=GarminFetchStrategy.TRAINING_PLAN.value,
+        help="How scheduled workouts are found: from the task list of the active training "
+        "plans, or from the Garmin Connect calendar (fewer requests for long ranges).",
+    )
+    parser.add_argument(
+        "--token-dir",
+        type=str,
+        default=None,
+        help="Directory where the Garmin Connect login session is saved between runs "
+        "(default: $GARMINTOKENS/<user> or ~/.garminconnect/<user>).",
+    )
+    parser.add_argument(
+        "--full-sync",
+        action="store_true",
+        help="Rewrite all the workouts of the date range, even those unchanged since the "
+        "last sync.",
+    )
+    parser.add_argument(
+        "--validation",
+        type=str,
+        choices=[v.value for v in GarminValidation],
+        default=GarminValidation.FULL.value,
+        help="Validate every field of the Garmin workouts, or only the fields used by the "
+        "conversion (faster). Run with 'python -X dev' to also fully validate a sample.",
+    )
+
+    parser.add_argument(
+        "--rerender",
+        action="store_true",
+        help="Render the workouts of the output directory again with the configuration "
+        "file, from the cached conversions and without connecting to Garmin Connect.",
+    )
+
+    parser.add_argument(
+        "--roster",
+        type=str,
+        default=None,
+        help="YAML file listing several Garmin Connect accounts to synchronize "
+        "concurrently, each into its own output directory.",
+    )
+    parser.add_argument(
+        "--max-accounts",
+        type=int,
+        default=RosterSyncService.DEFAULT_MAX_CONCURRENT_ACCOUNTS,
+        help="Maximum number of roster accounts synchronized at once.",
+    )
+    parser.add_argument(
+        "--queue",
+        type=str,
+        default=None,
+        help="SQLite job queue of the roster sync: each account is a job, run by worker "
+        "processes and retried on failure. An interrupted sync resumes where it stopped.",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=2,
+        help="Number of worker processes running the jobs of --queue.",
+    )
+    parser.add_argument(
+        "--requeue",
+        action="store_true",
+        help="Run again the jobs of --queue already done for the same accounts and dates.",
+    )
 
     args = parser.parse_args()
 
+    if args.roster:
+        run_roster_logic(
+            args.roster,
+            args.from_date,
+            args.to_date,
+            args.jobs,
+            args.max_accounts,
+            args.no_cache,
+            args.refresh,
+            args.full_sync,
+            args.queue,
+            args.processes,
+            args.requeue,
+        )
+        return
+
+    if args.rerender:
+        run_rerender_logic(args.output_dir, args.config_file)
+        return
+
     # Call the core application logic
     run_sync_logic(
         args.user,
@@ -164,6 +420,13 @@ def main():
         args.to_date,
         args.output_dir,
         args.config_file,
+        args.jobs,
+        args.no_cache,
+        args.refresh,
+        args.token_dir,
+        args.fetch_strategy,
+        args.full_sync,
+        args.validation,
     )
 
 
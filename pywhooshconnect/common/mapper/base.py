@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import TypeVar, Generic, Optional
+from dataclasses import dataclass, field
+from typing import Any, TypeVar, Generic, Optional
 
 from pywhooshconnect.common.model.power_zones import PowerZones
 from pywhooshconnect.mywhoosh.mapper.power_zones_config import PowerZoneConfig
@@ -13,10 +13,15 @@ class MapperOptions(ABC):
     """Base class for mapper options."""
 
 
-@dataclass
+@dataclass(frozen=True)
 class PowerZonesOptions(MapperOptions):
     power_zones: PowerZones
     config: PowerZoneConfig = PowerZoneConfig()
+    # Values the mappers compile from the options, by key (e.g. the MyWhoosh power of
+    # each zone). The options and their power zones are immutable, so they never go stale.
+    compiled: dict[Any, Any] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
 
 class BaseMapper(ABC, Generic[TSource, TTarget]):
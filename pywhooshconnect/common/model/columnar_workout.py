@@ -0,0 +1,217 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Optional, Protocol, Sequence
+
+from pywhooshconnect.common.model.generic_workout import (
+    GenericAtomicStep,
+    GenericIntervalStep,
+    GenericStepWithIntervals,
+    GenericWorkout,
+)
+from pywhooshconnect.common.model.generic_workout_step import StepType
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NO_GROUP = -1  # group id of the steps not repeated in a group
+NO_VALUE = -1  # rpm of the steps without a target cadence
+FREE_RIDE_ZONE = 0  # zone of the steps without a power zone
+
+
+class ZoneTargets(Protocol):
+    """
+    Target of each power zone: a free ride at index 0, then Z1 to Z7. Implemented by
+    `PowerTargetTable` for MyWhoosh powers.
+    """
+
+    @property
+    def targets(self) -> Sequence[float]: ...
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "numpy is required for ColumnarWorkout. "
+            "Install it with: pip install pywhooshconnect[numpy]"
+        )
+
+
+@dataclass(frozen=True, eq=False)
+class ColumnarWorkout:
+    """
+    Columnar representation of a `GenericWorkout`, for analysing many workouts at once.
+
+    Every atomic step and every interval of a step with intervals is a row of parallel
+    arrays. The rows of a step with intervals (a repeat group) are contiguous and share
+    the same `group_ids` value, which indexes the `group_*` arrays. Conversion to and
+    from `GenericWorkout` is lossless for workouts made of atomic steps and steps with
+    intervals.
+
+    Requires numpy (pip install pywhooshconnect[numpy]).
+    """
+
+    name: str
+    description: str
+    sport: str
+    scheduled_date: Optional[date]
+
+    # One value per row
+    step_ids: "np.ndarray"
+    durations: "np.ndarray"  # seconds
+    zones: "np.ndarray"  # FREE_RIDE_ZONE for steps without a power zone
+    types: "np.ndarray"  # StepType values
+    rpms: "np.ndarray"  # NO_VALUE for steps without a target cadence
+    group_ids: "np.ndarray"  # NO_GROUP for atomic steps
+    descriptions: tuple[Optional[str], ...]
+
+    # One value per repeat group
+    group_step_ids: "np.ndarray"
+    group_types: "np.ndarray"
+    group_iterations: "np.ndarray"
+    group_starts: "np.ndarray"  # index of the first row
+    group_lengths: "np.ndarray"  # number of rows
+    group_descriptions: tuple[Optional[str], ...]
+
+    @classmethod
+    def from_workout(cls, workout: GenericWorkout) -> "ColumnarWorkout":
+        _require_numpy()
+
+        rows, groups = [], []
+        for step in workout.steps:
+            if isinstance(step, GenericAtomicStep):
+                rows.append((step, NO_GROUP))
+            elif isinstance(step, GenericStepWithIntervals):
+                for interval in step.steps:
+                    if not isinstance(interval, GenericIntervalStep):
+                        raise TypeError(f"{type(interval)} not supported in a group")
+                    rows.append((interval, len(groups)))
+                groups.append((step, len(rows) - len(step.steps)))
+            else:
+                raise TypeError(f"{type(step)} not supported")
+
+        def column(values, dtype):
+            return np.fromiter(values, dtype=dtype, count=len(rows))
+
+        def group_column(values, dtype):
+            return np.fromiter(values, dtype=dtype, count=len(groups))
+
+        return cls(
+            name=workout.name,
+            description=workout.description,
+            sport=workout.sport,
+            scheduled_date=workout.scheduled_date,
+            step_ids=column((s.step_id for s, _ in rows), np.int64),
+            durations=column((s.duration_in_seconds for s, _ in rows), np.int64),
+            zones=column(
+                (
+                    FREE_RIDE_ZONE if s.power_zone is None else s.power_zone
+                    for s, _ in rows
+                ),
+                np.int8,
+            ),
+            types=column((s.type.value for s, _ in rows), np.int8),
+            rpms=column(
+                (NO_VALUE if s.rpm is None else s.rpm for s, _ in rows), np.int32
+            ),
+            group_ids=column((g for _, g in rows), np.int32),
+            descriptions=tuple(s.description for s, _ in rows),
+            group_step_ids=group_column((g.step_id for g, _ in groups), np.int64),
+            group_types=group_column((g.type.value for g, _ in groups), np.int8),
+            group_iterations=group_column((g.iterations for g, _ in groups), np.int32),
+            group_starts=group_column((start for _, start in groups), np.int64),
+            group_lengths=group_column((len(g.steps) for g, _ in groups), np.int64),
+            group_descriptions=tuple(g.description for g, _ in groups),
+        )
+
+    def to_workout(self) -> GenericWorkout:
+        def optional(value: int, missing: int) -> Optional[int]:
+            return None if value == missing else int(value)
+
+        def row(i: int, step_class):
+            return step_class(
+                step_id=int(self.step_ids[i]),
+                duration_in_seconds=int(self.durations[i]),
+                power_zone=optional(self.zones[i], FREE_RIDE_ZONE),
+                type=StepType(int(self.types[i])),
+                description=self.descriptions[i],
+                rpm=optional(self.rpms[i], NO_VALUE),
+            )
+
+        # Rebuild the top-level steps in row order; a group comes before its first row
+        group_at = {int(start): g for g, start in enumerate(self.group_starts)}
+        empty_groups_at = {}
+        for g in np.flatnonzero(self.group_lengths == 0):
+            empty_groups_at.setdefault(int(self.group_starts[g]), []).append(int(g))
+
+        steps = []
+        for i in range(len(self.step_ids) + 1):
+            for g in empty_groups_at.get(i, []):
+                steps.append(self._group(g, []))
+            if i == len(self.step_ids):
+                break
+            if self.group_ids[i] == NO_GROUP:
+                steps.append(row(i, GenericAtomicStep))
+            elif group_at.get(i) == self.group_ids[i]:
+                g = int(self.group_ids[i])
+                intervals = range(i, i + int(self.group_lengths[g]))
+                steps.append(
+                    self._group(g, [row(j, GenericIntervalStep) for j in intervals])
+                )
+
+        return GenericWorkout(
+            name=self.name,
+            description=self.description,
+            steps=steps,
+            sport=self.sport,
+            scheduled_date=self.scheduled_date,
+        )
+
+    def _group(
+        self, g: int, intervals: list[GenericIntervalStep]
+    ) -> GenericStepWithIntervals:
+        return GenericStepWithIntervals(
+            step_id=int(self.group_step_ids[g]),
+            type=StepType(int(self.group_types[g])),
+            steps=intervals,
+            iterations=int(self.group_iterations[g]),
+            description=self.group_descriptions[g],
+        )
+
+    def repetitions(self) -> "np.ndarray":
+        """Number of times each row is repeated: its group's iterations, or 1."""
+        iterations = np.append(self.group_iterations, 1)
+        return iterations[self.group_ids]  # NO_GROUP (-1) indexes the appended 1
+
+    def duration(self) -> timedelta:
+        """Vectorized `GenericWorkout.duration`."""
+        # A group with no iterations lasts one iteration, as in GenericStepWithIntervals
+        iterations = np.append(np.maximum(self.group_iterations, 1), 1)
+        seconds = self.durations @ iterations[self.group_ids]
+        return timedelta(seconds=int(seconds))
+
+    def number_of_intervals(self) -> int:
+        """Vectorized `GenericWorkout.number_of_intervals`."""
+        return int(self.repetitions().sum())
+
+    def flatten_order(self) -> "np.ndarray":
+        """Row indices of the steps as played, with the repeat groups expanded."""
+        segments = [
+            (int(row), np.array([row]))
+            for row in np.flatnonzero(self.group_ids == NO_GROUP)
+        ]
+        for g, (start, length) in enumerate(zip(self.group_starts, self.group_lengths)):
+            rows = np.arange(start, start + length)
+            segments.append((int(start), np.tile(rows, int(self.group_iterations[g]))))
+        segments.sort(key=lambda segment: segment[0])
+        if not segments:
+            return np.array([], dtype=np.int64)
+        return np.concatenate([rows for _, rows in segments]).astype(np.int64)
+
+    def power_targets(self, zone_targets: ZoneTargets) -> "np.ndarray":
+        """
+        Target of each row, looked up by zone, e.g. the MyWhoosh power mapped by
+        `GenericToMyWhooshPowerMapper` for a `PowerTargetTable`.
+        """
+        return np.asarray(zone_targets.targets, dtype=float)[self.zones]
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import timedelta, date
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pywhooshconnect.common.model.generic_workout_step import (
     GenericWorkoutStep,
@@ -9,7 +9,7 @@ from pywhooshconnect.common.model.generic_workout_step import (
 from pywhooshconnect.common.model.workout_step_utils import StepContainerMixin
 
 
-@dataclass
+@dataclass(slots=True)
 class GenericAtomicStep(GenericWorkoutStep):
     step_id: int
     duration_in_seconds: int
@@ -23,7 +23,7 @@ class GenericAtomicStep(GenericWorkoutStep):
         return timedelta(seconds=self.duration_in_seconds)
 
 
-@dataclass
+@dataclass(slots=True)
 class GenericIntervalStep(GenericWorkoutStep):
     step_id: int
     duration_in_seconds: int
@@ -37,7 +37,7 @@ class GenericIntervalStep(GenericWorkoutStep):
         return timedelta(seconds=self.duration_in_seconds)
 
 
-@dataclass
+@dataclass(slots=True)
 class GenericStepWithIntervals(GenericWorkoutStep, StepContainerMixin):
     step_id: int
     type: StepType
@@ -47,15 +47,19 @@ class GenericStepWithIntervals(GenericWorkoutStep, StepContainerMixin):
 
     @property
     def duration_in_seconds(self) -> int:
-        total = sum(i.duration_in_seconds for i in self.steps or [])
-        return total * (self.iterations or 1)
+        return self._cached(
+            "duration_in_seconds",
+            lambda: sum(i.duration_in_seconds for i in self.steps or [])
+            * (self.iterations or 1),
+            self.iterations,
+        )
 
     @property
     def duration(self) -> timedelta:
         return timedelta(seconds=self.duration_in_seconds)
 
     def get_interval_by_id(self, interval_id: int) -> GenericIntervalStep:
-        return next(step for step in self.steps if step.step_id == interval_id)
+        return self.get_step_by_id(interval_id)
 
 
 @dataclass
@@ -66,29 +70,52 @@ class GenericWorkout(StepContainerMixin):
     sport: str = "cycling"
     scheduled_date: Optional[date] = None
 
-    def get_step_by_id(self, step_id: int) -> GenericWorkoutStep:
-        return next(step for step in self.steps if step.step_id == step_id)
-
     def duration(self) -> timedelta:
-        return sum((step.duration for step in self.steps), timedelta())
+        return self._cached(
+            "duration", lambda: sum((step.duration for step in self.steps), timedelta())
+        )
 
     def number_of_intervals(self):
-        return sum(
-            (
-                len(step.steps) * step.iterations
-                if isinstance(step, GenericStepWithIntervals)
-                else 1
-            )
-            for step in self.steps
+        return self._cached(
+            "number_of_intervals",
+            lambda: sum(
+                (
+                    len(step.steps) * step.iterations
+                    if isinstance(step, GenericStepWithIntervals)
+                    else 1
+                )
+                for step in self.steps
+            ),
         )
 
+    def time_in_zones(self) -> Dict[Optional[int], timedelta]:
+        """Time spent in each power zone (None for free rides), in workout order."""
+        if not self._steps_numbered():
+            self.reindex_steps()
+        return dict(self._cached("time_in_zones", self._time_in_zones))
+
     def flatten_steps(self) -> List[GenericWorkoutStep]:
         """
         Returns a flat list of all atomic/interval steps with expanded repetitions.
         Steps with intervals are expanded according to their iteration count.
         """
-        self.reindex_steps()
+        return list(self._flat_steps())
+
+    def _flat_steps(self) -> List[GenericWorkoutStep]:
+        """Cached flat list of steps, not to be modified."""
+        if not self._steps_numbered():
+            self.reindex_steps()
+        return self._cached("flatten_steps", self._flatten_steps)
+
+    def _time_in_zones(self) -> Dict[Optional[int], timedelta]:
+        seconds = {}
+        for step in self._flat_steps():
+            seconds[step.power_zone] = (
+                seconds.get(step.power_zone, 0) + step.duration_in_seconds
+            )
+        return {zone: timedelta(seconds=s) for zone, s in seconds.items()}
 
+    def _flatten_steps(self) -> List[GenericWorkoutStep]:
         flat_steps = []
         for step in self.steps:
             if isinstance(step, GenericStepWithIntervals):
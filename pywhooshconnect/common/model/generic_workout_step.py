@@ -15,6 +15,9 @@ class StepType(Enum):
 
 
 class GenericWorkoutStep(ABC):
+    # Concrete steps are slotted dataclasses: keep the base free of a per-instance __dict__
+    __slots__ = ()
+
     step_id: int
     type: StepType
     description: Optional[str]
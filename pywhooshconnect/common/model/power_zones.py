@@ -1,5 +1,11 @@
 import math
 from dataclasses import dataclass
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 def _validate_zone(zone: int) -> None:
@@ -7,7 +13,15 @@ def _validate_zone(zone: int) -> None:
         raise ValueError("Zone must be between 1 and 7")
 
 
-@dataclass
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "numpy is required to classify power streams. "
+            "Install it with: pip install pywhooshconnect[numpy]"
+        )
+
+
+@dataclass(frozen=True)
 class PowerZones:
     """Power zones based on FTP (Functional Threshold Power) ratios.
 
@@ -82,8 +96,9 @@ class PowerZones:
         Returns:
             Zone number (1-7), or 0 if below Z1
         """
+        zone_floors = self.zone_floors()
         for zone in range(7, 0, -1):
-            if ftp_ratio >= self.zone_floors()[zone]:
+            if ftp_ratio >= zone_floors[zone]:
                 return zone
         return 0
 
@@ -110,3 +125,55 @@ class PowerZones:
             6: self.z6_floor,
             7: self.z7_floor,
         }
+
+    def classify_ftp_ratios(self, ftp_ratios: Any) -> "np.ndarray":
+        """Vectorized `get_zone_by_ftp_ratio`.
+
+        Args:
+            ftp_ratios: Array (or any sequence or buffer) of powers as ratios of FTP
+
+        Returns:
+            Array of zone numbers (1-7, or 0 if below Z1), with the same shape as the input
+
+        Raises:
+            ImportError: If numpy is not installed
+        """
+        _require_numpy()
+        floors = np.fromiter(self.zone_floors().values(), dtype=float, count=7)
+        ratios = np.asarray(ftp_ratios, dtype=float)
+        # Number of floors lower than or equal to each ratio, i.e. its zone
+        zones = np.searchsorted(floors, ratios, side="right")
+        # NaN sorts after every floor, but is below Z1 for `get_zone_by_ftp_ratio`
+        return np.where(np.isnan(ratios), 0, zones).astype(np.int8)
+
+    def classify_power(self, power: Any) -> "np.ndarray":
+        """Vectorized `get_zone_by_power`.
+
+        Args:
+            power: Array (or any sequence or buffer) of power outputs in watts, e.g. a
+                power stream
+
+        Returns:
+            Array of zone numbers (1-7, or 0 if below Z1), with the same shape as the input
+
+        Raises:
+            ImportError: If numpy is not installed
+        """
+        _require_numpy()
+        return self.classify_ftp_ratios(np.asarray(power, dtype=float) / self.ftp)
+
+    def time_in_zones(self, power: Any, sample_seconds: float = 1) -> "np.ndarray":
+        """Time spent in each zone by a power stream sampled at a fixed interval.
+
+        Args:
+            power: Power stream in watts
+            sample_seconds: Interval between two samples. Defaults to 1 second (1 Hz).
+
+        Returns:
+            Array of 8 durations in seconds: below Z1 at index 0, then Z1 to Z7
+
+        Raises:
+            ImportError: If numpy is not installed
+        """
+        zones = self.classify_power(power).ravel()
+        return np.bincount(zones, minlength=8) * sample_seconds
@@ -1,26 +1,101 @@
+import weakref
 from abc import ABC
-from typing import Generic, List, TypeVar
+from contextlib import contextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+)
 
 from pywhooshconnect.common.model.generic_workout import GenericWorkoutStep
 
 T = TypeVar("T", bound=GenericWorkoutStep)
+V = TypeVar("V")
+
+
+def _reference(container: "StepContainerMixin") -> Callable[[], Any]:
+    """Weak reference to a container, or a strong one if it cannot be weakly referenced."""
+    try:
+        return weakref.ref(container)
+    except TypeError:  # slotted without __weakref__
+        return lambda: container
 
 
 class StepContainerMixin(ABC, Generic[T]):
     """
     Mixin for managing a list of GenericWorkoutStep steps with automatic step_id reindexing.
 
+    The mixin keeps an index of the steps by step_id, so that lookups and appends are
+    O(1), and caches values computed from the steps (see `_cached`). Both are refreshed
+    whenever steps change through the mixin, or `steps` is replaced or resized. Steps
+    edited in place (step_id, duration, iterations...) must be followed by a call to
+    `reindex_steps`. Changes of a nested container also refresh the values cached by
+    the containers computed from it.
+
     Attributes:
         steps (List[T]): The list of contained steps.
     """
 
-    steps: List[T]
+    # Index state, kept in slots so that slotted steps have no __dict__:
+    # - _step_index: position of each step_id in `steps` (first occurrence)
+    # - _indexed_steps: the `steps` list and length the index was built for
+    # - _steps_reindexed: True if step_ids are known to be 1..n, in order
+    # - _batch_depth: number of nested `batch_edit` contexts
+    # - _cache: values computed from the steps, with the state they were computed in
+    # - _version: number of changes of the steps through the mixin
+    # - _parents: references to the containers that cached values computed from this one
+    __slots__ = (
+        "_step_index",
+        "_indexed_steps",
+        "_steps_reindexed",
+        "_batch_depth",
+        "_cache",
+        "_version",
+        "_parents",
+    )
+
+    if TYPE_CHECKING:
+        # Declared by the dataclasses using the mixin, not a slot of the mixin
+        steps: List[T]
 
     def add_step(self, step: T) -> None:
         """Add a new step at the end of the list and reindex step_ids."""
+        if self._in_batch():
+            self.steps.append(step)
+            self._steps_changed()
+            return
+
+        # Appending after steps numbered 1..n needs no sort: number it n + 1
+        if self._steps_numbered():
+            if not self.steps or step.step_id >= self.steps[-1].step_id:
+                self.steps.append(step)
+                step.step_id = len(self.steps)
+                self._step_index.setdefault(step.step_id, len(self.steps) - 1)
+                self._indexed_steps = (self.steps, len(self.steps))
+                self._steps_changed()
+                return
+
         self.steps.append(step)
         self.reindex_steps()
 
+    def extend_steps(self, steps: Iterable[T]) -> None:
+        """
+        Add several steps at the end of the list, and reindex step_ids once.
+
+        Same as calling `add_step` for each step when their step_ids are increasing.
+        """
+        self.steps.extend(steps)
+        if self._in_batch():
+            self._steps_changed()
+        else:
+            self.reindex_steps()
+
     def remove_step(self, step_id: int | None = None) -> None:
         """
         Remove the last step or a specific step by step_id, then reindex step_ids.
@@ -29,20 +104,153 @@ class StepContainerMixin(ABC, Generic[T]):
             step_id (int | None): The step_id of the item to remove.
                                   If None, removes the last item.
         """
+        if step_id is None and not self.steps:
+            raise ValueError("No steps to remove.")
+
+        if self._in_batch():
+            if step_id is not None:
+                self.steps[:] = [i for i in self.steps if i.step_id != step_id]
+            else:
+                self.steps.pop()
+            self._steps_changed()
+            return
+
+        # Steps numbered 1..n: step_id is the position, and the list stays numbered
+        if self._steps_numbered():
+            if step_id is None:
+                del self._step_index[self.steps.pop().step_id]
+            elif 1 <= step_id <= len(self.steps):
+                del self.steps[step_id - 1]
+                for idx in range(step_id - 1, len(self.steps)):
+                    self.steps[idx].step_id = idx + 1
+                del self._step_index[len(self.steps) + 1]
+            self._indexed_steps = (self.steps, len(self.steps))
+            self._steps_changed()
+            return
+
         if step_id is not None:
-            self.steps = [i for i in self.steps if i.step_id != step_id]
-        elif self.steps:
-            self.steps.pop()
+            self.steps[:] = [i for i in self.steps if i.step_id != step_id]
         else:
-            raise ValueError("No steps to remove.")
+            self.steps.pop()
         self.reindex_steps()
 
+    @contextmanager
+    def batch_edit(self) -> Iterator[None]:
+        """
+        Defer reindexing while adding or removing many steps.
+
+        Inside the context, `add_step`, `extend_steps` and `remove_step` leave step_ids
+        untouched; steps are reindexed once on exit.
+        """
+        self._batch_depth = (getattr(self, "_batch_depth", None) or 0) + 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.reindex_steps()
+
+    def get_step_by_id(self, step_id: int) -> T:
+        """
+        Return the step with the given step_id.
+
+        Raises:
+            StopIteration: If there is no such step
+        """
+        index = self._index()
+        if index is None:
+            index = self._build_index(reindexed=False)
+
+        position = index.get(step_id)
+        if position is not None and self.steps[position].step_id == step_id:
+            return self.steps[position]
+
+        # A step_id was edited in place: rebuild the index
+        self._build_index(reindexed=False)
+        return next(step for step in self.steps if step.step_id == step_id)
+
     def sort_steps_by_id(self) -> None:
         """Sort steps by their step_id in ascending order."""
         self.steps.sort(key=lambda step: step.step_id)
+        self._build_index(reindexed=False)
+        self._steps_changed()
 
     def reindex_steps(self) -> None:
         """Sort steps by step_id and reassign sequential step_ids starting from 1."""
-        self.sort_steps_by_id()
+        self.steps.sort(key=lambda step: step.step_id)
         for idx, item in enumerate(self.steps, start=1):
             item.step_id = idx
+        self._build_index(reindexed=True)
+        self._steps_changed()
+
+    def _steps_numbered(self) -> bool:
+        """Return True if the step_ids are known to be 1..n, in order."""
+        return self._index() is not None and self._steps_reindexed
+
+    def _in_batch(self) -> bool:
+        return bool(getattr(self, "_batch_depth", None))
+
+    def _index(self) -> Optional[dict[int, int]]:
+        """Index of the steps by step_id, or None if `steps` changed outside the mixin."""
+        indexed_steps = getattr(self, "_indexed_steps", None)
+        if indexed_steps is None:
+            return None
+
+        steps, length = indexed_steps
+        if steps is not self.steps or length != len(self.steps):
+            return None
+        return self._step_index
+
+    def _build_index(self, reindexed: bool) -> dict[int, int]:
+        index = {}
+        for position, step in enumerate(self.steps):
+            index.setdefault(step.step_id, position)
+        self._step_index = index
+        self._indexed_steps = (self.steps, len(self.steps))
+        self._steps_reindexed = reindexed
+        return index
+
+    def _steps_changed(self) -> None:
+        """
+        Called whenever the mixin changes the steps: invalidates the values cached by this
+        container, and by the containers that cached values computed from it.
+        """
+        self._version = getattr(self, "_version", 0) + 1
+        for reference in getattr(self, "_parents", None) or ():
+            parent = reference()
+            # Skip the parents this container was removed from, or copied from
+            if parent is not None and any(step is self for step in parent.steps or ()):
+                parent._steps_changed()
+
+    def _add_parent(self, parent: "StepContainerMixin") -> None:
+        parents = getattr(self, "_parents", None)
+        if parents is None:
+            parents = self._parents = []
+        if not any(reference() is parent for reference in parents):
+            parents.append(_reference(parent))
+
+    def _cached(self, name: str, compute: Callable[[], V], *dependencies: Any) -> V:
+        """
+        Return the value cached under `name`, or compute and cache it.
+
+        The value is computed again after any change of steps through the mixin (in this
+        container or a nested one), if `steps` was replaced or resized, or if one of the
+        extra `dependencies` changed.
+        """
+        steps = self.steps
+        state = (getattr(self, "_version", 0), len(steps or ()), *dependencies)
+        cache = getattr(self, "_cache", None)
+        if cache is None:
+            cache = self._cache = {}
+
+        entry = cache.get(name)
+        if entry is not None and entry[0] is steps and entry[1] == state:
+            return entry[2]
+
+        value = compute()
+        # Be notified of the changes of the nested containers the value depends on
+        for step in steps or ():
+            if isinstance(step, StepContainerMixin):
+                step._add_parent(self)
+        cache[name] = (steps, state, value)
+        return value
@@ -0,0 +1,207 @@
+import asyncio
+from typing import Any, List, Optional
+
+from garminconnect import (
+    GarminConnectAuthenticationError,
+    GarminConnectConnectionError,
+    GarminConnectTooManyRequestsError,
+)
+
+from pywhooshconnect.garmin.client.GarminClient import (
+    GarminClient,
+    POWER_ZONES_URL,
+    SCHEDULED_WORKOUT_URL,
+    TRAINING_PLAN_URL,
+    TRAINING_PLANS_URL,
+    filter_training_plans,
+)
+from pywhooshconnect.garmin.client.rate_limit import (
+    AdaptiveConcurrencyLimiter,
+    RateLimiter,
+    TokenBucket,
+)
+from pywhooshconnect.garmin.model.garmin_workout_dto import GarminSport
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class AsyncGarminClient:
+    """
+    Asyncio client for the Garmin Connect endpoints used by PyWhooshConnect.
+
+    Requests are issued on a single event loop through `httpx.AsyncClient`, so hundreds
+    of requests can be in flight without a thread per request. Authentication and the
+    response cache are borrowed from an already logged-in `GarminClient`: its current
+    tokens are read on every request, and refreshed when they expire. Requests have
+    their own rate limiter, sized for `max_in_flight` requests, unless one is given.
+
+    Usage:
+        async with AsyncGarminClient(garmin_client) as client:
+            plans = await client.get_training_plans(active=True)
+    """
+
+    DEFAULT_MAX_IN_FLIGHT = 100
+    DEFAULT_REQUESTS_PER_SECOND = 50
+    DEFAULT_TIMEOUT_SECONDS = 15
+
+    def __init__(
+        self,
+        garmin_client: GarminClient,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        http_client: Optional["httpx.AsyncClient"] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+    ):
+        """
+        Args:
+            garmin_client: Logged-in Garmin client providing the authentication headers.
+            max_in_flight: Maximum number of concurrent requests.
+            http_client: Optional preconfigured `httpx.AsyncClient`. When omitted, a client
+                pointing to the Garmin Connect API is created (and closed by `aclose`).
+            rate_limiter: Limiter of the requests, retrying throttled ones. Pass the
+                limiter of `garmin_client` to share its limits. Defaults to a new
+                `RateLimiter` allowing `requests_per_second`, and up to `max_in_flight`
+                requests in flight, less while Garmin Connect throttles them.
+            requests_per_second: Request rate of the default rate limiter.
+        """
+        if httpx is None:
+            raise ImportError(
+                "httpx is required for AsyncGarminClient. "
+                "Install it with: pip install pywhooshconnect[async]"
+            )
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be at least 1, got {max_in_flight}")
+
+        self.garmin_client = garmin_client
+        self.rate_limiter = rate_limiter or RateLimiter(
+            token_bucket=TokenBucket(rate=requests_per_second, capacity=max_in_flight),
+            concurrency=AdaptiveConcurrencyLimiter(
+                initial_limit=max_in_flight, max_limit=max_in_flight
+            ),
+        )
+        self._owns_http_client = http_client is None
+        self._http_client = http_client or httpx.AsyncClient(
+            base_url=garmin_client.api_base_url,
+            timeout=self.DEFAULT_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=max_in_flight, max_keepalive_connections=max_in_flight
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._refresh_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "AsyncGarminClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client, if it was created by this instance."""
+        if self._owns_http_client:
+            await self._http_client.aclose()
+
+    async def connectapi(self, path: str, **kwargs: Any) -> Any:
+        """
+        Asynchronous counterpart of `GarminClient.connectapi`.
+
+        Responses are served from the response cache of the Garmin client if possible,
+        read and written in a worker thread not to block the event loop. Requests reaching
+        Garmin Connect go through the rate limiter, which retries throttled (429) and
+        failed (5xx, network errors) requests with backoff. HTTP errors are raised as the
+        same `garminconnect` exceptions as the blocking client.
+        """
+        response_cache = self.garmin_client.response_cache
+        namespace = self.garmin_client.username
+        if response_cache is not None:
+            response = await asyncio.to_thread(
+                response_cache.get, path, kwargs, namespace=namespace
+            )
+            if response is not None:
+                return response
+
+        response = await self.rate_limiter.acall(self._get, path, **kwargs)
+        if response_cache is not None:
+            await asyncio.to_thread(
+                response_cache.set, path, kwargs, response, namespace=namespace
+            )
+        return response
+
+    async def _get(self, path: str, **kwargs: Any) -> Any:
+        extra_headers = kwargs.pop("headers", {})
+        headers = self.garmin_client.api_headers()
+        if self.garmin_client.tokens_expire_soon():
+            headers = await self._refresh_session(headers)
+
+        async with self._semaphore:
+            response = await self._send(path, {**headers, **extra_headers}, **kwargs)
+            if response.status_code == 401:
+                # Tokens were revoked or expired early: refresh them once, as
+                # `garminconnect` does
+                headers = await self._refresh_session(headers)
+                response = await self._send(
+                    path, {**headers, **extra_headers}, **kwargs
+                )
+
+        if response.status_code == 204:
+            return {}
+        if response.status_code == 401:
+            raise GarminConnectAuthenticationError(
+                f"Authentication failed: API Error 401 - {response.text}"
+            )
+        if response.status_code == 429:
+            raise GarminConnectTooManyRequestsError(
+                f"Rate limit exceeded: API Error 429 - {response.text}"
+            )
+        if response.status_code >= 400:
+            raise GarminConnectConnectionError(
+                f"API Error {response.status_code} - {response.text}"
+            )
+        return response.json()
+
+    async def _send(
+        self, path: str, headers: dict[str, str], **kwargs: Any
+    ) -> "httpx.Response":
+        try:
+            return await self._http_client.get(path, headers=headers, **kwargs)
+        except httpx.HTTPError as e:
+            raise GarminConnectConnectionError(f"Connection error: {e}") from e
+
+    async def _refresh_session(self, headers: dict[str, str]) -> dict[str, str]:
+        """
+        Refresh the tokens of the Garmin client, and return the new API headers.
+
+        Concurrent requests share one refresh: tokens are not refreshed again if they
+        changed since `headers` were read.
+        """
+        async with self._refresh_lock:
+            if self.garmin_client.api_headers() == headers:
+                # The refresh is a blocking request
+                await asyncio.to_thread(self.garmin_client.refresh_tokens)
+            return self.garmin_client.api_headers()
+
+    async def get_training_plans(
+        self, active: bool = False, sport: GarminSport = None
+    ) -> List[dict[str, Any]]:
+        """Asynchronous counterpart of `GarminClient.get_training_plans`."""
+        training_plans = (await self.connectapi(TRAINING_PLANS_URL))["trainingPlanList"]
+        return filter_training_plans(training_plans, active=active, sport=sport)
+
+    async def get_training_plan_by_id(self, training_plan_id: int) -> dict[str, Any]:
+        """Returns training plan by id"""
+        url = TRAINING_PLAN_URL.format(training_plan_id=training_plan_id)
+        return await self.connectapi(url)
+
+    async def get_scheduled_workout_by_id(
+        self, scheduled_workout_id: int
+    ) -> dict[str, Any]:
+        """Returns scheduled workout by id"""
+        url = SCHEDULED_WORKOUT_URL.format(scheduled_workout_id=scheduled_workout_id)
+        return await self.connectapi(url)
+
+    async def get_power_zones(self) -> List[dict[str, Any]]:
+        """Returns all available power zones"""
+        return await self.connectapi(POWER_ZONES_URL)
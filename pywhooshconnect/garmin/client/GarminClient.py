@@ -1,10 +1,25 @@
 from datetime import datetime, date
-from typing import Any, List
-
-from garminconnect import Garmin
-
+from pathlib import Path
+from typing import Any, List, Optional
+
+from garminconnect import (
+    Garmin,
+    GarminConnectAuthenticationError,
+    GarminConnectConnectionError,
+)
+
+from pywhooshconnect.garmin.client.rate_limit import RateLimiter
+from pywhooshconnect.garmin.client.response_cache import ResponseCache
+from pywhooshconnect.garmin.client.token_store import TokenStore
 from pywhooshconnect.garmin.model.garmin_workout_dto import GarminSport
 
+TRAINING_PLANS_URL = "/trainingplan-service/trainingplan/plans"
+TRAINING_PLAN_URL = "/trainingplan-service/trainingplan/phased/{training_plan_id}"
+SCHEDULED_WORKOUT_URL = "/workout-service/schedule/{scheduled_workout_id}"
+WORKOUT_URL = "/workout-service/workout/{workout_id}"
+CALENDAR_MONTH_URL = "/calendar-service/year/{year}/month/{month}"
+POWER_ZONES_URL = "/biometric-service/powerZones/sports/all"
+
 
 def parse_datetime(date_str: str) -> datetime | None:
     return (
@@ -22,9 +37,159 @@ def parse_date(date_str: str) -> date | None:
     )
 
 
+def filter_training_plans(
+    training_plans: List[dict[str, Any]],
+    active: bool = False,
+    sport: GarminSport = None,
+) -> List[dict[str, Any]]:
+    """
+    Filter training plans by active status and sport type.
+
+    See `GarminClient.get_training_plans` for the meaning of the filters.
+    """
+    if not active and sport is None:
+        return training_plans
+
+    today = datetime.today().date()
+
+    return [
+        t
+        for t in training_plans
+        if (
+            not active
+            or (
+                parse_datetime(t["startDate"]).date()
+                <= today
+                <= parse_datetime(t["endDate"]).date()
+            )
+        )
+        and (sport is None or t["trainingType"]["typeKey"].upper() == sport.value)
+    ]
+
+
 class GarminClient(Garmin):
-    def __init__(self, email: str, password: str):
+    def __init__(
+        self,
+        email: str,
+        password: str,
+        response_cache: Optional[ResponseCache] = None,
+        token_store: Optional[TokenStore] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        """
+        Args:
+            email: Garmin Connect username.
+            password: Garmin Connect password.
+            response_cache: Optional on-disk cache of API responses. Defaults to None
+                (every request hits Garmin Connect).
+            token_store: Optional directory where the OAuth tokens are persisted between
+                runs. Defaults to None (every login uses the credentials).
+            rate_limiter: Limiter of the API requests, retrying throttled ones. Share one
+                instance between clients to share the limits. Defaults to a new `RateLimiter`.
+        """
         super().__init__(email, password)
+        self.response_cache = response_cache
+        self.token_store = token_store
+        self.rate_limiter = rate_limiter or RateLimiter()
+        if token_store is not None:
+            # garminconnect saves the tokens it refreshes in the middle of a run with a
+            # plain write, outside of the lock: save them through the token store instead
+            self._dump_tokens = self.client.dump
+            self.client.dump = self._save_tokens
+
+    def login(self, /, tokenstore: str | None = None) -> tuple[str | None, str | None]:
+        """
+        Log in to Garmin Connect, resuming the session saved in the token store if possible.
+
+        Saved tokens are refreshed only when they are about to expire. The credentials are
+        used only when no valid tokens are available, and the resulting tokens are saved
+        for the next run. The token store is locked for the whole login.
+        """
+        if self.token_store is None or tokenstore is not None:
+            return super().login(tokenstore)
+
+        directory = str(self.token_store.directory)
+        with self.token_store.lock():
+            if self.token_store.has_tokens():
+                try:
+                    return super().login(directory)
+                except GarminConnectAuthenticationError:
+                    # Saved tokens were rejected: log in again with the credentials
+                    self.token_store.clear()
+            return super().login(directory)
+
+    # Authentication of the requests sent by `AsyncGarminClient`. These are the only uses
+    # of the private API of garminconnect, so that a change of it only affects them.
+
+    @property
+    def api_base_url(self) -> str:
+        """Base URL of the Garmin Connect API."""
+        return f"https://connectapi.{self.client.domain}"
+
+    def api_headers(self) -> dict[str, str]:
+        """Headers authenticating an API request with the current tokens."""
+        return self.client.get_api_headers()
+
+    def tokens_expire_soon(self) -> bool:
+        """Return True if the tokens are expired or about to expire."""
+        return self.client._token_expires_soon()
+
+    def refresh_tokens(self) -> None:
+        """Refresh the tokens (a blocking request), saving them in the token store."""
+        self.client._refresh_session()
+
+    def _save_tokens(self, path: str) -> None:
+        if Path(path).expanduser().resolve() == self.token_store.directory:
+            self.token_store.save(self.client.dumps())
+        else:
+            self._dump_tokens(path)
+
+    def connectapi(self, path: str, **kwargs: Any) -> Any:
+        """
+        Request a Garmin Connect API path, serving it from the response cache if possible.
+
+        Requests reaching Garmin Connect go through the rate limiter, which retries
+        throttled (429) and failed (5xx, network errors) requests with backoff.
+        """
+        if self.response_cache is None:
+            return self._rate_limited_connectapi(path, **kwargs)
+
+        response = self.response_cache.get(path, kwargs, namespace=self.username)
+        if response is None:
+            response = self._rate_limited_connectapi(path, **kwargs)
+            self.response_cache.set(path, kwargs, response, namespace=self.username)
+        return response
+
+    def connectapi_raw(self, path: str, **kwargs: Any) -> bytes:
+        """
+        Like `connectapi`, but return the JSON body of the response without decoding it,
+        so that it can be validated straight into DTOs (see `garmin.model.decoding`).
+        Bodies are cached as is, so cache hits are not decoded either.
+        """
+        if self.response_cache is None:
+            return self._rate_limited_connectapi_raw(path, **kwargs)
+
+        response = self.response_cache.get_raw(path, kwargs, namespace=self.username)
+        if response is None:
+            response = self._rate_limited_connectapi_raw(path, **kwargs)
+            self.response_cache.set_raw(path, kwargs, response, namespace=self.username)
+        return response
+
+    def _rate_limited_connectapi(self, path: str, **kwargs: Any) -> Any:
+        return self.rate_limiter.call(super().connectapi, path, **kwargs)
+
+    def _rate_limited_connectapi_raw(self, path: str, **kwargs: Any) -> bytes:
+        return self.rate_limiter.call(self._connectapi_raw, path, **kwargs)
+
+    def _connectapi_raw(self, path: str, **kwargs: Any) -> bytes:
+        try:
+            response = self.client.request("GET", "connectapi", path, **kwargs)
+        except GarminConnectConnectionError:
+            raise
+        except Exception as e:
+            raise GarminConnectConnectionError(f"Connection error: {e}") from e
+        # No content (204) is an empty object, as for `connectapi`
+        return response.content or b"{}"
 
     def get_training_plans(
         self, active: bool = False, sport: GarminSport = None
@@ -42,39 +207,44 @@ class GarminClient(Garmin):
         Returns:
             List[dict[str, Any]]: A list of training plan dictionaries matching the specified filters.
         """
-        training_plans = self.connectapi("/trainingplan-service/trainingplan/plans")[
-            "trainingPlanList"
-        ]
-
-        if not active and sport is None:
-            return training_plans
-
-        today = datetime.today().date()
-
-        return [
-            t
-            for t in training_plans
-            if (
-                not active
-                or (
-                    parse_datetime(t["startDate"]).date()
-                    <= today
-                    <= parse_datetime(t["endDate"]).date()
-                )
-            )
-            and (sport is None or t["trainingType"]["typeKey"].upper() == sport.value)
-        ]
-
-    def get_training_plan_by_id(self, training_plan_id: int) -> dict[str, Any]:
-        """Returns training plan by id"""
-        url = f"/trainingplan-service/trainingplan/phased/{training_plan_id}"
+        training_plans = self.connectapi(TRAINING_PLANS_URL)["trainingPlanList"]
+        return filter_training_plans(training_plans, active=active, sport=sport)
+
+    def get_training_plan_by_id(
+        self, training_plan_id: int, raw: bool = False
+    ) -> dict[str, Any]:
+        """Returns training plan by id (undecoded if `raw`, see `connectapi_raw`)"""
+        url = TRAINING_PLAN_URL.format(training_plan_id=training_plan_id)
+        return self.connectapi_raw(url) if raw else self.connectapi(url)
+
+    def get_scheduled_workout_by_id(
+        self, scheduled_workout_id: int, raw: bool = False
+    ) -> dict[str, Any]:
+        """Returns scheduled workout by id (undecoded if `raw`, see `connectapi_raw`)"""
+        url = SCHEDULED_WORKOUT_URL.format(scheduled_workout_id=scheduled_workout_id)
+        return self.connectapi_raw(url) if raw else self.connectapi(url)
+
+    def get_workout_by_id(self, workout_id: int) -> dict[str, Any]:
+        """Returns workout definition by id"""
+        url = WORKOUT_URL.format(workout_id=workout_id)
         return self.connectapi(url)
 
-    def get_scheduled_workout_by_id(self, scheduled_workout_id: int) -> dict[str, Any]:
-        """Returns scheduled workout by id"""
-        url = f"/workout-service/schedule/{scheduled_workout_id}"
+    def get_calendar_month(self, year: int, month: int) -> dict[str, Any]:
+        """
+        Returns the calendar items (scheduled workouts, activities, etc.) of a month.
+
+        Args:
+            year (int): Calendar year.
+            month (int): Calendar month, from 1 (January) to 12 (December).
+        """
+        # Garmin Connect months are 0-indexed
+        url = CALENDAR_MONTH_URL.format(year=year, month=month - 1)
         return self.connectapi(url)
 
-    def get_power_zones(self) -> List[dict[str, Any]]:
-        """Returns all available power zones"""
-        return self.connectapi("/biometric-service/powerZones/sports/all")
+    def get_power_zones(self, raw: bool = False) -> List[dict[str, Any]]:
+        """Returns all available power zones (undecoded if `raw`, see `connectapi_raw`)"""
+        return (
+            self.connectapi_raw(POWER_ZONES_URL)
+            if raw
+            else self.connectapi(POWER_ZONES_URL)
+        )
@@ -0,0 +1,306 @@
+import asyncio
+import random
+import re
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    Optional,
+    TypeVar,
+)
+
+from garminconnect import (
+    GarminConnectConnectionError,
+    GarminConnectTooManyRequestsError,
+)
+
+T = TypeVar("T")
+
+_STATUS_PATTERN = re.compile(r"\b(?:API Error|status=?)\s*\(?(\d{3})\b")
+
+
+def status_code_of(error: BaseException) -> Optional[int]:
+    """
+    Extract the HTTP status code of a failed Garmin Connect request, if known.
+
+    Depending on the `garminconnect` version, the status is either attached to the
+    exception (or one of its causes) as `response.status_code`, or only part of its message.
+    """
+    if isinstance(error, GarminConnectTooManyRequestsError):
+        return 429
+
+    while error is not None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+        if status is not None:
+            return status
+        match = _STATUS_PATTERN.search(str(error))
+        if match:
+            return int(match.group(1))
+        error = error.__cause__ or error.__context__
+    return None
+
+
+def is_throttling(status: Optional[int]) -> bool:
+    """Return True for responses telling the client to slow down (429 and 5xx)."""
+    return status is not None and (status == 429 or status >= 500)
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` requests per second, with bursts up to `capacity`."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take a token, waiting until one is available."""
+        while (wait := self._take()) > 0:
+            self._sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Asynchronous counterpart of `acquire`, waiting without blocking the event loop."""
+        while (wait := self._take()) > 0:
+            await asyncio.sleep(wait)
+
+    def _take(self) -> float:
+        """Take a token if one is available, else return the wait until there is one."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Bound the number of in-flight requests with an AIMD (additive increase, multiplicative
+    decrease) limit.
+
+    Every successful request raises the limit by `1 / limit`, i.e. by about one request
+    per round trip of the whole window. A throttled request multiplies the limit by
+    `decrease_factor`, at most once per window: throttles of requests started before
+    the last decrease are ignored, so one burst of 429s does not collapse the limit.
+
+    Threads (`slot`) and coroutines (`slot_async`) can share a limiter: both are woken
+    whenever a slot is released or the limit grows.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 4,
+        min_limit: float = 1,
+        max_limit: float = 16,
+        decrease_factor: float = 0.5,
+    ):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Expected 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._window = 0
+        self._condition = threading.Condition()
+        # Futures of the coroutines waiting for a slot, with their event loop
+        self._async_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    @property
+    def limit(self) -> float:
+        return self._limit
+
+    @contextmanager
+    def slot(self) -> Iterator[int]:
+        """
+        Hold one in-flight request slot, waiting while the limit is reached.
+
+        Yields the window the request started in, to be passed to `on_throttle`.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._in_flight < int(self._limit))
+            self._in_flight += 1
+            window = self._window
+        try:
+            yield window
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def slot_async(self) -> AsyncIterator[int]:
+        """Asynchronous counterpart of `slot`, waiting without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        while True:
+            waiter = loop.create_future()
+            window = self._enter_or_wait(loop, waiter)
+            if window is not None:
+                break
+            await waiter
+        try:
+            yield window
+        finally:
+            self._release()
+
+    def _enter_or_wait(
+        self, loop: asyncio.AbstractEventLoop, waiter: asyncio.Future
+    ) -> Optional[int]:
+        """Take a slot and return its window, or register `waiter` to be woken."""
+        with self._condition:
+            if self._in_flight >= int(self._limit):
+                self._async_waiters.append((loop, waiter))
+                return None
+            self._in_flight += 1
+            return self._window
+
+    def _release(self) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._notify_all()
+
+    def _notify_all(self) -> None:
+        """Wake the waiting threads and coroutines. Called with the condition held."""
+        self._condition.notify_all()
+        for loop, waiter in self._async_waiters:
+            loop.call_soon_threadsafe(_wake, waiter)
+        self._async_waiters.clear()
+
+    def on_success(self) -> None:
+        with self._condition:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self._notify_all()
+
+    def on_throttle(self, window: int) -> None:
+        with self._condition:
+            if window < self._window:
+                return
+            self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+            self._window += 1
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():  # e.g. cancelled
+        waiter.set_result(None)
+
+
+@dataclass
+class RetryPolicy:
+    """Retry throttled or failed requests with exponential backoff and full jitter."""
+
+    max_attempts: int = 5
+    base_delay_seconds: float = 0.5
+    max_delay_seconds: float = 30
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Return True if the request failed with `error` on `attempt` (1-based) can be retried."""
+        if attempt >= self.max_attempts:
+            return False
+        if not isinstance(
+            error, (GarminConnectConnectionError, GarminConnectTooManyRequestsError)
+        ):
+            return False
+
+        # Network failures have no status: retry them, together with 429 and 5xx
+        status = status_code_of(error)
+        return status is None or is_throttling(status)
+
+    def delay(self, attempt: int) -> float:
+        """Delay in seconds before retrying after the given attempt (1-based)."""
+        ceiling = min(
+            self.max_delay_seconds, self.base_delay_seconds * 2 ** (attempt - 1)
+        )
+        return random.uniform(0, ceiling)
+
+
+class RateLimiter:
+    """
+    Shared limiter of Garmin Connect requests.
+
+    Combines a token bucket (request rate), an adaptive concurrency limit (in-flight
+    requests) and a retry policy. A single instance can be shared by several clients and
+    threads, so that all of them settle on the rate Garmin Connect accepts.
+    """
+
+    DEFAULT_RATE = 5
+    DEFAULT_BURST = 10
+
+    def __init__(
+        self,
+        token_bucket: Optional[TokenBucket] = None,
+        concurrency: Optional[AdaptiveConcurrencyLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.token_bucket = token_bucket or TokenBucket(
+            rate=self.DEFAULT_RATE, capacity=self.DEFAULT_BURST
+        )
+        self.concurrency = concurrency or AdaptiveConcurrencyLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._sleep = sleep
+
+    def call(self, request: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run `request(*args, **kwargs)` within the limits, retrying it if it is throttled."""
+        attempt = 1
+        while True:
+            self.token_bucket.acquire()
+            with self.concurrency.slot() as window:
+                try:
+                    result = request(*args, **kwargs)
+                except Exception as e:
+                    if is_throttling(status_code_of(e)):
+                        self.concurrency.on_throttle(window)
+                    if not self.retry_policy.should_retry(e, attempt):
+                        raise
+                else:
+                    self.concurrency.on_success()
+                    return result
+
+            self._sleep(self.retry_policy.delay(attempt))
+            attempt += 1
+
+    async def acall(
+        self, request: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any
+    ) -> T:
+        """Asynchronous counterpart of `call`, for coroutine requests."""
+        attempt = 1
+        while True:
+            await self.token_bucket.acquire_async()
+            async with self.concurrency.slot_async() as window:
+                try:
+                    result = await request(*args, **kwargs)
+                except Exception as e:
+                    if is_throttling(status_code_of(e)):
+                        self.concurrency.on_throttle(window)
+                    if not self.retry_policy.should_retry(e, attempt):
+                        raise
+                else:
+                    self.concurrency.on_success()
+                    return result
+
+            await asyncio.sleep(self.retry_policy.delay(attempt))
+            attempt += 1
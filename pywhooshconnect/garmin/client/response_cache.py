@@ -0,0 +1,246 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from enum import Enum
+from pathlib import Path
+from typing import Any, Optional
+
+
+class CachedEndpoint(Enum):
+    """Classes of Garmin Connect endpoints whose responses can be cached."""
+
+    TRAINING_PLANS = "training_plans"
+    SCHEDULED_WORKOUTS = "scheduled_workouts"
+    POWER_ZONES = "power_zones"
+
+
+ENDPOINT_PREFIXES = {
+    "/trainingplan-service/": CachedEndpoint.TRAINING_PLANS,
+    "/workout-service/": CachedEndpoint.SCHEDULED_WORKOUTS,
+    "/calendar-service/": CachedEndpoint.SCHEDULED_WORKOUTS,
+    "/biometric-service/": CachedEndpoint.POWER_ZONES,
+}
+
+
+def endpoint_of(path: str) -> Optional[CachedEndpoint]:
+    """Return the endpoint class of an API path, or None if it must not be cached."""
+    return next(
+        (
+            endpoint
+            for prefix, endpoint in ENDPOINT_PREFIXES.items()
+            if path.startswith(prefix)
+        ),
+        None,
+    )
+
+
+def evict_least_recently_used(
+    directory: Path, pattern: str, max_size_bytes: int
+) -> int:
+    """
+    Delete the files of `directory` matching `pattern`, oldest modified first, until
+    their total size is at most `max_size_bytes`, and return their remaining total size.
+    """
+    entries = []
+    for entry_path in directory.glob(pattern):
+        try:
+            stat = entry_path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, entry_path in sorted(entries, key=lambda e: e[0]):
+        if total_size <= max_size_bytes:
+            break
+        entry_path.unlink(missing_ok=True)
+        total_size -= size
+    return total_size
+
+
+def file_size(path: Path) -> int:
+    """Size of a file in bytes, 0 if it does not exist."""
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+class SizeLimit:
+    """
+    Keep the files of a directory matching a pattern within a total size, evicting the
+    least recently used ones (see `evict_least_recently_used`).
+
+    The directory is scanned once for its total size, which is then kept up to date by
+    `update`: the directory is scanned again only when the total exceeds the limit.
+    Files written by other processes are counted at the next scan.
+    """
+
+    def __init__(self, directory: Path, pattern: str):
+        self.directory = directory
+        self.pattern = pattern
+        self._total_size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def update(self, size_change: int, max_size_bytes: int) -> None:
+        """Record a change of the total size, evicting entries if it exceeds the limit."""
+        with self._lock:
+            if self._total_size is None:
+                self._total_size = self._scan(max_size_bytes)
+                return
+            self._total_size = max(0, self._total_size + size_change)
+            if self._total_size > max_size_bytes:
+                self._total_size = self._scan(max_size_bytes)
+
+    def reset(self) -> None:
+        """Forget the total size, e.g. once the directory is cleared."""
+        with self._lock:
+            self._total_size = None
+
+    def _scan(self, max_size_bytes: int) -> int:
+        return evict_least_recently_used(self.directory, self.pattern, max_size_bytes)
+
+
+class ResponseCache:
+    """
+    Persistent on-disk cache of Garmin Connect API responses.
+
+    Each response is stored in a file keyed by account, endpoint path and request
+    parameters: a JSON header line, followed by the JSON body of the response as is, so
+    that raw responses are cached and served without being decoded. Entries expire after the TTL of their endpoint class, and the least
+    recently used entries are evicted once the cache grows beyond `max_size_bytes`.
+    Endpoints not listed in `ENDPOINT_PREFIXES` are never cached.
+    """
+
+    DEFAULT_DIRECTORY = "~/.cache/pywhooshconnect/garmin"
+    DEFAULT_MAX_SIZE_BYTES = 50 * 1024 * 1024
+    DEFAULT_TTLS = {
+        CachedEndpoint.TRAINING_PLANS: timedelta(hours=1),
+        CachedEndpoint.SCHEDULED_WORKOUTS: timedelta(hours=6),
+        CachedEndpoint.POWER_ZONES: timedelta(hours=12),
+    }
+
+    def __init__(
+        self,
+        directory: str | Path = DEFAULT_DIRECTORY,
+        ttls: Optional[dict[CachedEndpoint, timedelta]] = None,
+        max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES,
+        refresh: bool = False,
+    ):
+        """
+        Args:
+            directory: Directory where responses are stored. Created if missing.
+            ttls: Time-to-live per endpoint class, overriding `DEFAULT_TTLS`.
+            max_size_bytes: Maximum total size of the cache on disk.
+            refresh: If True, cached responses are ignored but fresh responses are still
+                stored, so the next run can use them.
+        """
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self.max_size_bytes = max_size_bytes
+        self.refresh = refresh
+        self._size_limit = SizeLimit(self.directory, "*.json")
+
+    def get(self, path: str, params: dict[str, Any], namespace: str = "") -> Any:
+        """
+        Return the cached response for a request, decoded, or None if missing or expired.
+
+        Args:
+            path: API path of the request.
+            params: Keyword arguments of the request (query parameters, etc.).
+            namespace: Account the response belongs to.
+        """
+        body = self.get_raw(path, params, namespace)
+        if body is None:
+            return None
+        try:
+            return json.loads(body)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            # Corrupted body: a cache miss
+            self._remove(self._entry_path(path, params, namespace))
+            return None
+
+    def get_raw(
+        self, path: str, params: dict[str, Any], namespace: str = ""
+    ) -> Optional[bytes]:
+        """
+        Like `get`, but return the JSON body of the cached response without decoding it.
+        """
+        endpoint = endpoint_of(path)
+        if endpoint is None or self.refresh:
+            return None
+
+        entry_path = self._entry_path(path, params, namespace)
+        try:
+            with open(entry_path, "rb") as file:
+                header = json.loads(file.readline())
+                body = file.read()
+            stored_at = header["stored_at"]
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError):
+            # Truncated or foreign entry: a cache miss
+            self._remove(entry_path)
+            return None
+
+        if not body or time.time() - stored_at > self.ttls[endpoint].total_seconds():
+            self._remove(entry_path)
+            return None
+
+        # Mark the entry as recently used
+        os.utime(entry_path)
+        return body
+
+    def set(
+        self, path: str, params: dict[str, Any], response: Any, namespace: str = ""
+    ) -> None:
+        """Store the response of a request, evicting old entries if the cache is full."""
+        if endpoint_of(path) is None or response is None:
+            return
+        self.set_raw(path, params, json.dumps(response).encode(), namespace)
+
+    def set_raw(
+        self, path: str, params: dict[str, Any], body: bytes, namespace: str = ""
+    ) -> None:
+        """Like `set`, but store the JSON body of a response as is."""
+        if endpoint_of(path) is None or not body:
+            return
+
+        header = json.dumps({"path": path, "stored_at": time.time()}).encode()
+        entry_path = self._entry_path(path, params, namespace)
+        previous_size = file_size(entry_path)
+
+        # Write atomically, so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(header + b"\n")
+                file.write(body)
+            os.replace(tmp_path, entry_path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        self._size_limit.update(
+            file_size(entry_path) - previous_size, self.max_size_bytes
+        )
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        for entry_path in self.directory.glob("*.json"):
+            entry_path.unlink(missing_ok=True)
+        self._size_limit.reset()
+
+    def _entry_path(self, path: str, params: dict[str, Any], namespace: str) -> Path:
+        key = json.dumps([namespace, path, params], sort_keys=True, default=str)
+        return self.directory / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def _remove(self, entry_path: Path) -> None:
+        size = file_size(entry_path)
+        entry_path.unlink(missing_ok=True)
+        self._size_limit.update(-size, self.max_size_bytes)
@@ -0,0 +1,139 @@
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Optional
+
+try:
+    import fcntl
+
+    msvcrt = None
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def _try_lock(file: IO) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(file: IO) -> None:
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class TokenStore:
+    """
+    Directory holding the Garmin Connect OAuth tokens of an account between runs.
+
+    The tokens are read and written by `garminconnect` itself; this class locates them
+    and provides an exclusive, cross-process lock so that concurrent runs do not read
+    or write the tokens at the same time. The lock is reentrant within a thread, so the
+    tokens can be saved (`save`) while it is held.
+    """
+
+    DEFAULT_DIRECTORY = "~/.garminconnect"
+    TOKEN_FILENAME = "garmin_tokens.json"
+    LOCK_FILENAME = ".lock"
+    DEFAULT_LOCK_TIMEOUT_SECONDS = 60
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        lock_timeout_seconds: float = DEFAULT_LOCK_TIMEOUT_SECONDS,
+        user: Optional[str] = None,
+    ):
+        """
+        Args:
+            directory: Token directory. Defaults to the `GARMINTOKENS` environment
+                variable, or `~/.garminconnect` if it is not set, with a subdirectory
+                per `user` if one is given.
+            lock_timeout_seconds: Maximum time to wait for another run to release the lock.
+            user: Garmin Connect user of the tokens. Since `garminconnect` resumes saved
+                tokens without checking whose they are, users must not share a directory.
+        """
+        if directory is None:
+            directory = Path(os.getenv("GARMINTOKENS") or self.DEFAULT_DIRECTORY)
+            if user:
+                directory = directory / user
+        self.directory = Path(directory).expanduser().resolve()
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self._thread_lock = threading.RLock()
+        self._lock_file: Optional[IO] = None
+
+    @property
+    def token_file(self) -> Path:
+        return self.directory / self.TOKEN_FILENAME
+
+    def has_tokens(self) -> bool:
+        """Return True if tokens were saved by a previous login."""
+        return self.token_file.exists()
+
+    def clear(self) -> None:
+        """Delete the saved tokens, forcing the next login to use the credentials."""
+        self.token_file.unlink(missing_ok=True)
+
+    def save(self, tokens: str) -> None:
+        """
+        Write the serialized tokens under the lock, through a temporary file renamed over
+        the token file, so that other runs never read partial tokens.
+        """
+        with self.lock():
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as file:
+                    file.write(tokens)
+                os.replace(tmp_path, self.token_file)
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """
+        Hold an exclusive lock on the token directory.
+
+        Raises:
+            TimeoutError: If the lock is not acquired within `lock_timeout_seconds`.
+        """
+        deadline = time.monotonic() + self.lock_timeout_seconds
+        if not self._thread_lock.acquire(timeout=self.lock_timeout_seconds):
+            raise self._timeout_error()
+        try:
+            if self._lock_file is not None:
+                # Already held by this thread
+                yield
+                return
+
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.directory / self.LOCK_FILENAME, "a+") as lock_file:
+                while not _try_lock(lock_file):
+                    if time.monotonic() >= deadline:
+                        raise self._timeout_error()
+                    time.sleep(0.1)
+                self._lock_file = lock_file
+                try:
+                    yield
+                finally:
+                    self._lock_file = None
+                    _unlock(lock_file)
+        finally:
+            self._thread_lock.release()
+
+    def _timeout_error(self) -> TimeoutError:
+        return TimeoutError(
+            f"Timed out waiting for the token store lock in {self.directory}"
+        )
@@ -1,3 +1,4 @@
+import sys
 from abc import ABC, abstractmethod
 from typing import TypeVar, Optional
 
@@ -27,6 +28,11 @@ from pywhooshconnect.garmin.model.garmin_workout_dto import (
 TStepTarget = TypeVar("TStepTarget", bound=GenericWorkoutStep)
 
 
+def _intern(description: Optional[str]) -> Optional[str]:
+    """Share the step descriptions repeated across workouts ("Warm up", ...)."""
+    return sys.intern(description) if description else description
+
+
 class GarminToGenericStepMapper(BaseMapper[GarminWorkoutStep, TStepTarget], ABC):
     """Abstract mapper from GarminWorkoutStep to a GenericWorkoutStep implementation."""
 
@@ -86,7 +92,7 @@ class GarminToGenericAtomicStepMapper(GarminToGenericStepMapper[GenericAtomicSte
             duration_in_seconds=duration_in_seconds,
             power_zone=garmin.zoneNumber,
             type=GarminToStepTypeMapper().map(garmin),
-            description=garmin.description,
+            description=_intern(garmin.description),
             rpm=None,
         )
 
@@ -105,7 +111,7 @@ class GarminToGenericIntervalStepMapper(GarminToGenericStepMapper[GenericInterva
             duration_in_seconds=self._calculate_step_duration_in_seconds(garmin),
             power_zone=garmin.zoneNumber,
             type=GarminToStepTypeMapper().map(garmin),
-            description=garmin.description,
+            description=_intern(garmin.description),
             rpm=None,
         )
 
@@ -126,7 +132,7 @@ class GarminToGenericStepWithIntervals(
         step = GenericStepWithIntervals(
             step_id=garmin.stepOrder,
             type=GarminToStepTypeMapper().map(garmin),
-            description=garmin.description,
+            description=_intern(garmin.description),
             iterations=self._get_number_of_iterations(garmin),
             steps=[
                 self.atomic_step_mapper.map(interval)
@@ -0,0 +1,86 @@
+"""
+Validation of Garmin API responses into DTOs, straight from the raw response bytes.
+"""
+
+from dataclasses import replace
+from enum import Enum
+from functools import cache
+from typing import Any, List, Type, TypeVar
+
+from pydantic import TypeAdapter
+
+from pywhooshconnect.garmin.model.garmin_power_zones_dto import GarminPowerZones
+from pywhooshconnect.garmin.model.garmin_projection_dto import (
+    GarminScheduledWorkoutProjection,
+)
+from pywhooshconnect.garmin.model.garmin_scheduled_workout_dto import (
+    GarminScheduledWorkout,
+)
+from pywhooshconnect.garmin.model.garmin_training_plan_dto import (
+    GarminTrainingPlanDetail,
+)
+
+T = TypeVar("T")
+
+
+class GarminValidation(Enum):
+    """How scheduled workouts are validated."""
+
+    # Validate every field of the response into a `GarminScheduledWorkout`
+    FULL = "full"
+    # Validate only the fields read by the mappers into a
+    # `GarminScheduledWorkoutProjection`, keeping the response unparsed
+    PROJECTION = "projection"
+
+
+@cache
+def type_adapter(type_: Type[T]) -> TypeAdapter[T]:
+    """`TypeAdapter` of a DTO type, built once per type."""
+    return TypeAdapter(type_)
+
+
+def decode(type_: Type[T], response: bytes | str | Any) -> T:
+    """
+    Validate a Garmin API response into `type_`.
+
+    Raw JSON (bytes or str) is parsed and validated in a single pass, without building
+    intermediate dicts; an already decoded response is validated as is.
+    """
+    if isinstance(response, (bytes, bytearray, str)):
+        return type_adapter(type_).validate_json(response)
+    return type_adapter(type_).validate_python(response)
+
+
+def decode_scheduled_workout(
+    response: bytes | str | Any, validation: GarminValidation = GarminValidation.FULL
+) -> GarminScheduledWorkout | GarminScheduledWorkoutProjection:
+    """Validate a scheduled workout response, fully or as a projection."""
+    if validation == GarminValidation.FULL:
+        return decode(GarminScheduledWorkout, response)
+
+    scheduled_workout = decode(GarminScheduledWorkoutProjection, response)
+    scheduled_workout.raw = response
+    return scheduled_workout
+
+
+def validate_fully(
+    scheduled_workout: GarminScheduledWorkoutProjection,
+) -> GarminScheduledWorkout:
+    """Validate the full scheduled workout from the raw response of a projection."""
+    full = decode(GarminScheduledWorkout, scheduled_workout.raw)
+    # The projection may have been copied to another schedule entry
+    return replace(
+        full,
+        workoutScheduleId=scheduled_workout.workoutScheduleId,
+        calendarDate=scheduled_workout.calendarDate,
+    )
+
+
+# Build the adapters of the decoded responses up front
+for _type in (
+    GarminScheduledWorkout,
+    GarminScheduledWorkoutProjection,
+    List[GarminPowerZones],
+    GarminTrainingPlanDetail,
+):
+    type_adapter(_type)
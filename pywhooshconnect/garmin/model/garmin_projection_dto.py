@@ -0,0 +1,59 @@
+"""
+Projections of the Garmin API workout DTOs.
+They declare only the fields read by the Garmin mappers (see `garmin_to_generic_workout`),
+so that validation skips the fields the mappers never use (stroke and equipment types,
+targets, i18n keys, most datetimes...). A scheduled workout projection keeps the response
+it was validated from, unparsed, for the cases needing the full DTO.
+"""
+
+from __future__ import annotations
+
+from dataclasses import field
+from datetime import date, datetime
+from typing import Any, List, Optional
+
+from pydantic.dataclasses import dataclass
+
+from pywhooshconnect.garmin.model.garmin_workout_dto import (
+    GarminConditionType,
+    GarminSportType,
+    GarminStepType,
+)
+
+
+@dataclass
+class GarminWorkoutStepProjection:
+    stepId: Optional[int] = None
+    stepOrder: Optional[int] = None
+    stepType: Optional[GarminStepType] = None
+    description: Optional[str] = None
+    endCondition: Optional[GarminConditionType] = None
+    endConditionValue: Optional[float] = None
+    zoneNumber: Optional[int] = None
+    numberOfIterations: Optional[int] = None
+    workoutSteps: Optional[List[GarminWorkoutStepProjection]] = None
+
+
+@dataclass
+class GarminWorkoutSegmentProjection:
+    workoutSteps: Optional[List[GarminWorkoutStepProjection]] = None
+
+
+@dataclass
+class GarminWorkoutProjection:
+    workoutId: Optional[int] = None
+    workoutName: Optional[str] = None
+    description: Optional[str] = None
+    updatedDate: Optional[datetime] = None
+    sportType: Optional[GarminSportType] = None
+    workoutSegments: Optional[List[GarminWorkoutSegmentProjection]] = None
+
+
+@dataclass
+class GarminScheduledWorkoutProjection:
+    workoutScheduleId: int
+    workout: GarminWorkoutProjection
+    calendarDate: date
+    # Response the projection was validated from, as received (bytes or dict), see
+    # `decoding.validate_fully`
+    raw: Any = field(default=None, repr=False, compare=False)
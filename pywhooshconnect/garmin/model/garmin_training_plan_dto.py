@@ -0,0 +1,31 @@
+"""
+DTOs (Data Transfer Objects) for Garmin API training plan responses.
+Only the fields read by PyWhooshConnect are declared: the others are dropped when the
+response is validated.
+"""
+
+import sys
+from typing import List, Optional
+
+# pydantic only supports `typing.TypedDict` from Python 3.12
+if sys.version_info >= (3, 12):
+    from typing import TypedDict
+else:
+    from typing_extensions import TypedDict
+
+
+class GarminTaskWorkout(TypedDict, total=False):
+    workoutId: Optional[int]
+    workoutScheduleId: Optional[int]
+    scheduledDate: Optional[str]
+    workoutUpdatedDate: Optional[str]
+
+
+class GarminTrainingPlanTask(TypedDict, total=False):
+    calendarDate: Optional[str]
+    taskWorkout: Optional[GarminTaskWorkout]
+
+
+class GarminTrainingPlanDetail(TypedDict, total=False):
+    trainingPlanId: int
+    taskList: List[GarminTrainingPlanTask]
@@ -1,20 +1,242 @@
+import asyncio
+import random
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from datetime import date, datetime, timedelta
+from enum import Enum
+from typing import Any, Callable, Iterable, Iterator, List, Optional, TypeVar
 
+from pywhooshconnect.garmin.client.AsyncGarminClient import AsyncGarminClient
 from pywhooshconnect.garmin.client.GarminClient import (
     GarminClient,
     parse_datetime,
     parse_date,
 )
+from pywhooshconnect.garmin.model.decoding import (
+    GarminValidation,
+    decode,
+    decode_scheduled_workout,
+    validate_fully,
+)
 from pywhooshconnect.garmin.model.garmin_power_zones_dto import GarminPowerZones
 from pywhooshconnect.garmin.model.garmin_scheduled_workout_dto import (
     GarminScheduledWorkout,
 )
+from pywhooshconnect.garmin.model.garmin_training_plan_dto import (
+    GarminTrainingPlanDetail,
+)
 from pywhooshconnect.garmin.model.garmin_workout_dto import GarminSport
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Fraction of the projected scheduled workouts fully validated in development mode
+DEBUG_FULL_VALIDATION_SAMPLE_RATE = 0.1
+
+
+class GarminFetchStrategy(Enum):
+    """How scheduled workouts are discovered in Garmin Connect."""
+
+    # Read the task list of each active training plan, then fetch every scheduled workout
+    TRAINING_PLAN = "training_plan"
+    # Read the calendar month by month, then fetch each distinct workout definition
+    CALENDAR = "calendar"
+
+
+def _normalize_date_range(
+    from_date: date | datetime | None, to_date: date | datetime | None
+) -> tuple[date, date]:
+    """Convert the range bounds to dates, defaulting to today and 90 days from start."""
+    from_date = (
+        from_date.date()
+        if isinstance(from_date, datetime)
+        else from_date or date.today()
+    )
+    to_date = (
+        to_date.date()
+        if isinstance(to_date, datetime)
+        else to_date or from_date + timedelta(days=90)
+    )
+    return from_date, to_date
+
+
+@dataclass(frozen=True)
+class GarminScheduledWorkoutRef:
+    """Reference to a scheduled workout, as listed by a training plan or the calendar."""
+
+    workout_schedule_id: int
+    workout_id: Optional[int]
+    calendar_date: date
+    # Last update of the workout definition, when listed (training plan tasks only)
+    workout_updated_date: Optional[str] = None
+
+
+def _plan_workout_refs(
+    plan_detail: dict[str, Any], from_date: date, to_date: date
+) -> list[GarminScheduledWorkoutRef]:
+    """Extract the workouts scheduled by a training plan within a date range."""
+    refs = []
+    for task in plan_detail.get("taskList", []):
+        task_workout = task["taskWorkout"]
+        if not task_workout or not task_workout.get("workoutId"):  # exclude rest days
+            continue
+
+        workout_date = (
+            parse_date(task["calendarDate"])
+            or parse_datetime(task_workout["scheduledDate"]).date()
+        )
+
+        if from_date <= workout_date <= to_date:
+            refs.append(
+                GarminScheduledWorkoutRef(
+                    workout_schedule_id=task_workout["workoutScheduleId"],
+                    workout_id=task_workout["workoutId"],
+                    calendar_date=workout_date,
+                    workout_updated_date=task_workout.get("workoutUpdatedDate"),
+                )
+            )
+
+    return refs
+
+
+def _months_between(from_date: date, to_date: date) -> list[tuple[int, int]]:
+    """Return the (year, month) pairs covered by a date range, in chronological order."""
+    months = []
+    year, month = from_date.year, from_date.month
+    while (year, month) <= (to_date.year, to_date.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _calendar_workout_refs(
+    calendars: list[dict[str, Any]], sport: GarminSport, from_date: date, to_date: date
+) -> list[GarminScheduledWorkoutRef]:
+    """Extract the scheduled workouts of a sport within a date range from calendar months."""
+    refs = [
+        GarminScheduledWorkoutRef(
+            workout_schedule_id=item["id"],
+            workout_id=item.get("workoutId"),
+            calendar_date=parse_date(item["date"]),
+        )
+        for calendar in calendars
+        for item in calendar.get("calendarItems") or []
+        if item.get("itemType") == "workout"
+        and (item.get("sportTypeKey") or "").upper() == sport.value
+    ]
+    return sorted(
+        (ref for ref in refs if from_date <= ref.calendar_date <= to_date),
+        key=lambda ref: ref.calendar_date,
+    )
+
+
+def _scheduled_workout_from_definition(
+    ref: GarminScheduledWorkoutRef, workout: Optional[dict[str, Any]]
+) -> Optional[dict[str, Any]]:
+    """
+    Build a scheduled workout response from its reference and its workout definition.
+
+    Returns None if the definition is incomplete, in which case the scheduled workout
+    must be fetched on its own.
+    """
+    if (
+        not workout
+        or not workout.get("workoutSegments")
+        or workout.get("ownerId") is None
+        or not workout.get("createdDate")
+    ):
+        return None
+
+    return {
+        "workoutScheduleId": ref.workout_schedule_id,
+        "workout": workout,
+        "calendarDate": ref.calendar_date,
+        "createdDate": parse_datetime(workout["createdDate"]).date(),
+        "ownerId": workout["ownerId"],
+    }
+
+
+def _reschedule(
+    scheduled_workout: GarminScheduledWorkout, ref: GarminScheduledWorkoutRef
+) -> GarminScheduledWorkout:
+    """Copy a scheduled workout to another schedule entry of the same workout definition."""
+    if scheduled_workout.workoutScheduleId == ref.workout_schedule_id:
+        return scheduled_workout
+    return replace(
+        scheduled_workout,
+        workoutScheduleId=ref.workout_schedule_id,
+        calendarDate=ref.calendar_date,
+    )
+
+
+def _group_by_workout(
+    refs: list[GarminScheduledWorkoutRef],
+) -> dict[Any, list[GarminScheduledWorkoutRef]]:
+    """Group references sharing a workout definition, keeping the first-seen order."""
+    groups = {}
+    for ref in refs:
+        key = ref.workout_id or ("schedule", ref.workout_schedule_id)
+        groups.setdefault(key, []).append(ref)
+    return groups
+
+
+def _find_power_zones(
+    power_zones: list[dict[str, Any]], sport: GarminSport
+) -> GarminPowerZones | None:
+    return next(
+        (GarminPowerZones(**p) for p in power_zones if p["sport"] == sport.name),
+        None,
+    )
+
 
 class GarminTrainingPlanService:
-    def __init__(self, garmin_client: GarminClient):
+    def __init__(
+        self,
+        garmin_client: GarminClient,
+        max_workers: int = 1,
+        fetch_strategy: GarminFetchStrategy = GarminFetchStrategy.TRAINING_PLAN,
+        decode_raw: bool = False,
+        validation: GarminValidation = GarminValidation.FULL,
+        full_validation_sample_rate: Optional[float] = None,
+    ):
+        """
+        Args:
+            garmin_client: Authenticated Garmin Connect client.
+            max_workers: Maximum number of scheduled workouts fetched concurrently.
+                Defaults to 1 (sequential fetching).
+            fetch_strategy: How scheduled workouts are discovered.
+                Defaults to GarminFetchStrategy.TRAINING_PLAN.
+            decode_raw: Validate scheduled workouts, power zones and training plans
+                straight from the raw response bytes, instead of decoding them to dicts
+                first (see `GarminClient.connectapi_raw`). Defaults to False.
+            validation: How scheduled workouts are validated. With
+                GarminValidation.PROJECTION, only the fields read by the mappers are.
+                Defaults to GarminValidation.FULL.
+            full_validation_sample_rate: Fraction of the projected scheduled workouts
+                also fully validated, raising on invalid responses. Defaults to
+                DEBUG_FULL_VALIDATION_SAMPLE_RATE in Python development mode
+                (`python -X dev`), 0 otherwise.
+        """
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+        if full_validation_sample_rate is None:
+            full_validation_sample_rate = (
+                DEBUG_FULL_VALIDATION_SAMPLE_RATE if sys.flags.dev_mode else 0.0
+            )
+        if not 0 <= full_validation_sample_rate <= 1:
+            raise ValueError(
+                "full_validation_sample_rate must be between 0 and 1, "
+                f"got {full_validation_sample_rate}"
+            )
+
         self.client = garmin_client
+        self.max_workers = max_workers
+        self.fetch_strategy = fetch_strategy
+        self.decode_raw = decode_raw
+        self.validation = validation
+        self.full_validation_sample_rate = full_validation_sample_rate
 
     def get_scheduled_workouts(
         self,
@@ -31,53 +253,174 @@ class GarminTrainingPlanService:
             to_date: End date (inclusive). Defaults to 90 days from start.
 
         Returns:
-            List of scheduled workout details
+            List of scheduled workout details, in training plan (date) order
         """
 
-        # Normalize dates
-        from_date = (
-            from_date.date()
-            if isinstance(from_date, datetime)
-            else from_date or date.today()
-        )
-        to_date = (
-            to_date.date()
-            if isinstance(to_date, datetime)
-            else to_date or from_date + timedelta(days=90)
+        return self.fetch_scheduled_workouts(
+            self.get_scheduled_workout_refs(sport, from_date, to_date)
         )
+
+    def get_scheduled_workout_refs(
+        self,
+        sport: GarminSport,
+        from_date: date | datetime | None = None,
+        to_date: date | datetime | None = None,
+    ) -> list[GarminScheduledWorkoutRef]:
+        """
+        List the workouts scheduled for a specific sport within a date range, without
+        fetching their details.
+
+        Args:
+            sport: Sport type to filter by
+            from_date: Start date (inclusive). Defaults to today.
+            to_date: End date (inclusive). Defaults to 90 days from start.
+
+        Returns:
+            List of scheduled workout references, in date order
+        """
+
+        # Normalize dates
+        from_date, to_date = _normalize_date_range(from_date, to_date)
         print(f"Fetching workouts for {sport.value} from {from_date} to {to_date}")
 
+        if self.fetch_strategy == GarminFetchStrategy.CALENDAR:
+            calendars = self._map_concurrently(
+                lambda year_month: self.client.get_calendar_month(*year_month),
+                _months_between(from_date, to_date),
+            )
+            return _calendar_workout_refs(calendars, sport, from_date, to_date)
+
         # Get active plans
         plans = self.client.get_training_plans(active=True, sport=sport)
         if not plans:
             return []
 
-        # Extract and filter scheduled workouts for each training plan
-        scheduled_workouts = []
+        # Collect the scheduled workouts of each training plan within the date range
+        refs = []
         for plan in plans:
-            plan_detail = self.client.get_training_plan_by_id(plan["trainingPlanId"])
-
-            for task in plan_detail.get("taskList", []):
-                task_workout = task["taskWorkout"]
-                if not task_workout or not task_workout.get(
-                    "workoutId"
-                ):  # exclude rest days
-                    continue
-
-                workout_date = (
-                    parse_date(task["calendarDate"])
-                    or parse_datetime(task_workout["scheduledDate"]).date()
-                )
+            plan_detail = self._get_training_plan_by_id(plan["trainingPlanId"])
+            refs.extend(_plan_workout_refs(plan_detail, from_date, to_date))
 
-                if from_date <= workout_date <= to_date:
-                    scheduled_workout = self.client.get_scheduled_workout_by_id(
-                        task_workout["workoutScheduleId"]
-                    )
-                    scheduled_workouts.append(
-                        GarminScheduledWorkout(**scheduled_workout)
-                    )
+        return refs
 
-        return scheduled_workouts
+    def fetch_scheduled_workouts(
+        self, refs: list[GarminScheduledWorkoutRef]
+    ) -> list[GarminScheduledWorkout]:
+        """
+        Fetch the details of the given scheduled workouts.
+
+        Workout definitions are often scheduled on many dates: each distinct workout is
+        fetched once, and copied to its other schedule entries.
+
+        Returns:
+            List of scheduled workout details, in the same order as `refs`
+        """
+        return list(self.iter_scheduled_workouts(refs))
+
+    def iter_scheduled_workouts(
+        self, refs: list[GarminScheduledWorkoutRef]
+    ) -> Iterator[GarminScheduledWorkout]:
+        """
+        Streaming variant of `fetch_scheduled_workouts`: yield the details of each
+        scheduled workout as soon as it is fetched, in the same order as `refs`.
+
+        At most `max_workers` workouts are fetched ahead of the consumer, and a fetched
+        workout is kept only until its last schedule entry.
+        """
+        groups = _group_by_workout(refs)
+        remaining = {key: len(group) for key, group in groups.items()}
+        fetched = self._imap_concurrently(self._fetch_group, groups.values())
+
+        scheduled_workouts = {}
+        for ref in refs:
+            key = ref.workout_id or ("schedule", ref.workout_schedule_id)
+            if key not in scheduled_workouts:
+                scheduled_workouts[key] = next(fetched)
+
+            yield _reschedule(scheduled_workouts[key], ref)
+
+            remaining[key] -= 1
+            if not remaining[key]:
+                del scheduled_workouts[key]
+
+    def _fetch_group(
+        self, group: list[GarminScheduledWorkoutRef]
+    ) -> GarminScheduledWorkout:
+        """
+        Fetch the scheduled workout of a group of references to the same workout.
+
+        With the calendar strategy, it is built from the workout definition; if the
+        definition is missing or incomplete, it is fetched through the schedule endpoint.
+        """
+        ref = group[0]
+        if self.fetch_strategy == GarminFetchStrategy.CALENDAR and ref.workout_id:
+            response = _scheduled_workout_from_definition(
+                ref, self.client.get_workout_by_id(ref.workout_id)
+            )
+            if response is not None:
+                return self._decode_scheduled_workout(response)
+
+        return self._get_scheduled_workout_by_id(ref.workout_schedule_id)
+
+    def _get_training_plan_by_id(self, training_plan_id: int) -> dict[str, Any]:
+        if self.decode_raw:
+            return decode(
+                GarminTrainingPlanDetail,
+                self.client.get_training_plan_by_id(training_plan_id, raw=True),
+            )
+        return self.client.get_training_plan_by_id(training_plan_id)
+
+    def _get_scheduled_workout_by_id(
+        self, scheduled_workout_id: int
+    ) -> GarminScheduledWorkout:
+        if self.decode_raw:
+            response = self.client.get_scheduled_workout_by_id(
+                scheduled_workout_id, raw=True
+            )
+        else:
+            response = self.client.get_scheduled_workout_by_id(scheduled_workout_id)
+        return self._decode_scheduled_workout(response)
+
+    def _decode_scheduled_workout(self, response: Any) -> GarminScheduledWorkout:
+        scheduled_workout = decode_scheduled_workout(response, self.validation)
+        if (
+            self.validation == GarminValidation.PROJECTION
+            and random.random() < self.full_validation_sample_rate
+        ):
+            validate_fully(scheduled_workout)
+        return scheduled_workout
+
+    def _map_concurrently(self, fn: Callable[[T], R], args: list[T]) -> list[R]:
+        """
+        Call `fn` on each argument, using up to `max_workers` concurrent requests.
+
+        Results are returned in the same order as `args`.
+        """
+        workers = min(self.max_workers, len(args))
+        if workers <= 1:
+            return [fn(arg) for arg in args]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(fn, args))
+
+    def _imap_concurrently(
+        self, fn: Callable[[T], R], args: Iterable[T]
+    ) -> Iterator[R]:
+        """
+        Lazy `_map_concurrently`: at most `max_workers` calls run ahead of the consumer.
+        """
+        if self.max_workers <= 1:
+            yield from map(fn, args)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            for arg in args:
+                if len(pending) == self.max_workers:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(fn, arg))
+            while pending:
+                yield pending.popleft().result()
 
     def get_power_zones_by_sport(self, sport: GarminSport) -> GarminPowerZones:
         """
@@ -93,9 +436,71 @@ class GarminTrainingPlanService:
             GarminPowerZones | None: The power zones for the specified sport,
             or None if no power zones are found for that sport.
         """
-        power_zones = self.client.get_power_zones()
+        if self.decode_raw:
+            power_zones = decode(
+                List[GarminPowerZones], self.client.get_power_zones(raw=True)
+            )
+            return next((p for p in power_zones if p.sport == sport.name), None)
+        return _find_power_zones(self.client.get_power_zones(), sport)
+
+
+class AsyncGarminTrainingPlanService:
+    """Asyncio counterpart of `GarminTrainingPlanService`, backed by an `AsyncGarminClient`."""
+
+    def __init__(self, garmin_client: AsyncGarminClient):
+        self.client = garmin_client
 
-        return next(
-            (GarminPowerZones(**p) for p in power_zones if p["sport"] == sport.name),
-            None,
+    async def get_scheduled_workouts(
+        self,
+        sport: GarminSport,
+        from_date: date | datetime | None = None,
+        to_date: date | datetime | None = None,
+    ) -> list[GarminScheduledWorkout]:
+        """
+        Get scheduled workouts for a specific sport within a date range.
+
+        Training plans and scheduled workouts are requested concurrently; the number of
+        in-flight requests is bounded by the client.
+
+        Args:
+            sport: Sport type to filter by
+            from_date: Start date (inclusive). Defaults to today.
+            to_date: End date (inclusive). Defaults to 90 days from start.
+
+        Returns:
+            List of scheduled workout details, in training plan (date) order
+        """
+        from_date, to_date = _normalize_date_range(from_date, to_date)
+        print(f"Fetching workouts for {sport.value} from {from_date} to {to_date}")
+
+        plans = await self.client.get_training_plans(active=True, sport=sport)
+        if not plans:
+            return []
+
+        plan_details = await asyncio.gather(
+            *(self.client.get_training_plan_by_id(p["trainingPlanId"]) for p in plans)
         )
+        refs = [
+            ref
+            for plan_detail in plan_details
+            for ref in _plan_workout_refs(plan_detail, from_date, to_date)
+        ]
+
+        # Fetch each distinct workout once, then copy it to its other schedule entries
+        groups = _group_by_workout(refs)
+        fetched = await asyncio.gather(
+            *(
+                self.client.get_scheduled_workout_by_id(group[0].workout_schedule_id)
+                for group in groups.values()
+            )
+        )
+        scheduled_workouts = {
+            ref: _reschedule(GarminScheduledWorkout(**scheduled_workout), ref)
+            for group, scheduled_workout in zip(groups.values(), fetched)
+            for ref in group
+        }
+        return [scheduled_workouts[ref] for ref in refs]
+
+    async def get_power_zones_by_sport(self, sport: GarminSport) -> GarminPowerZones:
+        """Asynchronous counterpart of `GarminTrainingPlanService.get_power_zones_by_sport`."""
+        return _find_power_zones(await self.client.get_power_zones(), sport)
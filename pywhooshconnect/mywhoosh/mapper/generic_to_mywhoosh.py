@@ -1,5 +1,8 @@
+import copy
 import re
-from typing import List, Optional
+from dataclasses import replace
+from datetime import date
+from typing import Optional, Sequence
 
 from pywhooshconnect.common.mapper.base import (
     BaseMapper,
@@ -16,9 +19,11 @@ from pywhooshconnect.common.model.generic_workout_step import (
     GenericWorkoutStep,
     StepType,
 )
+from pywhooshconnect.mywhoosh.mapper.power_targets import power_targets
 from pywhooshconnect.mywhoosh.model.mywhoosh_workout_dto import (
     MyWhooshWorkout,
     MyWhooshWorkoutStep,
+    MyWhooshWorkoutSteps,
 )
 
 
@@ -38,15 +43,7 @@ class GenericToMyWhooshPowerMapper(BaseMapper[int, float]):
         if not options.power_zones:
             raise RuntimeError("No power zones specified")
 
-        if zone is None:  # free ride
-            return 0
-
-        floor, ceiling = options.power_zones.get_zone(zone)
-
-        if zone == 7:  # ceiling == inf
-            return floor * options.config.get_zone7_multiplier()
-
-        return floor + (ceiling - floor) * options.config.get_zone_weight(zone)
+        return power_targets(options).lookup(zone)
 
 
 class GenericToMyWhooshStepMapper(BaseMapper[GenericWorkoutStep, MyWhooshWorkoutStep]):
@@ -54,7 +51,7 @@ class GenericToMyWhooshStepMapper(BaseMapper[GenericWorkoutStep, MyWhooshWorkout
 
     def map(
         self, step: GenericWorkoutStep, options: Optional[MapperOptions] = None
-    ) -> List[MyWhooshWorkoutStep]:
+    ) -> Sequence[MyWhooshWorkoutStep]:
         if isinstance(step, GenericAtomicStep) or isinstance(step, GenericIntervalStep):
             return [
                 MyWhooshWorkoutStep(
@@ -64,24 +61,30 @@ class GenericToMyWhooshStepMapper(BaseMapper[GenericWorkoutStep, MyWhooshWorkout
                     ),
                     Id=step.step_id,
                     WorkoutMessage=[step.description] if step.description else [],
-                    Rpm=step.rpm if step.rpm else 0,
+                    Rpm=step.rpm if step.rpm else 0.0,
                     Power=self.power_mapper.map(step.power_zone, options),
-                    Pace=0,
-                    StartPower=0,
-                    EndPower=0,
+                    Pace=0.0,
+                    StartPower=0.0,
+                    EndPower=0.0,
                     Time=step.duration_in_seconds,
                     IsManualGrade=False,
-                    ManualGradeValue=0,
+                    ManualGradeValue=0.0,
                     ShowAveragePower=True,
                     FlatRoad=0,
                 )
             ]
         if isinstance(step, GenericStepWithIntervals):
-            return [
-                interval
-                for intervals in step.steps
-                for interval in self.map(intervals, options)
-            ] * step.iterations
+            # Keep the intervals once, expanded only when iterated
+            mapped_steps = MyWhooshWorkoutSteps()
+            mapped_steps.append_block(
+                (
+                    interval
+                    for intervals in step.steps
+                    for interval in self.map(intervals, options)
+                ),
+                step.iterations,
+            )
+            return mapped_steps
 
         raise TypeError(f"{type(step)} not supported")
 
@@ -92,16 +95,11 @@ class GenericToMyWhooshWorkoutMapper(BaseMapper[GenericWorkout, MyWhooshWorkout]
     def map(
         self, workout: GenericWorkout, options: Optional[MapperOptions] = None
     ) -> MyWhooshWorkout:
-        # Get flattened steps and map them
-        workout_steps = [
-            mapped_step
-            for step in workout.flatten_steps()
-            for mapped_step in self.step_mapper.map(step, options)
-        ]
-
-        # Reindex sequentially
-        for idx, step in enumerate(workout_steps, start=1):
-            step.Id = idx
+        # Map the steps in step_id order, keeping repetitions unexpanded, and number
+        # them sequentially
+        workout_steps = MyWhooshWorkoutSteps(numbered=True)
+        for step in sorted(workout.steps, key=lambda step: step.step_id):
+            workout_steps.extend(self.step_mapper.map(step, options))
 
         return MyWhooshWorkout(
             Name=_name(workout),
@@ -111,3 +109,19 @@ class GenericToMyWhooshWorkoutMapper(BaseMapper[GenericWorkout, MyWhooshWorkout]
             Time=int(workout.duration().total_seconds()),
             AuthorName="Garmin powered by pyWhooshGarmin",
         )
+
+    def reschedule(
+        self,
+        mywhoosh_workout: MyWhooshWorkout,
+        workout: GenericWorkout,
+        scheduled_date: Optional[date],
+    ) -> MyWhooshWorkout:
+        """
+        Copy a workout mapped from `workout` to another scheduled date, without mapping
+        its steps again. The copy gets its own name and Id, and shares the steps.
+        """
+        # Shallow copy rather than `dataclasses.replace`, which would validate again
+        rescheduled = copy.copy(mywhoosh_workout)
+        rescheduled.Name = _name(replace(workout, scheduled_date=scheduled_date))
+        rescheduled.Id = rescheduled.content_id()
+        return rescheduled
@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from pywhooshconnect.common.mapper.base import PowerZonesOptions
+from pywhooshconnect.common.model.power_zones import PowerZones
+from pywhooshconnect.mywhoosh.mapper.power_zones_config import PowerZoneConfig
+
+FREE_RIDE_POWER = 0
+
+
+@dataclass(frozen=True)
+class PowerTargetTable:
+    """
+    MyWhoosh `Power` value of every power zone, computed once for a pair of power zones
+    and configuration.
+
+    Slot 0 holds the free ride value, and slots 1-7 the value of each zone.
+    """
+
+    targets: tuple[float, ...]
+
+    @classmethod
+    def compile(
+        cls, power_zones: PowerZones, config: PowerZoneConfig
+    ) -> "PowerTargetTable":
+        targets = [FREE_RIDE_POWER]
+        for zone in range(1, 8):
+            floor, ceiling = power_zones.get_zone(zone)
+            if zone == 7:  # ceiling == inf
+                targets.append(floor * config.get_zone7_multiplier())
+            else:
+                targets.append(floor + (ceiling - floor) * config.get_zone_weight(zone))
+        return cls(tuple(targets))
+
+    def lookup(self, zone: Optional[int]) -> float:
+        """
+        Return the MyWhoosh power of a zone, or of a free ride if `zone` is None.
+
+        Raises:
+            ValueError: If zone is not between 1 and 7
+        """
+        if zone is None:
+            return self.targets[0]
+        if not 1 <= zone <= 7:
+            raise ValueError("Zone must be between 1 and 7")
+        return self.targets[zone]
+
+
+def power_targets(options: PowerZonesOptions) -> PowerTargetTable:
+    """Power target table of the options, compiled on first use."""
+    table = options.compiled.get(PowerTargetTable)
+    if table is None:
+        table = PowerTargetTable.compile(options.power_zones, options.config)
+        options.compiled[PowerTargetTable] = table
+    return table
@@ -1,9 +1,16 @@
+import threading
+from dataclasses import dataclass
 from datetime import timedelta
 from pathlib import Path
 from typing import Dict
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
 
 class PowerZoneConfigurationError(Exception):
     """Raised when the power zone configuration is invalid."""
@@ -11,23 +18,120 @@ class PowerZoneConfigurationError(Exception):
     pass
 
 
-def _load_config(config_path: str) -> dict:
+DEFAULT_ZONE_WEIGHT = 0.5
+DEFAULT_ZONE7_MULTIPLIER = 1.1
+DEFAULT_LAP_BUTTON_DURATION_SECONDS = 30
+
+
+def _load_config(config_path: str | Path) -> dict:
     """Load YAML configuration file"""
     path = Path(config_path)
     if not path.exists():
         raise FileNotFoundError(f"Config file not found: {config_path}")
 
     with open(path, "r") as file:
-        return yaml.safe_load(file)
+        return yaml.load(file, Loader=SafeLoader) or {}
+
+
+@dataclass(frozen=True)
+class PowerZoneSettings:
+    """Validated, immutable power zone configuration."""
+
+    default_zone_weight: float = DEFAULT_ZONE_WEIGHT
+    # Weights of the zones configured explicitly, sorted by zone
+    zone_weights: tuple[tuple[int, float], ...] = ()
+    zone7_multiplier: float = DEFAULT_ZONE7_MULTIPLIER
+    lap_button_duration: timedelta = timedelta(
+        seconds=DEFAULT_LAP_BUTTON_DURATION_SECONDS
+    )
+
+    @classmethod
+    def from_dict(cls, config: dict) -> "PowerZoneSettings":
+        """
+        Validate a raw configuration, falling back to defaults for missing values.
+
+        Raises:
+            PowerZoneConfigurationError: If a zone weight or the zone 7 multiplier is invalid
+        """
+        power_zones = config.get("power_zones") or {}
+        zones_config = power_zones.get("zones") or {}
+
+        zone_weights = {}
+        for zone_num, zone_config in zones_config.items():
+            if "weight" in zone_config:
+                if zone_num == 7:
+                    raise PowerZoneConfigurationError(
+                        "Invalid configuration: Zone 7 cannot specify a weight. Use a multiplier instead."
+                    )
+
+                weight = zone_config["weight"]
+                if not (0 <= weight <= 1):
+                    raise PowerZoneConfigurationError(
+                        f"Invalid weight for zone {zone_num}: must be between 0 and 1, got {weight}"
+                    )
+                zone_weights[zone_num] = weight
+
+        zone7_multiplier = (zones_config.get(7) or {}).get(
+            "multiplier", DEFAULT_ZONE7_MULTIPLIER
+        )
+        if zone7_multiplier < 1:
+            raise PowerZoneConfigurationError(
+                f"Invalid multiplier for zone 7: must be greater than or equal to 1, got {zone7_multiplier}"
+            )
+
+        return cls(
+            default_zone_weight=power_zones.get(
+                "default_zone_weight", DEFAULT_ZONE_WEIGHT
+            ),
+            zone_weights=tuple(sorted(zone_weights.items())),
+            zone7_multiplier=zone7_multiplier,
+            lap_button_duration=timedelta(
+                seconds=config.get(
+                    "lap_button_duration_seconds", DEFAULT_LAP_BUTTON_DURATION_SECONDS
+                )
+            ),
+        )
+
+
+# Settings of the configuration files already loaded, keyed by path and modification time
+_settings_cache: dict[tuple[str, int, int], PowerZoneSettings] = {}
+_settings_cache_lock = threading.Lock()
+
+
+def load_settings(config_path: str | Path) -> PowerZoneSettings:
+    """
+    Load and validate a YAML configuration file.
+
+    Files are parsed once per process: unless the file is modified, later calls return
+    the same settings.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        PowerZoneConfigurationError: If the configuration is invalid
+    """
+    path = Path(config_path).expanduser().resolve()
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config file not found: {config_path}") from None
+
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _settings_cache_lock:
+        settings = _settings_cache.get(key)
+    if settings is None:
+        settings = PowerZoneSettings.from_dict(_load_config(path))
+        with _settings_cache_lock:
+            _settings_cache[key] = settings
+    return settings
 
 
 class PowerZoneConfig:
     """Configuration for power zone mapping with defaults"""
 
     # Default values if config file is missing or incomplete
-    DEFAULT_ZONE_WEIGHT = 0.5
-    DEFAULT_ZONE7_MULTIPLIER = 1.1
-    DEFAULT_LAP_BUTTON_DURATION_SECONDS = 30
+    DEFAULT_ZONE_WEIGHT = DEFAULT_ZONE_WEIGHT
+    DEFAULT_ZONE7_MULTIPLIER = DEFAULT_ZONE7_MULTIPLIER
+    DEFAULT_LAP_BUTTON_DURATION_SECONDS = DEFAULT_LAP_BUTTON_DURATION_SECONDS
 
     def __init__(self, config_path: str = None, config_dict: dict = None):
         """
@@ -49,51 +153,34 @@ class PowerZoneConfig:
         -----
         - Zone 7 is treated specially and cannot have a direct weight defined.
         - If the configuration file is missing or incomplete, default values are used.
+        - The configuration is validated and frozen on construction (see `settings`).
         """
         if config_dict is not None:
-            self.config = config_dict
+            self.settings = PowerZoneSettings.from_dict(config_dict)
         else:
             if config_path is None:
                 project_root = Path(__file__).parent.parent.parent
                 config_path = project_root / "config" / "power_zones_config.yml"
 
             try:
-                self.config = _load_config(config_path)
+                self.settings = load_settings(config_path)
             except FileNotFoundError:
-                self.config = {}
+                self.settings = PowerZoneSettings()
 
-        try:
-            power_zones = self.config.get("power_zones", {})
-            self.default_zone_weight = power_zones.get(
-                "default_zone_weight", self.DEFAULT_ZONE_WEIGHT
-            )
-            self.zone_weights = self._parse_zone_weights()
-        except FileNotFoundError:
-            # Use defaults if config file doesn't exist
-            self.config = {}
-            self.default_zone_weight = self.DEFAULT_ZONE_WEIGHT
-            self.zone_weights = {}
-
-    def _parse_zone_weights(self) -> Dict[int, float]:
-        """Extract per-zone weights from config"""
-        zones_config = self.config.get("power_zones", {}).get("zones", {})
-        zone_weights = {}
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, PowerZoneConfig) and self.settings == other.settings
 
-        for zone_num, zone_config in zones_config.items():
-            if "weight" in zone_config:
-                if zone_num == 7:
-                    raise PowerZoneConfigurationError(
-                        "Invalid configuration: Zone 7 cannot specify a weight. Use a multiplier instead."
-                    )
+    def __hash__(self) -> int:
+        return hash(self.settings)
 
-                weight = zone_config["weight"]
-                if not (0 <= weight <= 1):
-                    raise PowerZoneConfigurationError(
-                        f"Invalid weight for zone {zone_num}: must be between 0 and 1, got {weight}"
-                    )
-                zone_weights[zone_num] = zone_config["weight"]
+    @property
+    def default_zone_weight(self) -> float:
+        return self.settings.default_zone_weight
 
-        return zone_weights
+    @property
+    def zone_weights(self) -> Dict[int, float]:
+        """Weights of the zones configured explicitly"""
+        return dict(self.settings.zone_weights)
 
     def get_zone_weight(self, zone: int) -> float:
         """Get weight for specific zone, falling back to default"""
@@ -101,19 +188,8 @@ class PowerZoneConfig:
 
     def get_zone7_multiplier(self) -> float:
         """Get multiplier for zone 7, with optional override"""
-        zones_config = self.config.get("power_zones", {}).get("zones", {})
-        zone7_multiplier = zones_config.get(7, {}).get(
-            "multiplier", self.DEFAULT_ZONE7_MULTIPLIER
-        )
-        if zone7_multiplier < 1:
-            raise PowerZoneConfigurationError(
-                f"Invalid multiplier for zone 7: must be greater than or equal to 1, got {zone7_multiplier}"
-            )
-        return zone7_multiplier
+        return self.settings.zone7_multiplier
 
     def get_lap_button_duration(self) -> timedelta:
         """Get the lap button duration from config"""
-        lap_button_duration_seconds = self.config.get(
-            "lap_button_duration_seconds", self.DEFAULT_LAP_BUTTON_DURATION_SECONDS
-        )
-        return timedelta(seconds=lap_button_duration_seconds)
+        return self.settings.lap_button_duration
@@ -2,14 +2,20 @@
 DTOs (Data Transfer Objects) for MyWhoosh workout.
 """
 
-import random
-from dataclasses import field
-from typing import List, Optional
+import hashlib
+from bisect import bisect_right
+from dataclasses import FrozenInstanceError, fields
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
 
+from pydantic import TypeAdapter
 from pydantic.dataclasses import dataclass
+from pydantic_core import core_schema
 
+MIN_WORKOUT_ID = 1_000_000
+MAX_WORKOUT_ID = 99_999_999
 
-@dataclass
+
+@dataclass(slots=True)
 class MyWhooshWorkoutStep:
     IntervalId: int
     StepType: str
@@ -27,14 +33,155 @@ class MyWhooshWorkoutStep:
     FlatRoad: int
 
 
+_STEP_FIELDS = tuple(step_field.name for step_field in fields(MyWhooshWorkoutStep))
+
+
+class _StepOccurrence(MyWhooshWorkoutStep):
+    """
+    Read-only occurrence of a step of `MyWhooshWorkoutSteps`: it is created on access,
+    so assigning to it would silently change nothing. Copies are regular steps.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(
+            f"cannot assign to field {name!r}: occurrences of MyWhooshWorkoutSteps are "
+            "read-only, edit the steps in `blocks` or build new steps instead"
+        )
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, MyWhooshWorkoutStep):
+            return all(
+                getattr(self, name) == getattr(other, name) for name in _STEP_FIELDS
+            )
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return MyWhooshWorkoutStep, tuple(getattr(self, name) for name in _STEP_FIELDS)
+
+
+class MyWhooshWorkoutSteps(Sequence[MyWhooshWorkoutStep]):
+    """
+    Steps of a MyWhoosh workout, with each repeated block of steps stored once together
+    with its number of iterations.
+
+    Indexing and iterating yield a distinct step for every occurrence, so memory stays
+    proportional to the unique steps until the workout is serialized, which streams the
+    occurrences. If `numbered`, occurrences get sequential Ids starting from 1, otherwise
+    they keep the Id of the step they repeat. Since occurrences are created on access,
+    they are read-only: assigning to one raises `FrozenInstanceError`, while a copy of
+    it is an editable step.
+    """
+
+    __slots__ = ("blocks", "numbered", "_ends")
+
+    def __init__(
+        self, steps: Iterable[MyWhooshWorkoutStep] = (), numbered: bool = False
+    ):
+        self.blocks: List[tuple[tuple[MyWhooshWorkoutStep, ...], int]] = []
+        self.numbered = numbered
+        self._ends: List[int] = []  # number of occurrences up to the end of each block
+        self.extend(steps)
+
+    def append_block(
+        self, steps: Iterable[MyWhooshWorkoutStep], iterations: int = 1
+    ) -> None:
+        """Append `steps`, repeated `iterations` times."""
+        steps = tuple(steps)
+        if not steps or iterations <= 0:
+            return
+
+        if iterations == 1 and self.blocks and self.blocks[-1][1] == 1:
+            # Merge consecutive steps that are not repeated in a single block
+            previous, _ = self.blocks.pop()
+            self._ends.pop()
+            steps = previous + steps
+
+        self.blocks.append((steps, iterations))
+        self._ends.append(
+            (self._ends[-1] if self._ends else 0) + len(steps) * iterations
+        )
+
+    def extend(self, steps: Iterable[MyWhooshWorkoutStep]) -> None:
+        """Append steps, keeping the blocks of another `MyWhooshWorkoutSteps`."""
+        if isinstance(steps, MyWhooshWorkoutSteps):
+            for block, iterations in steps.blocks:
+                self.append_block(block, iterations)
+        else:
+            self.append_block(steps)
+
+    def __len__(self) -> int:
+        return self._ends[-1] if self._ends else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("step index out of range")
+
+        block = bisect_right(self._ends, index)
+        steps, _ = self.blocks[block]
+        start = self._ends[block - 1] if block else 0
+        return self._occurrence(steps[(index - start) % len(steps)], index)
+
+    def __iter__(self) -> Iterator[MyWhooshWorkoutStep]:
+        index = 0
+        for steps, iterations in self.blocks:
+            for _ in range(iterations):
+                for step in steps:
+                    yield self._occurrence(step, index)
+                    index += 1
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, MyWhooshWorkoutSteps) or isinstance(other, list):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+    def _occurrence(self, step: MyWhooshWorkoutStep, index: int) -> MyWhooshWorkoutStep:
+        occurrence = object.__new__(_StepOccurrence)
+        for name in _STEP_FIELDS:
+            object.__setattr__(occurrence, name, getattr(step, name))
+        if self.numbered:
+            object.__setattr__(occurrence, "Id", index + 1)
+        return occurrence
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type, handler):
+        # Steps are validated from a list, and serialized as a stream of occurrences
+        from_list = core_schema.no_info_after_validator_function(
+            cls, handler.generate_schema(List[MyWhooshWorkoutStep])
+        )
+        return core_schema.union_schema(
+            [core_schema.is_instance_schema(cls), from_list],
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                iter,
+                return_schema=core_schema.generator_schema(
+                    handler.generate_schema(MyWhooshWorkoutStep)
+                ),
+            ),
+        )
+
+
 @dataclass
 class MyWhooshWorkout:
     Name: str
     Description: str
     StepCount: int
     Time: int
-    WorkoutStepsArray: List[MyWhooshWorkoutStep]
-    Id: int = field(default_factory=lambda: random.randint(1_000_000, 99_999_999))
+    WorkoutStepsArray: MyWhooshWorkoutSteps
+    Id: Optional[int] = None  # derived from the content when not given
     Mode: str = "E_Ride"
     ERGMode: str = "E_ON"
     IsRecovery: bool = False
@@ -43,9 +190,10 @@ class MyWhooshWorkout:
     IsTT: bool = False
     IsTSS: bool = False
     IsIF: bool = False
-    FTPMultiplier: float = 1
-    StressPoint: float = 0
-    CustomTagDescription: str = 2
+    # Integers unless set otherwise: a float annotation would write 1.0 and 0.0
+    FTPMultiplier: int | float = 1
+    StressPoint: int | float = 0
+    CustomTagDescription: int = 2
     CategoryId: int = 200000000
     SubcategoryId: int = 1
     Type: str = "E_Normal"
@@ -58,8 +206,36 @@ class MyWhooshWorkout:
     TSS: Optional[float] = None
     KJ: Optional[float] = None
 
-    def to_json(self) -> str:
-        from pydantic.json import pydantic_encoder
-        import json
+    def __post_init__(self):
+        if self.Id is None:
+            self.Id = self.content_id()
+
+    @classmethod
+    def from_json(cls, data: str | bytes) -> "MyWhooshWorkout":
+        """Parse a workout from MyWhoosh JSON, as written by `to_json_bytes`."""
+        return _WORKOUT_ADAPTER.validate_json(data)
+
+    def content_id(self, *keys: Any) -> int:
+        """
+        Identifier derived from the content of the workout (every field but `Id`) and
+        the given keys, so that the same workout gets the same Id on every run.
+        """
+        digest = hashlib.sha256(repr(keys).encode())
+        digest.update(_WORKOUT_ADAPTER.dump_json(self, exclude={"Id"}))
+        value = int.from_bytes(digest.digest()[:8], "big")
+        return MIN_WORKOUT_ID + value % (MAX_WORKOUT_ID - MIN_WORKOUT_ID + 1)
+
+    def to_json(self, pretty: bool = False) -> str:
+        return self.to_json_bytes(pretty).decode("utf-8")
+
+    def to_json_bytes(self, pretty: bool = False) -> bytes:
+        """
+        Serialize the workout to UTF-8 JSON in a single pass.
+
+        Args:
+            pretty: Indent the output with 4 spaces instead of writing it compactly.
+        """
+        return _WORKOUT_ADAPTER.dump_json(self, indent=4 if pretty else None)
+
 
-        return json.dumps(self, default=pydantic_encoder)
+_WORKOUT_ADAPTER = TypeAdapter(MyWhooshWorkout)
@@ -0,0 +1,239 @@
+import hashlib
+import json
+import os
+import zlib
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from pywhooshconnect import __version__
+from pywhooshconnect.common.model.generic_workout import (
+    GenericAtomicStep,
+    GenericIntervalStep,
+    GenericStepWithIntervals,
+    GenericWorkout,
+)
+from pywhooshconnect.common.model.generic_workout_step import StepType
+from pywhooshconnect.common.model.power_zones import PowerZones
+from pywhooshconnect.garmin.client.response_cache import SizeLimit, file_size
+from pywhooshconnect.garmin.model.garmin_scheduled_workout_dto import (
+    GarminScheduledWorkout,
+)
+from pywhooshconnect.mywhoosh.mapper.power_zones_config import PowerZoneSettings
+from pywhooshconnect.service.sync_state import write_atomically
+
+# Version of the entry format, part of the keys
+ENTRY_FORMAT = 1
+
+_HEADER_SIZE = 4  # bytes holding the size of the generic workout in an entry
+
+
+def conversion_key(
+    scheduled_workout: GarminScheduledWorkout,
+    power_zones: PowerZones,
+    settings: PowerZoneSettings,
+) -> str:
+    """
+    Stable hash of the inputs of a conversion: the Garmin workout and its date, the power
+    zones and the power zone configuration.
+    """
+    inputs = {
+        "version": [__version__, ENTRY_FORMAT],
+        "dto": type(scheduled_workout).__name__,
+        "workout": asdict(scheduled_workout.workout),
+        "calendar_date": scheduled_workout.calendarDate,
+        "power_zones": asdict(power_zones),
+        "settings": asdict(settings),
+    }
+    data = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+@dataclass
+class CachedConversion:
+    """Result of the conversion of a Garmin scheduled workout."""
+
+    generic_workout: GenericWorkout
+    mywhoosh_json: bytes  # compact MyWhoosh JSON, see `MyWhooshWorkout.to_json_bytes`
+
+
+class ConversionCache:
+    """
+    Persistent on-disk cache of workout conversions, keyed by `conversion_key`.
+
+    Conversions are pure functions of their inputs, so entries never expire: a changed
+    workout, FTP or configuration simply has another key. Each entry stores the
+    `GenericWorkout` and the MyWhoosh JSON, compressed, and the least recently used
+    entries are evicted once the cache grows beyond `max_size_bytes`.
+    """
+
+    DEFAULT_DIRECTORY = "~/.cache/pywhooshconnect/conversions"
+    DEFAULT_MAX_SIZE_BYTES = 50 * 1024 * 1024
+
+    def __init__(
+        self,
+        directory: str | Path = DEFAULT_DIRECTORY,
+        max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES,
+    ):
+        """
+        Args:
+            directory: Directory where conversions are stored. Created if missing.
+            max_size_bytes: Maximum total size of the cache on disk.
+        """
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = max_size_bytes
+        self._size_limit = SizeLimit(self.directory, "*.bin")
+
+    def get(self, key: str) -> Optional[CachedConversion]:
+        """Return the cached conversion for a key, or None if missing or unreadable."""
+        entry_path = self._entry_path(key)
+        try:
+            data = zlib.decompress(entry_path.read_bytes())
+            size = int.from_bytes(data[:_HEADER_SIZE], "big")
+            generic_json = data[_HEADER_SIZE : _HEADER_SIZE + size]
+            conversion = CachedConversion(
+                generic_workout=_decode_workout(json.loads(generic_json)),
+                mywhoosh_json=data[_HEADER_SIZE + size :],
+            )
+        except FileNotFoundError:
+            return None
+        except (zlib.error, ValueError, TypeError, KeyError, IndexError):
+            size = file_size(entry_path)
+            entry_path.unlink(missing_ok=True)
+            self._size_limit.update(-size, self.max_size_bytes)
+            return None
+
+        # Mark the entry as recently used
+        os.utime(entry_path)
+        return conversion
+
+    def __contains__(self, key: str) -> bool:
+        return self._entry_path(key).exists()
+
+    def set(self, key: str, conversion: CachedConversion) -> None:
+        """Store a conversion, evicting old entries if the cache is full."""
+        generic_json = json.dumps(
+            _encode_workout(conversion.generic_workout), separators=(",", ":")
+        ).encode()
+        data = zlib.compress(
+            len(generic_json).to_bytes(_HEADER_SIZE, "big")
+            + generic_json
+            + conversion.mywhoosh_json
+        )
+
+        entry_path = self._entry_path(key)
+        previous_size = file_size(entry_path)
+        write_atomically(entry_path, data)
+
+        self._size_limit.update(len(data) - previous_size, self.max_size_bytes)
+
+    def clear(self) -> None:
+        """Remove all cached conversions."""
+        for entry_path in self.directory.glob("*.bin"):
+            entry_path.unlink(missing_ok=True)
+        self._size_limit.reset()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}.bin"
+
+
+def _encode_workout(workout: GenericWorkout) -> list[Any]:
+    """Encode a workout as nested lists, the step fields in declaration order."""
+    return [
+        workout.name,
+        workout.description,
+        workout.sport,
+        workout.scheduled_date.isoformat() if workout.scheduled_date else None,
+        [_encode_step(step) for step in workout.steps],
+    ]
+
+
+def _encode_step(step) -> list[Any]:
+    if isinstance(step, GenericAtomicStep):
+        return [
+            "atomic",
+            step.step_id,
+            step.duration_in_seconds,
+            step.type.value,
+            step.power_zone,
+            step.description,
+            step.rpm,
+        ]
+    if isinstance(step, GenericStepWithIntervals):
+        return [
+            "intervals",
+            step.step_id,
+            step.type.value,
+            [
+                [
+                    interval.step_id,
+                    interval.duration_in_seconds,
+                    interval.power_zone,
+                    interval.type.value,
+                    interval.description,
+                    interval.rpm,
+                ]
+                for interval in step.steps
+            ],
+            step.iterations,
+            step.description,
+        ]
+    raise TypeError(f"{type(step)} not supported")
+
+
+def _decode_workout(data: list[Any]) -> GenericWorkout:
+    name, description, sport, scheduled_date, steps = data
+    return GenericWorkout(
+        name=name,
+        description=description,
+        steps=[_decode_step(step) for step in steps],
+        sport=sport,
+        scheduled_date=_decode_date(scheduled_date),
+    )
+
+
+def _decode_date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    # Scheduled dates are dates, but may be datetimes when set by hand
+    return (
+        date.fromisoformat(value) if len(value) == 10 else datetime.fromisoformat(value)
+    )
+
+
+def _decode_step(data: list[Any]):
+    kind, *fields = data
+    if kind == "atomic":
+        step_id, duration, step_type, power_zone, description, rpm = fields
+        return GenericAtomicStep(
+            step_id=step_id,
+            duration_in_seconds=duration,
+            type=StepType(step_type),
+            power_zone=power_zone,
+            description=description,
+            rpm=rpm,
+        )
+    if kind == "intervals":
+        step_id, step_type, intervals, iterations, description = fields
+        return GenericStepWithIntervals(
+            step_id=step_id,
+            type=StepType(step_type),
+            steps=[_decode_interval(interval) for interval in intervals],
+            iterations=iterations,
+            description=description,
+        )
+    raise ValueError(f"Unknown step kind {kind}")
+
+
+def _decode_interval(data: list[Any]) -> GenericIntervalStep:
+    step_id, duration, power_zone, step_type, description, rpm = data
+    return GenericIntervalStep(
+        step_id=step_id,
+        duration_in_seconds=duration,
+        power_zone=power_zone,
+        type=StepType(step_type),
+        description=description,
+        rpm=rpm,
+    )
@@ -0,0 +1,491 @@
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from garminconnect import GarminConnectAuthenticationError
+
+from pywhooshconnect.garmin.client.GarminClient import GarminClient
+from pywhooshconnect.garmin.client.rate_limit import RetryPolicy
+from pywhooshconnect.garmin.client.response_cache import ResponseCache
+from pywhooshconnect.service.conversion_cache import ConversionCache
+from pywhooshconnect.service.roster_sync_service import (
+    ClientFactory,
+    RosterAccount,
+    RosterError,
+    load_roster,
+    login,
+)
+from pywhooshconnect.service.workout_sync_service import (
+    GarminToMyWhooshWorkoutSyncService,
+)
+
+# Errors that retrying cannot fix: the job fails at once
+PERMANENT_ERRORS = (GarminConnectAuthenticationError, RosterError)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    account TEXT NOT NULL,
+    from_date TEXT NOT NULL,
+    to_date TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_token TEXT,
+    lease_expires_at REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, available_at);
+"""
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class Job:
+    """Sync of one roster account over a date range."""
+
+    id: int
+    account: str
+    from_date: date
+    to_date: date
+    status: JobStatus
+    attempts: int
+    error: Optional[str] = None
+    # Token of the lease held by the worker running the job
+    lease_token: Optional[str] = None
+
+
+class JobQueue:
+    """
+    Persistent queue of sync jobs, stored in a SQLite database.
+
+    Workers claim a job by taking a lease on it, which they renew while they run it
+    (`heartbeat`). If a worker crashes, its lease expires and the job is claimed by
+    another worker. Failed jobs are retried with exponential backoff, up to
+    `retry_policy.max_attempts` attempts. Completing or failing a job requires the
+    lease of the claim: it is a no-op for a worker whose lease was taken over, so
+    each job completes at most once.
+
+    The database can be shared by the threads and processes of a machine.
+    """
+
+    DEFAULT_LEASE_SECONDS = 600
+
+    def __init__(
+        self,
+        path: str | Path,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        retry_policy: Optional[RetryPolicy] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            path: SQLite database file. Created if missing.
+            lease_seconds: Time a worker holds a job without renewing its lease.
+            retry_policy: Number of attempts and backoff of the failed jobs. Defaults to
+                5 attempts, with delays from 30 seconds up to an hour.
+            clock: Current time in seconds, to be replaced in tests.
+        """
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_attempts=5, base_delay_seconds=30, max_delay_seconds=3600
+        )
+        self._clock = clock
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+
+    def enqueue(
+        self, account: str, from_date: date, to_date: date, requeue: bool = False
+    ) -> int:
+        """
+        Add a job, and return its id.
+
+        If the same account and date range already have a pending, running or done job,
+        no job is added and the id of the existing one is returned, so that running the
+        same sync again only resumes what is left. Failed jobs are added again.
+
+        Args:
+            requeue: Add the job again even if it is done.
+        """
+        from_date, to_date = _as_date(from_date), _as_date(to_date)
+        statuses = [JobStatus.PENDING.value, JobStatus.RUNNING.value]
+        if not requeue:
+            statuses.append(JobStatus.DONE.value)
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT id FROM jobs WHERE account = ? AND from_date = ? AND "
+                f"to_date = ? AND status IN ({', '.join('?' * len(statuses))}) "
+                "ORDER BY id DESC LIMIT 1",
+                (account, from_date.isoformat(), to_date.isoformat(), *statuses),
+            ).fetchone()
+            if row is not None:
+                return row[0]
+            return connection.execute(
+                "INSERT INTO jobs (account, from_date, to_date, status, available_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    account,
+                    from_date.isoformat(),
+                    to_date.isoformat(),
+                    JobStatus.PENDING.value,
+                    self._clock(),
+                ),
+            ).lastrowid
+
+    def claim(self) -> Optional[Job]:
+        """
+        Lease the next job ready to run, or return None if there is none.
+
+        Ready jobs are the pending jobs whose backoff is over, and the running jobs whose
+        lease expired. A job whose lease expired on its last attempt (e.g. its worker
+        crashed every time) fails instead.
+        """
+        now = self._clock()
+        token = uuid.uuid4().hex
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, lease_token = NULL, lease_expires_at = NULL, "
+                "error = ? WHERE status = ? AND lease_expires_at <= ? AND attempts >= ?",
+                (
+                    JobStatus.FAILED.value,
+                    "Lease expired on the last attempt",
+                    JobStatus.RUNNING.value,
+                    now,
+                    self.retry_policy.max_attempts,
+                ),
+            )
+            row = connection.execute(
+                "SELECT id FROM jobs WHERE (status = ? AND available_at <= ?) "
+                "OR (status = ? AND lease_expires_at <= ?) "
+                "ORDER BY available_at, id LIMIT 1",
+                (JobStatus.PENDING.value, now, JobStatus.RUNNING.value, now),
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_token = ?, "
+                "lease_expires_at = ? WHERE id = ?",
+                (JobStatus.RUNNING.value, token, now + self.lease_seconds, row[0]),
+            )
+            return self._job(connection, row[0])
+
+    def heartbeat(self, job: Job) -> bool:
+        """Renew the lease of a claimed job. Return False if the lease was lost."""
+        with self._transaction() as connection:
+            return self._update_leased(
+                connection, job, lease_expires_at=self._clock() + self.lease_seconds
+            )
+
+    def complete(self, job: Job) -> bool:
+        """
+        Mark a claimed job as done. Return False, changing nothing, if the job is no
+        longer leased by this claim (e.g. it was already completed).
+        """
+        with self._transaction() as connection:
+            return self._update_leased(
+                connection,
+                job,
+                status=JobStatus.DONE.value,
+                lease_token=None,
+                lease_expires_at=None,
+                error=None,
+            )
+
+    def fail(self, job: Job, error: BaseException) -> bool:
+        """
+        Record the failure of a claimed job: it is retried after a backoff delay, unless
+        it made all its attempts or the error is permanent. Return False, changing
+        nothing, if the job is no longer leased by this claim.
+        """
+        retry = (
+            not isinstance(error, PERMANENT_ERRORS)
+            and job.attempts < self.retry_policy.max_attempts
+        )
+        message = f"{type(error).__name__}: {error}"
+        with self._transaction() as connection:
+            if retry:
+                return self._update_leased(
+                    connection,
+                    job,
+                    status=JobStatus.PENDING.value,
+                    available_at=self._clock() + self.retry_policy.delay(job.attempts),
+                    lease_token=None,
+                    lease_expires_at=None,
+                    error=message,
+                )
+            return self._update_leased(
+                connection,
+                job,
+                status=JobStatus.FAILED.value,
+                lease_token=None,
+                lease_expires_at=None,
+                error=message,
+            )
+
+    def get(self, job_id: int) -> Job:
+        with self._connect() as connection:
+            return self._job(connection, job_id)
+
+    def jobs(self) -> List[Job]:
+        """All the jobs, in the order they were added."""
+        with self._connect() as connection:
+            rows = connection.execute("SELECT * FROM jobs ORDER BY id").fetchall()
+        return [_job_from_row(row) for row in rows]
+
+    def unfinished(self) -> int:
+        """Number of pending and running jobs."""
+        with self._connect() as connection:
+            return connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)",
+                (JobStatus.PENDING.value, JobStatus.RUNNING.value),
+            ).fetchone()[0]
+
+    def _update_leased(
+        self, connection: sqlite3.Connection, job: Job, **values
+    ) -> bool:
+        assignments = ", ".join(f"{column} = ?" for column in values)
+        cursor = connection.execute(
+            f"UPDATE jobs SET {assignments} "
+            "WHERE id = ? AND status = ? AND lease_token = ?",
+            (*values.values(), job.id, JobStatus.RUNNING.value, job.lease_token),
+        )
+        return cursor.rowcount == 1
+
+    def _job(self, connection: sqlite3.Connection, job_id: int) -> Job:
+        row = connection.execute(
+            "SELECT * FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"No job {job_id}")
+        return _job_from_row(row)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A connection per operation, so that the queue can be used from any thread
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction, serialized with the other workers."""
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+
+def _as_date(value: date | datetime) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _job_from_row(row: sqlite3.Row) -> Job:
+    return Job(
+        id=row["id"],
+        account=row["account"],
+        from_date=date.fromisoformat(row["from_date"]),
+        to_date=date.fromisoformat(row["to_date"]),
+        status=JobStatus(row["status"]),
+        attempts=row["attempts"],
+        error=row["error"],
+        lease_token=row["lease_token"],
+    )
+
+
+class JobWorker:
+    """
+    Run the jobs of a `JobQueue`: sync the workouts of the job's roster account over the
+    job's date range.
+    """
+
+    DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        accounts: List[RosterAccount],
+        max_workers: int = 1,
+        client_factory: Optional[ClientFactory] = None,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        response_cache: Optional[ResponseCache] = None,
+        conversion_cache: Optional[ConversionCache] = None,
+    ):
+        """
+        Args:
+            queue: Queue of the jobs.
+            accounts: Roster accounts the jobs refer to, by name.
+            max_workers: Maximum number of workouts fetched concurrently per job.
+            client_factory: Creates the logged-in client of an account. Defaults to
+                `login` with `response_cache`.
+            poll_interval_seconds: Wait between two claims when no job is ready.
+            response_cache: Cache of the Garmin Connect responses, shared by the jobs.
+            conversion_cache: Cache of the workout conversions, shared by the jobs.
+        """
+        self.queue = queue
+        self.accounts: Dict[str, RosterAccount] = {a.name: a for a in accounts}
+        self.max_workers = max_workers
+        self.response_cache = response_cache
+        self.conversion_cache = conversion_cache
+        self.client_factory = client_factory or self._login
+        self.poll_interval_seconds = poll_interval_seconds
+
+    def run(self, stop_when_idle: bool = True) -> int:
+        """
+        Run jobs until the queue has no unfinished job (or forever if not
+        `stop_when_idle`), and return the number of jobs run.
+        """
+        count = 0
+        while True:
+            if self.run_once():
+                count += 1
+            elif stop_when_idle and not self.queue.unfinished():
+                return count
+            else:
+                time.sleep(self.poll_interval_seconds)
+
+    def run_once(self) -> bool:
+        """Claim and run one job. Return False if no job was ready."""
+        job = self.queue.claim()
+        if job is None:
+            return False
+
+        with self._keep_lease(job):
+            try:
+                self._sync(job)
+            except Exception as e:
+                self.queue.fail(job, e)
+                print(f"Job {job.id} ({job.account}) failed: {e}")
+                return True
+        self.queue.complete(job)
+        return True
+
+    def _sync(self, job: Job) -> None:
+        account = self.accounts.get(job.account)
+        if account is None:
+            raise RosterError(f"Account {job.account} is not in the roster")
+
+        sync_service = GarminToMyWhooshWorkoutSyncService(
+            self.client_factory(account),
+            max_workers=self.max_workers,
+            conversion_cache=self.conversion_cache,
+        )
+        sync_service.sync_and_download_workouts(
+            sport=account.sport,
+            from_date=datetime.combine(job.from_date, datetime.min.time()),
+            to_date=datetime.combine(job.to_date, datetime.min.time()),
+            output_dir=str(account.output_dir),
+            config_file=account.config_file,
+        )
+
+    def _login(self, account: RosterAccount) -> GarminClient:
+        return login(account, self.response_cache)
+
+    @contextmanager
+    def _keep_lease(self, job: Job) -> Iterator[None]:
+        """Renew the lease of a job in the background while it runs."""
+        stopped = threading.Event()
+
+        def renew():
+            while not stopped.wait(self.queue.lease_seconds / 3):
+                if not self.queue.heartbeat(job):
+                    return
+
+        thread = threading.Thread(target=renew, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            thread.join()
+
+
+def _worker_process(
+    queue_path: str,
+    roster_path: str,
+    lease_seconds: float,
+    max_workers: int,
+    client_factory: Optional[ClientFactory],
+    use_cache: bool,
+    refresh: bool,
+) -> None:
+    queue = JobQueue(queue_path, lease_seconds=lease_seconds)
+    worker = JobWorker(
+        queue,
+        load_roster(roster_path),
+        max_workers,
+        client_factory=client_factory,
+        response_cache=ResponseCache(refresh=refresh) if use_cache else None,
+        conversion_cache=ConversionCache() if use_cache else None,
+    )
+    worker.run()
+
+
+def run_worker_processes(
+    queue_path: str | Path,
+    roster_path: str | Path,
+    processes: int = os.cpu_count() or 1,
+    lease_seconds: float = JobQueue.DEFAULT_LEASE_SECONDS,
+    max_workers: int = 1,
+    client_factory: Optional[ClientFactory] = None,
+    use_cache: bool = False,
+    refresh: bool = False,
+) -> None:
+    """
+    Run the jobs of a queue in a pool of worker processes, until none is unfinished.
+
+    Args:
+        client_factory: Creates the logged-in client of an account. Must be picklable.
+        use_cache: Cache the Garmin Connect responses and the workout conversions in
+            their default directories, shared by the processes.
+        refresh: Ignore the cached Garmin Connect responses, but still store the fresh
+            ones.
+    """
+    if processes < 1:
+        raise ValueError("processes must be at least 1")
+
+    # Spawn rather than fork, so that no lock or connection is inherited mid-use
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(
+            target=_worker_process,
+            args=(
+                str(queue_path),
+                str(roster_path),
+                lease_seconds,
+                max_workers,
+                client_factory,
+                use_cache,
+                refresh,
+            ),
+        )
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
@@ -0,0 +1,69 @@
+"""
+Stages of streaming pipelines, connected by bounded queues.
+"""
+
+import queue
+import threading
+from typing import Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+def run_in_thread(items: Iterable[T], maxsize: int = 4) -> Iterator[T]:
+    """
+    Iterate `items` in a background thread, handing them over through a bounded queue.
+
+    The background thread runs at most `maxsize` items ahead of the consumer, so that
+    the stages of a pipeline overlap while memory stays bounded. An exception raised
+    while iterating `items` is raised again to the consumer, and closing the returned
+    iterator stops the background thread.
+    """
+    if maxsize < 1:
+        raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+
+    handoff = queue.Queue(maxsize)
+    stopped = threading.Event()
+
+    def put(item: object, error: Optional[Exception] = None) -> bool:
+        # Wait for room in the queue, unless the consumer is gone
+        while not stopped.is_set():
+            try:
+                handoff.put((item, error), timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce() -> None:
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if not put(item):
+                    return
+        except Exception as error:
+            put(_DONE, error)
+            return
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+        put(_DONE)
+
+    def consume() -> Iterator[T]:
+        thread = threading.Thread(target=produce, daemon=True)
+        thread.start()
+        try:
+            while True:
+                item, error = handoff.get()
+                if error is not None:
+                    raise error
+                if item is _DONE:
+                    return
+                yield item
+        finally:
+            stopped.set()
+            thread.join()
+
+    return consume()
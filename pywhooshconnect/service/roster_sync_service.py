@@ -0,0 +1,263 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import yaml
+
+from pywhooshconnect.garmin.client.GarminClient import GarminClient
+from pywhooshconnect.garmin.client.response_cache import ResponseCache
+from pywhooshconnect.garmin.client.token_store import TokenStore
+from pywhooshconnect.garmin.model.garmin_workout_dto import GarminSport
+from pywhooshconnect.service.conversion_cache import ConversionCache
+from pywhooshconnect.service.workout_sync_service import (
+    GarminToMyWhooshWorkoutSyncService,
+)
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+
+class RosterError(Exception):
+    """Raised when a roster file is invalid."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class RosterAccount:
+    """Garmin Connect account of an athlete, and where its workouts are saved."""
+
+    name: str
+    user: str
+    output_dir: Path
+    password: Optional[str] = None
+    config_file: Optional[Path] = None
+    token_dir: Optional[Path] = None
+    sport: GarminSport = GarminSport.CYCLING
+
+
+def load_roster(roster_path: str | Path) -> List[RosterAccount]:
+    """
+    Load the accounts of a YAML roster file.
+
+    The file has a list of `accounts`, each with a unique `name`, a Garmin Connect
+    `user` and an `output_dir`. Accounts may also set a `password` (or `password_env`,
+    the environment variable holding it), a `config_file`, a `token_dir` and a `sport`.
+    Values of the optional `defaults` mapping apply to every account. The login session
+    of an account is saved in `~/.garminconnect/<name>` unless `token_dir` is set.
+    Accounts cannot share an output or token directory, since they would overwrite each
+    other's sync manifest and tokens.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        RosterError: If the roster is invalid
+    """
+    path = Path(roster_path).expanduser()
+    with open(path, "r") as file:
+        roster = yaml.load(file, Loader=SafeLoader) or {}
+    if not isinstance(roster, dict) or not isinstance(roster.get("accounts"), list):
+        raise RosterError(f"{roster_path}: 'accounts' must be a list")
+
+    defaults = roster.get("defaults") or {}
+    accounts = [_account({**defaults, **entry}) for entry in roster["accounts"]]
+    names = [account.name for account in accounts]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise RosterError(f"Duplicate account names: {', '.join(duplicates)}")
+    _check_distinct_directories(accounts, "output_dir")
+    _check_distinct_directories(accounts, "token_dir")
+    return accounts
+
+
+def _check_distinct_directories(accounts: List[RosterAccount], attribute: str) -> None:
+    owners: dict[Path, str] = {}
+    for account in accounts:
+        directory = getattr(account, attribute).resolve()
+        if directory in owners:
+            raise RosterError(
+                f"Accounts {owners[directory]} and {account.name} have the same "
+                f"{attribute}: {directory}"
+            )
+        owners[directory] = account.name
+
+
+def _account(entry: dict) -> RosterAccount:
+    missing = [key for key in ("name", "user", "output_dir") if not entry.get(key)]
+    if missing:
+        raise RosterError(f"Account {entry} is missing {', '.join(missing)}")
+
+    name = str(entry["name"])
+    password = entry.get("password")
+    if password is None and entry.get("password_env"):
+        password = os.getenv(entry["password_env"])
+
+    try:
+        sport = GarminSport[str(entry.get("sport", "cycling")).upper()]
+    except KeyError:
+        raise RosterError(f"Account {name}: unknown sport {entry['sport']}") from None
+
+    return RosterAccount(
+        name=name,
+        user=str(entry["user"]),
+        output_dir=Path(entry["output_dir"]).expanduser(),
+        password=password,
+        config_file=(
+            Path(entry["config_file"]).expanduser()
+            if entry.get("config_file")
+            else None
+        ),
+        token_dir=Path(
+            entry.get("token_dir") or Path(TokenStore.DEFAULT_DIRECTORY) / name
+        ).expanduser(),
+        sport=sport,
+    )
+
+
+@dataclass
+class AccountSyncResult:
+    """Outcome of the sync of one account."""
+
+    name: str
+    elapsed_seconds: float
+    error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+# Creates the logged-in client of an account
+ClientFactory = Callable[[RosterAccount], GarminClient]
+
+
+def login(
+    account: RosterAccount, response_cache: Optional[ResponseCache] = None
+) -> GarminClient:
+    """Log in to the Garmin Connect account, resuming its saved session if possible."""
+    client = GarminClient(
+        account.user,
+        account.password,
+        response_cache=response_cache,
+        token_store=TokenStore(account.token_dir),
+    )
+    client.login()
+    return client
+
+
+class RosterSyncService:
+    """
+    Synchronize the workouts of many Garmin Connect accounts concurrently.
+
+    Each account has its own client, rate limiter, sync service and output directory, and
+    a failing account does not stop the others. The caches of immutable data are shared:
+    Garmin Connect responses (namespaced by user), workout conversions (keyed by
+    content) and the power zone configurations (see `load_settings`).
+    """
+
+    DEFAULT_MAX_CONCURRENT_ACCOUNTS = 4
+
+    def __init__(
+        self,
+        accounts: List[RosterAccount],
+        max_concurrent_accounts: int = DEFAULT_MAX_CONCURRENT_ACCOUNTS,
+        max_workers: int = 1,
+        response_cache: Optional[ResponseCache] = None,
+        conversion_cache: Optional[ConversionCache] = None,
+        client_factory: Optional[ClientFactory] = None,
+    ):
+        """
+        Args:
+            accounts: Accounts to synchronize.
+            max_concurrent_accounts: Maximum number of accounts synchronized at once.
+            max_workers: Maximum number of workouts fetched concurrently per account.
+            response_cache: Cache of the Garmin Connect responses, shared by the accounts.
+            conversion_cache: Cache of the workout conversions, shared by the accounts.
+            client_factory: Creates the logged-in client of an account. Defaults to a
+                `GarminClient` logging in with the account credentials and token store.
+        """
+        if max_concurrent_accounts < 1:
+            raise ValueError("max_concurrent_accounts must be at least 1")
+        self.accounts = accounts
+        self.max_concurrent_accounts = max_concurrent_accounts
+        self.max_workers = max_workers
+        self.response_cache = response_cache
+        self.conversion_cache = conversion_cache
+        self.client_factory = client_factory or self._login
+
+    def sync_and_download_workouts(
+        self,
+        from_date: datetime = datetime.today(),
+        to_date: Optional[datetime] = None,
+        full_sync: bool = False,
+    ) -> List[AccountSyncResult]:
+        """
+        Synchronize every account (see
+        `GarminToMyWhooshWorkoutSyncService.sync_and_download_workouts`), and return the
+        result of each, in roster order.
+        """
+        to_date = to_date if to_date is not None else (from_date + timedelta(days=7))
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_accounts) as executor:
+            return list(
+                executor.map(
+                    lambda account: self._sync_account(
+                        account, from_date, to_date, full_sync
+                    ),
+                    self.accounts,
+                )
+            )
+
+    def _sync_account(
+        self,
+        account: RosterAccount,
+        from_date: datetime,
+        to_date: datetime,
+        full_sync: bool,
+    ) -> AccountSyncResult:
+        start = time.perf_counter()
+        try:
+            sync_service = GarminToMyWhooshWorkoutSyncService(
+                self.client_factory(account),
+                max_workers=self.max_workers,
+                conversion_cache=self.conversion_cache,
+            )
+            sync_service.sync_and_download_workouts(
+                sport=account.sport,
+                from_date=from_date,
+                to_date=to_date,
+                output_dir=str(account.output_dir),
+                config_file=account.config_file,
+                full_sync=full_sync,
+            )
+        except Exception as e:
+            return AccountSyncResult(
+                account.name, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+            )
+        return AccountSyncResult(account.name, time.perf_counter() - start)
+
+    def _login(self, account: RosterAccount) -> GarminClient:
+        return login(account, self.response_cache)
+
+
+def format_report(results: List[AccountSyncResult]) -> str:
+    """Summary table of a roster sync: the status and duration of each account."""
+    width = max([len("Account"), *(len(result.name) for result in results)])
+    lines = [f"{'Account':<{width}}  {'Status':<6}  {'Time':>8}"]
+    for result in results:
+        status = "ok" if result.succeeded else "failed"
+        line = f"{result.name:<{width}}  {status:<6}  {result.elapsed_seconds:>7.2f}s"
+        if not result.succeeded:
+            line += f"  {result.error}"
+        lines.append(line)
+
+    failed = sum(not result.succeeded for result in results)
+    lines.append(
+        f"{len(results) - failed} accounts synchronized, {failed} failed, "
+        f"{sum(result.elapsed_seconds for result in results):.2f}s in total"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Optional
+
+from pywhooshconnect import __version__
+from pywhooshconnect.common.model.power_zones import PowerZones
+from pywhooshconnect.mywhoosh.mapper.power_zones_config import PowerZoneSettings
+
+
+def fingerprint(value: Any) -> str:
+    """Stable hash of a JSON-serializable value (dataclasses are converted to dicts)."""
+    if hasattr(value, "__dataclass_fields__"):
+        value = asdict(value)
+    data = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def generic_settings_fingerprint(settings: PowerZoneSettings) -> str:
+    """
+    Fingerprint of the settings used to map Garmin workouts to generic workouts.
+
+    Generic workouts mapped with the same settings can be rendered again with other
+    power zones or zone weights (see `rerender_workouts`).
+    """
+    return fingerprint({"lap_button_duration": settings.lap_button_duration})
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 of a file content."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(path: Path) -> Optional[str]:
+    """SHA-256 of a file's content, or None if it does not exist."""
+    try:
+        return content_hash(path.read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+def write_atomically(path: Path, data: bytes) -> None:
+    """
+    Write a file through a temporary file renamed over it, so that concurrent readers
+    see either the previous content or the new one, never a partial file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Write a file atomically unless it already has this content. Return True if written."""
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    write_atomically(path, data)
+    return True
+
+
+@dataclass
+class SyncStateEntry:
+    """What a scheduled workout was synchronized from, and the file it was written to."""
+
+    calendar_date: date
+    workout_updated_date: Optional[str]
+    power_zones_fingerprint: str
+    config_fingerprint: str
+    filename: str
+    file_hash: str
+    # Key of the conversion in the `ConversionCache`, if one was used
+    conversion_key: Optional[str] = None
+    generic_settings_fingerprint: Optional[str] = None
+    # Sport and Garmin Connect user of the sync, which only removes its own files from
+    # an output directory shared with other sports or accounts
+    sport: Optional[str] = None
+    user: Optional[str] = None
+
+
+class SyncState:
+    """
+    Manifest of the workouts written to an output directory, keyed by `workoutScheduleId`.
+
+    It is stored next to the workout files, and lets a sync skip the scheduled workouts
+    whose workout definition, power zones, configuration and output file are unchanged
+    since the previous run. Manifests written by another version of PyWhooshConnect are
+    ignored, since the conversion itself may have changed.
+
+    It also records the power zones of the last sync, so that the workouts can be
+    rendered again with another FTP without Garmin Connect.
+    """
+
+    FILENAME = ".pywhooshconnect-state.json"
+
+    def __init__(
+        self,
+        output_dir: Path,
+        entries: Optional[dict[int, SyncStateEntry]] = None,
+        power_zones: Optional[PowerZones] = None,
+    ):
+        self.output_dir = output_dir
+        self.entries = entries or {}
+        self.power_zones = power_zones
+
+    @property
+    def path(self) -> Path:
+        return self.output_dir / self.FILENAME
+
+    @classmethod
+    def load(cls, output_dir: str | Path) -> "SyncState":
+        """Load the manifest of an output directory, or an empty one if missing or invalid."""
+        output_dir = Path(output_dir).expanduser()
+        try:
+            with open(output_dir / cls.FILENAME, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            if data.get("version") != __version__:
+                return cls(output_dir)
+            entries = {
+                int(schedule_id): SyncStateEntry(
+                    **{
+                        **entry,
+                        "calendar_date": date.fromisoformat(entry["calendar_date"]),
+                    }
+                )
+                for schedule_id, entry in data["entries"].items()
+            }
+            power_zones = data.get("power_zones")
+            if power_zones is not None:
+                power_zones = PowerZones(**power_zones)
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            return cls(output_dir)
+        return cls(output_dir, entries, power_zones)
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        data = {
+            "version": __version__,
+            "entries": {
+                str(schedule_id): {
+                    **asdict(entry),
+                    "calendar_date": entry.calendar_date.isoformat(),
+                }
+                for schedule_id, entry in sorted(self.entries.items())
+            },
+            "power_zones": asdict(self.power_zones) if self.power_zones else None,
+        }
+        write_atomically(self.path, json.dumps(data, indent=4).encode("utf-8"))
+
+    def is_up_to_date(
+        self,
+        workout_schedule_id: int,
+        calendar_date: date,
+        workout_updated_date: Optional[str],
+        power_zones_fingerprint: str,
+        config_fingerprint: str,
+    ) -> bool:
+        """
+        Return True if the scheduled workout was already written for the same date, from
+        the same workout definition, power zones and configuration, and its file was not
+        modified since. A rescheduled workout keeps its id and definition, but its file is
+        named after its date.
+
+        Workouts without a known update date are never considered up to date.
+        """
+        entry = self.entries.get(workout_schedule_id)
+        return (
+            entry is not None
+            and workout_updated_date is not None
+            and entry.calendar_date == calendar_date
+            and entry.workout_updated_date == workout_updated_date
+            and entry.power_zones_fingerprint == power_zones_fingerprint
+            and entry.config_fingerprint == config_fingerprint
+            and file_hash(self.output_dir / entry.filename) == entry.file_hash
+        )
@@ -1,18 +1,31 @@
-import json
-from datetime import datetime, timedelta
+import asyncio
+from dataclasses import replace
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Optional, List
+from typing import Iterable, Iterator, List, NamedTuple, Optional
 
 from pywhooshconnect.common.mapper.base import PowerZonesOptions
+from pywhooshconnect.common.model.generic_workout import GenericWorkout
+from pywhooshconnect.common.model.power_zones import PowerZones
+from pywhooshconnect.garmin.client.AsyncGarminClient import AsyncGarminClient
 from pywhooshconnect.garmin.client.GarminClient import GarminClient
+from pywhooshconnect.garmin.client.token_store import TokenStore
 from pywhooshconnect.garmin.mapper.garmin_to_generic_power_zones import (
     GarminToGenericPowerZonesMapper,
 )
 from pywhooshconnect.garmin.mapper.garmin_to_generic_workout import (
     GarminToGenericScheduledWorkoutMapper,
 )
+from pywhooshconnect.garmin.model.decoding import GarminValidation
+from pywhooshconnect.garmin.model.garmin_power_zones_dto import GarminPowerZones
+from pywhooshconnect.garmin.model.garmin_scheduled_workout_dto import (
+    GarminScheduledWorkout,
+)
 from pywhooshconnect.garmin.model.garmin_workout_dto import GarminSport
 from pywhooshconnect.garmin.service.garmin_training_plan_service import (
+    AsyncGarminTrainingPlanService,
+    GarminFetchStrategy,
+    GarminScheduledWorkoutRef,
     GarminTrainingPlanService,
 )
 from pywhooshconnect.mywhoosh.mapper.generic_to_mywhoosh import (
@@ -20,21 +33,307 @@ from pywhooshconnect.mywhoosh.mapper.generic_to_mywhoosh import (
 )
 from pywhooshconnect.mywhoosh.mapper.power_zones_config import PowerZoneConfig
 from pywhooshconnect.mywhoosh.model.mywhoosh_workout_dto import MyWhooshWorkout
+from pywhooshconnect.service.conversion_cache import (
+    CachedConversion,
+    ConversionCache,
+    conversion_key,
+)
+from pywhooshconnect.service.pipeline import run_in_thread
+from pywhooshconnect.service.sync_state import (
+    SyncState,
+    SyncStateEntry,
+    content_hash,
+    file_hash,
+    fingerprint,
+    generic_settings_fingerprint,
+    write_if_changed,
+)
+
+
+def _as_date(value: date | datetime) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _power_zones_options(
+    garmin_power_zones: GarminPowerZones, config_file: Optional[Path] = None
+) -> PowerZonesOptions:
+    """Build the mapping options from Garmin power zones and a configuration file."""
+    power_zones = GarminToGenericPowerZonesMapper().map(garmin_power_zones)
+    config_file_str = str(config_file) if config_file is not None else None
+    power_zones_config = PowerZoneConfig(config_path=config_file_str)
+    return PowerZonesOptions(power_zones=power_zones, config=power_zones_config)
+
+
+# Number of workouts buffered between the stages of a streaming sync
+QUEUE_SIZE = 4
+
+
+def _map_workouts(
+    garmin_workouts: List[GarminScheduledWorkout],
+    power_zones_options: PowerZonesOptions,
+    conversion_cache: Optional[ConversionCache] = None,
+) -> List[MyWhooshWorkout]:
+    """
+    Map Garmin scheduled workouts to MyWhoosh workouts using the given power zones.
+
+    Conversions found in `conversion_cache` are not mapped again, and new conversions
+    are stored in it.
+    """
+    return list(
+        _iter_map_workouts(
+            garmin_workouts, power_zones_options, conversion_cache=conversion_cache
+        )
+    )
+
+
+def _iter_map_workouts(
+    garmin_workouts: Iterable[GarminScheduledWorkout],
+    power_zones_options: PowerZonesOptions,
+    occurrences: Optional[dict[int, int]] = None,
+    conversion_cache: Optional[ConversionCache] = None,
+) -> Iterator[MyWhooshWorkout]:
+    """Streaming variant of `_map_workouts`."""
+    for conversion in _iter_conversions(
+        garmin_workouts, power_zones_options, occurrences, conversion_cache
+    ):
+        yield conversion.mywhoosh_workout
+
+
+class _Conversion(NamedTuple):
+    """A converted scheduled workout, and its key in the conversion cache if any."""
+
+    key: Optional[str]
+    mywhoosh_workout: MyWhooshWorkout
+
+
+def _iter_conversions(
+    garmin_workouts: Iterable[GarminScheduledWorkout],
+    power_zones_options: PowerZonesOptions,
+    occurrences: Optional[dict[int, int]] = None,
+    conversion_cache: Optional[ConversionCache] = None,
+) -> Iterator[_Conversion]:
+    """
+    Convert scheduled workouts, in order.
+
+    If `occurrences` gives the number of scheduled workouts of each workout id, a
+    mapped workout is forgotten after its last occurrence. With a `conversion_cache`,
+    every conversion is stored in it, so that it can be rendered again later (see
+    `rerender_workouts`).
+    """
+    # Map each Garmin workout to MyWhoosh format and yield it. A workout scheduled on
+    # several dates is mapped once, then copied to its other dates.
+    mywhoosh_mapper = GenericToMyWhooshWorkoutMapper()
+    mapped = {}
+    for garmin_workout in garmin_workouts:
+        key = None
+        if conversion_cache is not None:
+            key = conversion_key(
+                garmin_workout,
+                power_zones_options.power_zones,
+                power_zones_options.config.settings,
+            )
+
+        workout_id = garmin_workout.workout.workoutId
+        mapped_key = (workout_id, garmin_workout.workout.updatedDate)
+        if workout_id is not None and mapped_key in mapped:
+            generic_workout, mywhoosh_workout = mapped[mapped_key]
+            mywhoosh_workout = mywhoosh_mapper.reschedule(
+                mywhoosh_workout, generic_workout, garmin_workout.calendarDate
+            )
+            if key is not None and key not in conversion_cache:
+                rescheduled = replace(
+                    generic_workout, scheduled_date=garmin_workout.calendarDate
+                )
+                conversion_cache.set(
+                    key,
+                    CachedConversion(rescheduled, mywhoosh_workout.to_json_bytes()),
+                )
+        else:
+            generic_workout, mywhoosh_workout = _convert_workout(
+                garmin_workout,
+                power_zones_options,
+                mywhoosh_mapper,
+                conversion_cache,
+                key,
+            )
+            mapped[mapped_key] = (generic_workout, mywhoosh_workout)
+
+        # The same scheduled workout gets the same Id on every run
+        mywhoosh_workout.Id = mywhoosh_workout.content_id(
+            garmin_workout.workoutScheduleId
+        )
+        yield _Conversion(key, mywhoosh_workout)
+
+        if occurrences is not None and workout_id in occurrences:
+            occurrences[workout_id] -= 1
+            if not occurrences[workout_id]:
+                mapped.pop(mapped_key, None)
+
+
+def _convert_workout(
+    garmin_workout: GarminScheduledWorkout,
+    power_zones_options: PowerZonesOptions,
+    mywhoosh_mapper: GenericToMyWhooshWorkoutMapper,
+    conversion_cache: Optional[ConversionCache] = None,
+    key: Optional[str] = None,
+) -> tuple[GenericWorkout, MyWhooshWorkout]:
+    """Map a Garmin scheduled workout, or load its conversion from the cache."""
+    if conversion_cache is not None:
+        cached = conversion_cache.get(key)
+        if cached is not None:
+            mywhoosh_workout = MyWhooshWorkout.from_json(cached.mywhoosh_json)
+            return cached.generic_workout, mywhoosh_workout
+
+    generic_workout = GarminToGenericScheduledWorkoutMapper().map(
+        garmin_workout, power_zones_options
+    )
+    mywhoosh_workout = mywhoosh_mapper.map(generic_workout, power_zones_options)
+    if conversion_cache is not None:
+        conversion_cache.set(
+            key, CachedConversion(generic_workout, mywhoosh_workout.to_json_bytes())
+        )
+    return generic_workout, mywhoosh_workout
+
+
+def _save_workout(
+    output_dir: Path, mywhoosh_workout: MyWhooshWorkout
+) -> tuple[Path, bytes, bool]:
+    """
+    Save a MyWhoosh workout in `output_dir`, unless its file already has the same
+    content. Return the path, the content and whether the file was written.
+    """
+    filename = output_dir.joinpath(f"{mywhoosh_workout.Name}.json")
+    data = mywhoosh_workout.to_json_bytes(pretty=True)
+    return filename, data, write_if_changed(filename, data)
+
+
+def rerender_workouts(
+    output_dir: str | Path,
+    conversion_cache: ConversionCache,
+    power_zones: Optional[PowerZones] = None,
+    config_file: Optional[Path] = None,
+) -> List[Path]:
+    """
+    Render the MyWhoosh workouts of `output_dir` again with new power zones or a new
+    power zone configuration, e.g. after the athlete's zones were updated.
+
+    Only the power stage runs again: the generic workouts are loaded from the
+    conversions in `conversion_cache` recorded by the last sync, so there are no
+    Garmin Connect requests and no Garmin workouts to parse. Files already rendered
+    with the same power zones and configuration, or whose content does not change, are
+    left untouched. Workouts whose
+    conversion is no longer cached, or whose lap button duration changed, are skipped
+    and updated by the next sync.
+
+    Args:
+        output_dir: Directory synchronized by `sync_and_download_workouts`.
+        conversion_cache: Cache used by the sync that wrote `output_dir`.
+        power_zones: New power zones. Defaults to the power zones of the last sync.
+        config_file: Power zone configuration file. Defaults to the bundled one.
+
+    Returns:
+        The paths of the files written.
+    """
+    output_dir = Path(output_dir).expanduser()
+    state = SyncState.load(output_dir)
+    power_zones = power_zones if power_zones is not None else state.power_zones
+    if power_zones is None:
+        raise ValueError("No power zones given, and none recorded by a previous sync")
+
+    config_file_str = str(config_file) if config_file is not None else None
+    power_zones_options = PowerZonesOptions(
+        power_zones=power_zones, config=PowerZoneConfig(config_path=config_file_str)
+    )
+    settings = power_zones_options.config.settings
+    power_zones_fingerprint = fingerprint(power_zones)
+    config_fingerprint = fingerprint(settings)
+    generic_fingerprint = generic_settings_fingerprint(settings)
+
+    mywhoosh_mapper = GenericToMyWhooshWorkoutMapper()
+    written = []
+    for schedule_id, entry in sorted(state.entries.items()):
+        previous_filename = output_dir.joinpath(entry.filename)
+        if (
+            entry.power_zones_fingerprint == power_zones_fingerprint
+            and entry.config_fingerprint == config_fingerprint
+            and file_hash(previous_filename) == entry.file_hash
+        ):
+            continue
+
+        cached = None
+        if (
+            entry.conversion_key is not None
+            and entry.generic_settings_fingerprint == generic_fingerprint
+        ):
+            cached = conversion_cache.get(entry.conversion_key)
+        if cached is None:
+            print(f"Skipped {previous_filename}: no cached workout, sync it again")
+            continue
+
+        mywhoosh_workout = mywhoosh_mapper.map(
+            cached.generic_workout, power_zones_options
+        )
+        mywhoosh_workout.Id = mywhoosh_workout.content_id(schedule_id)
+        filename, data, changed = _save_workout(output_dir, mywhoosh_workout)
+        if filename != previous_filename:
+            previous_filename.unlink(missing_ok=True)
+
+        state.entries[schedule_id] = replace(
+            entry,
+            power_zones_fingerprint=power_zones_fingerprint,
+            config_fingerprint=config_fingerprint,
+            filename=filename.name,
+            file_hash=content_hash(data),
+        )
+        if changed:
+            written.append(filename)
+            print(f"Saved {filename}")
+
+    state.power_zones = power_zones
+    state.save()
+    return written
 
 
 class GarminToMyWhooshWorkoutSyncService:
     garminClient: GarminClient
     garmin_training_plan_service: GarminTrainingPlanService
 
-    def __init__(self, garmin_client: GarminClient):
+    def __init__(
+        self,
+        garmin_client: GarminClient,
+        max_workers: int = 1,
+        fetch_strategy: GarminFetchStrategy = GarminFetchStrategy.TRAINING_PLAN,
+        decode_raw: bool = False,
+        validation: GarminValidation = GarminValidation.FULL,
+        conversion_cache: Optional[ConversionCache] = None,
+    ):
+        """
+        Args:
+            conversion_cache: Cache of the workout conversions, so that workouts
+                converted by a previous run with the same power zones and configuration
+                are not mapped again. Disabled if None.
+        """
         self.garminClient = garmin_client
-        self.garmin_training_plan_service = GarminTrainingPlanService(self.garminClient)
+        self.conversion_cache = conversion_cache
+        self.garmin_training_plan_service = GarminTrainingPlanService(
+            self.garminClient,
+            max_workers=max_workers,
+            fetch_strategy=fetch_strategy,
+            decode_raw=decode_raw,
+            validation=validation,
+        )
 
     @classmethod
-    def from_credentials(cls, email: str, password: str):
-        client = GarminClient(email, password)
+    def from_credentials(
+        cls,
+        email: str,
+        password: str,
+        max_workers: int = 1,
+        token_store: Optional[TokenStore] = None,
+    ):
+        client = GarminClient(email, password, token_store=token_store)
         client.login()
-        return cls(client)
+        return cls(client, max_workers=max_workers)
 
     def sync_workouts(
         self,
@@ -49,29 +348,104 @@ class GarminToMyWhooshWorkoutSyncService:
             sport=sport, from_date=from_date, to_date=to_date
         )
 
-        # Retrieve Garmin power zones and create PowerZonesOptions
+        # Retrieve Garmin power zones
         garmin_power_zones = self.garmin_training_plan_service.get_power_zones_by_sport(
             sport=sport
         )
-        power_zones = GarminToGenericPowerZonesMapper().map(garmin_power_zones)
-        config_file_str = str(config_file) if config_file is not None else None
-        power_zones_config = PowerZoneConfig(config_path=config_file_str)
-        power_zones_options = PowerZonesOptions(
-            power_zones=power_zones, config=power_zones_config
+
+        return _map_workouts(
+            garmin_workouts,
+            _power_zones_options(garmin_power_zones, config_file),
+            self.conversion_cache,
         )
 
-        # Map each Garmin workout to MyWhoosh format and return it
-        mywhoosh_workouts = []
-        for garmin_workout in garmin_workouts:
-            generic_workout = GarminToGenericScheduledWorkoutMapper().map(
-                garmin_workout, power_zones_options
-            )
-            mywhoosh_workout = GenericToMyWhooshWorkoutMapper().map(
-                generic_workout, power_zones_options
-            )
-            mywhoosh_workouts.append(mywhoosh_workout)
+    def iter_sync_workouts(
+        self,
+        sport: GarminSport,
+        from_date: datetime = datetime.today(),
+        to_date: Optional[datetime] = None,
+        config_file: Optional[Path] = None,
+        queue_size: int = QUEUE_SIZE,
+    ) -> Iterator[MyWhooshWorkout]:
+        """
+        Streaming variant of `sync_workouts`: yield each MyWhoosh workout as soon as it
+        is fetched and converted, in date order.
+
+        Fetching and mapping run in background threads, connected by queues of at most
+        `queue_size` workouts, so that memory does not grow with the date range.
+        """
+        to_date = to_date if to_date is not None else (from_date + timedelta(days=7))
+        refs = self.garmin_training_plan_service.get_scheduled_workout_refs(
+            sport=sport, from_date=from_date, to_date=to_date
+        )
+        power_zones_options = _power_zones_options(
+            self.garmin_training_plan_service.get_power_zones_by_sport(sport=sport),
+            config_file,
+        )
+        for conversion in self._iter_conversions(refs, power_zones_options, queue_size):
+            yield conversion.mywhoosh_workout
+
+    def _iter_conversions(
+        self,
+        refs: List[GarminScheduledWorkoutRef],
+        power_zones_options: PowerZonesOptions,
+        queue_size: int = QUEUE_SIZE,
+    ) -> Iterator[_Conversion]:
+        """Fetch and map scheduled workouts as a pipeline, in the same order as `refs`."""
+        occurrences = {}
+        for ref in refs:
+            if ref.workout_id is not None:
+                occurrences[ref.workout_id] = occurrences.get(ref.workout_id, 0) + 1
+
+        garmin_workouts = run_in_thread(
+            self.garmin_training_plan_service.iter_scheduled_workouts(refs), queue_size
+        )
+        return run_in_thread(
+            _iter_conversions(
+                garmin_workouts,
+                power_zones_options,
+                occurrences,
+                self.conversion_cache,
+            ),
+            queue_size,
+        )
+
+    async def sync_workouts_async(
+        self,
+        sport: GarminSport,
+        from_date: datetime = datetime.today(),
+        to_date: Optional[datetime] = None,
+        config_file: Optional[Path] = None,
+        async_client: Optional[AsyncGarminClient] = None,
+    ) -> List[MyWhooshWorkout]:
+        """
+        Asyncio variant of `sync_workouts`.
 
-        return mywhoosh_workouts
+        Garmin Connect requests run concurrently on the event loop through an
+        `AsyncGarminClient`. If `async_client` is not provided, one is created from the
+        logged-in `GarminClient` of this service and closed before returning.
+        """
+        if async_client is None:
+            async with AsyncGarminClient(self.garminClient) as client:
+                return await self.sync_workouts_async(
+                    sport, from_date, to_date, config_file, async_client=client
+                )
+
+        # Retrieve Garmin workouts and power zones concurrently
+        to_date = to_date if to_date is not None else (from_date + timedelta(days=7))
+        training_plan_service = AsyncGarminTrainingPlanService(async_client)
+        garmin_workouts, garmin_power_zones = await asyncio.gather(
+            training_plan_service.get_scheduled_workouts(
+                sport=sport, from_date=from_date, to_date=to_date
+            ),
+            training_plan_service.get_power_zones_by_sport(sport=sport),
+        )
+
+        return _map_workouts(
+            garmin_workouts,
+            _power_zones_options(garmin_power_zones, config_file),
+            self.conversion_cache,
+        )
 
     def sync_and_download_workouts(
         self,
@@ -80,16 +454,94 @@ class GarminToMyWhooshWorkoutSyncService:
         to_date: Optional[datetime] = None,
         output_dir: str = "~/downloads/",
         config_file: Optional[Path] = None,
+        full_sync: bool = False,
     ):
-        mywhoosh_workouts = self.sync_workouts(sport, from_date, to_date, config_file)
+        """
+        Synchronize workouts and save them as MyWhoosh JSON files in `output_dir`.
 
-        # Map each Garmin workout to MyWhoosh format and save it
-        for mywhoosh_workout in mywhoosh_workouts:
-            data = json.loads(mywhoosh_workout.to_json())
+        The sync is incremental: a manifest in `output_dir` (see `SyncState`) records what
+        each file was written from, so only new or changed scheduled workouts are fetched,
+        converted and written. Files of scheduled workouts that disappeared from the date
+        range are removed, if they were written for the same sport and user: other syncs
+        can share `output_dir`. Set `full_sync` to rewrite all the files of the date
+        range.
 
-            output_dir = Path(output_dir).expanduser()
-            filename = output_dir.joinpath(f"{mywhoosh_workout.Name}.json")
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
+        Workouts are fetched, converted and written as a pipeline (see
+        `iter_sync_workouts`), so each file is saved as soon as its workout arrives.
+        """
+        output_dir = Path(output_dir).expanduser()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        user = self.garminClient.username
 
-            print(f"Saved {filename}")
+        # List the scheduled workouts and retrieve the power zones
+        to_date = to_date if to_date is not None else (from_date + timedelta(days=7))
+        refs = self.garmin_training_plan_service.get_scheduled_workout_refs(
+            sport=sport, from_date=from_date, to_date=to_date
+        )
+        power_zones_options = _power_zones_options(
+            self.garmin_training_plan_service.get_power_zones_by_sport(sport=sport),
+            config_file,
+        )
+        power_zones_fingerprint = fingerprint(power_zones_options.power_zones)
+        config_fingerprint = fingerprint(power_zones_options.config.settings)
+
+        # Only fetch and convert the scheduled workouts changed since the last sync
+        state = SyncState.load(output_dir)
+        changed_refs = [
+            ref
+            for ref in refs
+            if full_sync
+            or not state.is_up_to_date(
+                ref.workout_schedule_id,
+                ref.calendar_date,
+                ref.workout_updated_date,
+                power_zones_fingerprint,
+                config_fingerprint,
+            )
+        ]
+        conversions = self._iter_conversions(changed_refs, power_zones_options)
+
+        # Save each MyWhoosh workout as soon as it is converted
+        for ref, (key, mywhoosh_workout) in zip(changed_refs, conversions):
+            filename, data, changed = _save_workout(output_dir, mywhoosh_workout)
+
+            # Remove the previous file if the workout was renamed
+            previous = state.entries.get(ref.workout_schedule_id)
+            if previous is not None and previous.filename != filename.name:
+                output_dir.joinpath(previous.filename).unlink(missing_ok=True)
+
+            state.entries[ref.workout_schedule_id] = SyncStateEntry(
+                calendar_date=ref.calendar_date,
+                workout_updated_date=ref.workout_updated_date,
+                power_zones_fingerprint=power_zones_fingerprint,
+                config_fingerprint=config_fingerprint,
+                filename=filename.name,
+                file_hash=content_hash(data),
+                conversion_key=key,
+                generic_settings_fingerprint=generic_settings_fingerprint(
+                    power_zones_options.config.settings
+                ),
+                sport=sport.value,
+                user=user,
+            )
+            print(f"Saved {filename}" if changed else f"Unchanged {filename}")
+
+        # Remove the files of this sport and user's scheduled workouts no longer in the
+        # date range
+        scheduled_ids = {ref.workout_schedule_id for ref in refs}
+        first_date, last_date = _as_date(from_date), _as_date(to_date)
+        for schedule_id, entry in list(state.entries.items()):
+            if (
+                schedule_id not in scheduled_ids
+                and entry.sport == sport.value
+                and entry.user == user
+                and first_date <= entry.calendar_date <= last_date
+            ):
+                filename = output_dir.joinpath(entry.filename)
+                filename.unlink(missing_ok=True)
+                del state.entries[schedule_id]
+                print(f"Removed {filename}")
+
+        state.power_zones = power_zones_options.power_zones
+        state.save()
+        print(f"{len(refs) - len(changed_refs)} workouts already up to date")
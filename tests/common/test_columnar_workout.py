@@ -0,0 +1,139 @@
+import copy
+import subprocess
+import sys
+from datetime import datetime
+
+import pytest
+
+from pywhooshconnect.common.mapper.base import PowerZonesOptions
+from pywhooshconnect.common.model.columnar_workout import ColumnarWorkout
+from pywhooshconnect.common.model.generic_workout import (
+    GenericAtomicStep,
+    GenericIntervalStep,
+    GenericStepWithIntervals,
+    GenericWorkout,
+)
+from pywhooshconnect.common.model.generic_workout_step import StepType
+from pywhooshconnect.common.model.power_zones import PowerZones
+from pywhooshconnect.mywhoosh.mapper.generic_to_mywhoosh import (
+    GenericToMyWhooshPowerMapper,
+)
+from pywhooshconnect.mywhoosh.mapper.power_targets import power_targets
+
+np = pytest.importorskip("numpy")
+
+
+def interval(step_id: int, duration: int, zone: int) -> GenericIntervalStep:
+    return GenericIntervalStep(
+        step_id=step_id,
+        duration_in_seconds=duration,
+        power_zone=zone,
+        type=StepType.INTERVAL,
+        rpm=100,
+    )
+
+
+@pytest.fixture
+def workout():
+    """Workout mixing atomic steps, repeat groups, free rides and missing values."""
+    return GenericWorkout(
+        name="Columnar Workout",
+        description="A columnar test workout",
+        scheduled_date=datetime(2025, 1, 1),
+        steps=[
+            GenericAtomicStep(
+                step_id=1,
+                duration_in_seconds=600,
+                power_zone=2,
+                type=StepType.WARM_UP,
+                description="Warm up",
+            ),
+            GenericStepWithIntervals(
+                step_id=2,
+                steps=[interval(3, 120, 5), interval(4, 60, 1)],
+                iterations=4,
+                type=StepType.INTERVAL,
+                description="Main set",
+            ),
+            GenericStepWithIntervals(
+                step_id=5, steps=[], iterations=2, type=StepType.INTERVAL
+            ),
+            GenericAtomicStep(
+                step_id=6,
+                duration_in_seconds=300,
+                type=StepType.FREE_RIDE,
+                rpm=0,
+            ),
+            GenericStepWithIntervals(
+                step_id=7,
+                steps=[interval(8, 30, 7)],
+                iterations=0,
+                type=StepType.INTERVAL,
+            ),
+        ],
+    )
+
+
+class TestColumnarWorkout:
+
+    def test_round_trip_is_lossless(self, workout):
+        columnar = ColumnarWorkout.from_workout(workout)
+
+        assert columnar.to_workout() == workout
+
+    def test_columns(self, workout):
+        columnar = ColumnarWorkout.from_workout(workout)
+
+        assert columnar.durations.tolist() == [600, 120, 60, 300, 30]
+        assert columnar.zones.tolist() == [2, 5, 1, 0, 7]
+        assert columnar.group_ids.tolist() == [-1, 0, 0, -1, 2]
+        assert columnar.group_iterations.tolist() == [4, 2, 0]
+
+    def test_aggregates_match_object_model(self, workout):
+        columnar = ColumnarWorkout.from_workout(workout)
+
+        assert columnar.duration() == workout.duration()
+        assert columnar.number_of_intervals() == workout.number_of_intervals()
+
+    def test_flatten_order_matches_flatten_steps(self, workout):
+        columnar = ColumnarWorkout.from_workout(copy.deepcopy(workout))
+
+        flat_steps = workout.flatten_steps()
+
+        order = columnar.flatten_order()
+        assert columnar.durations[order].tolist() == [
+            s.duration_in_seconds for s in flat_steps
+        ]
+        assert columnar.zones[order].tolist() == [s.power_zone or 0 for s in flat_steps]
+
+    def test_power_targets_match_power_mapper(self, workout):
+        options = PowerZonesOptions(power_zones=PowerZones(ftp=250))
+        columnar = ColumnarWorkout.from_workout(workout)
+        power_mapper = GenericToMyWhooshPowerMapper()
+
+        result = columnar.power_targets(power_targets(options))
+
+        assert result.tolist() == [
+            power_mapper.map(None if zone == 0 else int(zone), options)
+            for zone in columnar.zones
+        ]
+
+    def test_does_not_depend_on_target_formats(self):
+        """Test that the generic model does not import the MyWhoosh or Garmin code."""
+        code = (
+            "import sys, pywhooshconnect.common.model.columnar_workout\n"
+            "print(sorted(m for m in sys.modules if m.startswith("
+            "('pywhooshconnect.mywhoosh', 'pywhooshconnect.garmin'))))"
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == "[]"
+
+    def test_unsupported_step_raises_error(self, workout):
+        workout.steps.append(interval(9, 60, 3))
+
+        with pytest.raises(TypeError, match="not supported"):
+            ColumnarWorkout.from_workout(workout)
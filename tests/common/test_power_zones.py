@@ -56,3 +56,49 @@ class TestPowerZones:
         assert len(floors) == 7
         assert floors[1] == 0
         assert floors[7] == 1.50
+
+
+class TestPowerZonesClassification:
+
+    @pytest.fixture(autouse=True)
+    def np(self):
+        """Skip the batch classification tests if numpy is not installed."""
+        return pytest.importorskip("numpy")
+
+    def test_classify_power_matches_scalar_classification(self, zones, np):
+        """Test that batch classification agrees with get_zone_by_power."""
+        power = np.arange(-10, 400, 0.5)
+
+        result = zones.classify_power(power)
+
+        assert result.shape == power.shape
+        assert result.tolist() == [zones.get_zone_by_power(p) for p in power]
+
+    def test_classify_power_nan_samples_are_below_z1(self, zones, np):
+        """Test that missing (NaN) samples are classified as get_zone_by_power does."""
+        power = np.array([100, np.nan, 300, np.nan])
+
+        result = zones.classify_power(power)
+
+        assert result.tolist() == [zones.get_zone_by_power(p) for p in power]
+        assert result.tolist() == [1, 0, 7, 0]
+        assert zones.classify_ftp_ratios(np.nan).tolist() == 0
+
+    def test_classify_power_on_zone_floors(self, zones):
+        """Test that a power equal to a zone floor belongs to that zone."""
+        power = [floor * zones.ftp for floor in zones.zone_floors().values()]
+
+        assert zones.classify_power(power).tolist() == [1, 2, 3, 4, 5, 6, 7]
+
+    def test_classify_ftp_ratios(self, zones):
+        """Test classification of FTP ratios from any sequence."""
+        assert zones.classify_ftp_ratios([0.80, 1.00, -0.1]).tolist() == [3, 4, 0]
+
+    def test_time_in_zones(self, zones):
+        """Test that time in zones sums each zone's samples."""
+        power = [100, 100, 160, 200, 300, -5]  # Z1, Z1, Z3, Z4, Z7, below Z1
+
+        result = zones.time_in_zones(power, sample_seconds=2)
+
+        assert result.tolist() == [2, 4, 0, 2, 2, 0, 0, 2]
+        assert result.sum() == 2 * len(power)
@@ -1,3 +1,5 @@
+import copy
+import threading
 from datetime import timedelta
 
 import pytest
@@ -74,6 +76,15 @@ class TestGenericStepWithIntervals:
         assert interval_step.steps[0].step_id == 1
         assert interval_step.duration_in_seconds == 60 * 2
 
+    def test_steps_have_no_instance_dict(self, basic_interval_step, warmup_step):
+        """Test that step objects are slotted, without a per-instance __dict__."""
+        interval_step = GenericStepWithIntervals(
+            step_id=1, type=StepType.INTERVAL, steps=[basic_interval_step], iterations=2
+        )
+
+        for step in (basic_interval_step, warmup_step, interval_step):
+            assert not hasattr(step, "__dict__")
+
 
 class TestGenericWorkout:
     def test_initialization_with_step(self, basic_interval_step):
@@ -94,3 +105,197 @@ class TestGenericWorkout:
 
         assert len(workout.steps) == 2
         assert workout.steps[-1].step_id == 2
+
+
+def atomic_step(step_id: int) -> GenericAtomicStep:
+    return GenericAtomicStep(
+        step_id=step_id, duration_in_seconds=60, power_zone=2, type=StepType.INTERVAL
+    )
+
+
+class TestStepContainerIndex:
+    @pytest.fixture
+    def workout(self):
+        workout = GenericWorkout(name="Test Workout", description="desc", steps=[])
+        for step_id in range(1, 6):
+            workout.add_step(atomic_step(step_id))
+        return workout
+
+    def test_get_step_by_id(self, workout):
+        """Test that steps are found by step_id."""
+        for step_id in range(1, 6):
+            assert workout.get_step_by_id(step_id) is workout.steps[step_id - 1]
+        with pytest.raises(StopIteration):
+            workout.get_step_by_id(6)
+
+    def test_add_step_with_lower_id_is_sorted(self, workout):
+        """Test that a step with a lower step_id is inserted by step_id, as before."""
+        step = atomic_step(0)
+
+        workout.add_step(step)
+
+        assert workout.steps[0] is step
+        assert [s.step_id for s in workout.steps] == [1, 2, 3, 4, 5, 6]
+        assert workout.get_step_by_id(1) is step
+
+    def test_remove_step_by_id_renumbers_following_steps(self, workout):
+        """Test that removing a step renumbers the following ones."""
+        fourth = workout.get_step_by_id(4)
+
+        workout.remove_step(3)
+
+        assert [s.step_id for s in workout.steps] == [1, 2, 3, 4]
+        assert workout.get_step_by_id(3) is fourth
+
+    def test_steps_replaced_outside_the_mixin(self, workout):
+        """Test that lookups still work after the steps list is modified directly."""
+        workout.steps.append(atomic_step(10))
+        workout.steps = workout.steps[1:]
+
+        assert workout.get_step_by_id(10).step_id == 10
+        assert workout.get_step_by_id(2) is workout.steps[0]
+
+    def test_step_id_edited_in_place(self, workout):
+        """Test that lookups fall back to a scan if a step_id was edited in place."""
+        workout.steps[0].step_id = 42
+
+        assert workout.get_step_by_id(42) is workout.steps[0]
+        with pytest.raises(StopIteration):
+            workout.get_step_by_id(1)
+
+    def test_extend_steps(self, workout):
+        """Test that extend_steps behaves like repeated add_step calls."""
+        new_steps = [atomic_step(6), atomic_step(7)]
+
+        workout.extend_steps(new_steps)
+
+        assert workout.steps[-2:] == new_steps
+        assert [s.step_id for s in workout.steps] == [1, 2, 3, 4, 5, 6, 7]
+
+    def test_batch_edit_reindexes_once_on_exit(self, workout, mocker):
+        """Test that edits inside batch_edit are reindexed once, on exit."""
+        reindex_spy = mocker.spy(workout, "reindex_steps")
+
+        with workout.batch_edit():
+            workout.add_step(atomic_step(100))
+            workout.remove_step(2)
+            workout.extend_steps([atomic_step(101), atomic_step(102)])
+            assert [s.step_id for s in workout.steps] == [1, 3, 4, 5, 100, 101, 102]
+
+        assert reindex_spy.call_count == 1
+        assert [s.step_id for s in workout.steps] == [1, 2, 3, 4, 5, 6, 7]
+
+
+class TestGenericWorkoutCaches:
+    @pytest.fixture
+    def workout(self, warmup_step, basic_interval_step, second_interval_step):
+        interval_step = GenericStepWithIntervals(
+            step_id=2,
+            type=StepType.INTERVAL,
+            steps=[basic_interval_step, second_interval_step],
+            iterations=2,
+        )
+        return GenericWorkout(
+            name="Test Workout", description="desc", steps=[warmup_step, interval_step]
+        )
+
+    def test_flatten_steps_is_computed_once(self, workout, mocker):
+        """Test that repeated flatten_steps calls neither reindex nor flatten again."""
+        first = workout.flatten_steps()
+        reindex_spy = mocker.spy(workout, "reindex_steps")
+        flatten_spy = mocker.spy(workout, "_flatten_steps")
+
+        second = workout.flatten_steps()
+
+        assert second == first
+        assert reindex_spy.call_count == 0
+        assert flatten_spy.call_count == 0
+
+    def test_aggregates(self, workout):
+        """Test duration, interval count and time per zone."""
+        assert workout.duration() == timedelta(seconds=30 + (60 + 120) * 2)
+        assert workout.number_of_intervals() == 5
+        assert workout.time_in_zones() == {
+            1: timedelta(seconds=30 + 60 * 2),
+            2: timedelta(seconds=120 * 2),
+        }
+
+    def test_caches_are_invalidated_by_mutators(self, workout, warmup_step):
+        """Test that changes through the mixin, also of nested steps, refresh the caches."""
+        assert workout.duration() == timedelta(seconds=390)
+
+        workout.steps[1].remove_step()
+        assert workout.duration() == timedelta(seconds=30 + 60 * 2)
+        assert len(workout.flatten_steps()) == 3
+
+        workout.add_step(
+            GenericAtomicStep(
+                step_id=10,
+                duration_in_seconds=10,
+                power_zone=3,
+                type=StepType.COOL_DOWN,
+            )
+        )
+        assert workout.duration() == timedelta(seconds=160)
+        assert workout.time_in_zones()[3] == timedelta(seconds=10)
+
+    def test_caches_are_invalidated_when_steps_are_replaced(self, workout, warmup_step):
+        """Test that replacing the steps list refreshes the caches."""
+        assert workout.number_of_intervals() == 5
+
+        workout.steps = [warmup_step]
+
+        assert workout.number_of_intervals() == 1
+        assert workout.flatten_steps() == [warmup_step]
+
+    def test_interval_duration_follows_iterations(self, workout):
+        """Test that the cached duration of a step with intervals follows its iterations."""
+        interval_step = workout.steps[1]
+        assert interval_step.duration_in_seconds == 360
+
+        interval_step.iterations = 3
+
+        assert interval_step.duration_in_seconds == 540
+
+    def test_changes_of_other_workouts_keep_the_caches(self, workout, mocker):
+        """Test that changing a workout does not invalidate the caches of the others."""
+        workout.flatten_steps()
+        other = copy.deepcopy(workout)
+        flatten_spy = mocker.spy(workout, "_flatten_steps")
+
+        other.reindex_steps()
+        other.steps[1].add_step(
+            GenericIntervalStep(
+                step_id=3, duration_in_seconds=30, power_zone=3, type=StepType.INTERVAL
+            )
+        )
+
+        assert len(workout.flatten_steps()) == 5
+        assert len(other.flatten_steps()) == 7
+        assert flatten_spy.call_count == 0
+
+    def test_caches_stay_valid_across_threads(self, workout):
+        """Test that workouts edited in other threads keep this workout's caches."""
+        workout.flatten_steps()
+        others = [copy.deepcopy(workout) for _ in range(4)]
+
+        def edit(other):
+            for _ in range(100):
+                other.reindex_steps()
+
+        threads = [threading.Thread(target=edit, args=(o,)) for o in others]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        entry = workout._cache["flatten_steps"]
+        assert workout._flat_steps() is entry[2]
+
+    def test_step_without_intervals_has_no_duration(self):
+        """Test that a step with intervals whose steps are None lasts 0 seconds."""
+        step = GenericStepWithIntervals(
+            step_id=1, type=StepType.INTERVAL, steps=None, iterations=2
+        )
+
+        assert step.duration_in_seconds == 0
@@ -0,0 +1,186 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+from garminconnect import GarminConnectTooManyRequestsError
+
+from pywhooshconnect.garmin.client.AsyncGarminClient import AsyncGarminClient
+from pywhooshconnect.garmin.client.rate_limit import (
+    AdaptiveConcurrencyLimiter,
+    RateLimiter,
+    RetryPolicy,
+    TokenBucket,
+)
+from pywhooshconnect.garmin.client.response_cache import ResponseCache
+from pywhooshconnect.garmin.model.garmin_workout_dto import GarminSport
+
+httpx = pytest.importorskip("httpx")
+
+
+def load_file(filename: str):
+    """Load JSON test data from resources directory."""
+    path = Path(__file__).parents[2] / "resources" / "garmin" / filename
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestAsyncGarminClient:
+
+    @pytest.fixture
+    def garmin_client(self, mocker):
+        client = mocker.Mock()
+        client.username = "john.doe@example.com"
+        client.response_cache = None
+        client.token = "token"
+        client.api_headers.side_effect = lambda: {
+            "Authorization": f"Bearer {client.token}"
+        }
+        client.tokens_expire_soon.return_value = False
+        return client
+
+    @pytest.fixture
+    def rate_limiter(self):
+        return RateLimiter(
+            token_bucket=TokenBucket(rate=1000, capacity=1000),
+            concurrency=AdaptiveConcurrencyLimiter(initial_limit=16, max_limit=16),
+            retry_policy=RetryPolicy(max_attempts=3, base_delay_seconds=0.001),
+        )
+
+    @pytest.fixture
+    def async_client(self, garmin_client, rate_limiter):
+        def create(handler, **kwargs) -> AsyncGarminClient:
+            http_client = httpx.AsyncClient(
+                base_url="https://connectapi.garmin.com",
+                transport=httpx.MockTransport(handler),
+            )
+            return AsyncGarminClient(
+                garmin_client,
+                http_client=http_client,
+                **{"rate_limiter": rate_limiter, **kwargs},
+            )
+
+        return create
+
+    def test_get_scheduled_workout_by_id(self, async_client):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(
+                200, json=load_file("garmin_scheduled_workout_1408447427.json")
+            )
+
+        client = async_client(handler)
+        result = asyncio.run(client.get_scheduled_workout_by_id(1408447427))
+
+        assert result["workoutScheduleId"] == 1408447427
+        assert requests[0].url.path == "/workout-service/schedule/1408447427"
+        assert requests[0].headers["Authorization"] == "Bearer token"
+
+    def test_get_training_plans_filters_by_sport(self, async_client):
+        def handler(request):
+            return httpx.Response(
+                200,
+                json={"trainingPlanList": load_file("garmin_training_plan_list.json")},
+            )
+
+        client = async_client(handler)
+
+        assert len(asyncio.run(client.get_training_plans(sport=GarminSport.CYCLING)))
+        assert not asyncio.run(client.get_training_plans(sport=GarminSport.RUNNING))
+
+    def test_too_many_requests_raises_error(self, async_client):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(429)
+
+        client = async_client(handler)
+
+        with pytest.raises(GarminConnectTooManyRequestsError):
+            asyncio.run(client.get_power_zones())
+        assert len(requests) == 3  # retried up to the retry policy's max attempts
+
+    def test_throttled_requests_are_retried(self, async_client, rate_limiter):
+        statuses = iter([429, 503, 200])
+
+        def handler(request):
+            status = next(statuses)
+            return httpx.Response(status, json=[] if status == 200 else None)
+
+        client = async_client(handler)
+
+        assert asyncio.run(client.get_power_zones()) == []
+        assert rate_limiter.concurrency.limit < 16
+
+    def test_responses_are_cached(self, garmin_client, async_client, tmp_path):
+        garmin_client.response_cache = ResponseCache(tmp_path)
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=[{"zoneNumber": 1}])
+
+        client = async_client(handler)
+
+        assert asyncio.run(client.get_power_zones()) == [{"zoneNumber": 1}]
+        assert asyncio.run(client.get_power_zones()) == [{"zoneNumber": 1}]
+        assert len(requests) == 1
+
+    def test_expired_token_is_refreshed_once(self, garmin_client, async_client):
+        def refresh():
+            garmin_client.token = "new-token"
+
+        garmin_client.refresh_tokens.side_effect = refresh
+
+        def handler(request):
+            if request.headers["Authorization"] != "Bearer new-token":
+                return httpx.Response(401)
+            return httpx.Response(200, json={})
+
+        client = async_client(handler)
+
+        async def fetch_all():
+            await asyncio.gather(
+                *(client.get_scheduled_workout_by_id(i) for i in range(10))
+            )
+
+        asyncio.run(fetch_all())
+
+        garmin_client.refresh_tokens.assert_called_once()
+
+    def test_requests_run_concurrently_up_to_max_in_flight(self, async_client):
+        in_flight, max_seen = 0, 0
+
+        async def handler(request):
+            nonlocal in_flight, max_seen
+            in_flight += 1
+            max_seen = max(max_seen, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={})
+
+        client = async_client(handler, max_in_flight=5, rate_limiter=None)
+
+        async def fetch_all():
+            await asyncio.gather(
+                *(client.get_scheduled_workout_by_id(i) for i in range(20))
+            )
+
+        asyncio.run(fetch_all())
+
+        assert max_seen == 5
+
+    def test_default_rate_limiter_allows_max_in_flight(self, garmin_client):
+        client = AsyncGarminClient(
+            garmin_client,
+            max_in_flight=200,
+            http_client=httpx.AsyncClient(),
+            requests_per_second=100,
+        )
+
+        assert client.rate_limiter is not garmin_client.rate_limiter
+        assert client.rate_limiter.concurrency.limit == 200
+        assert client.rate_limiter.token_bucket.rate == 100
@@ -0,0 +1,39 @@
+import base64
+import json
+import time
+
+from pywhooshconnect.garmin.client.GarminClient import GarminClient
+
+
+def jwt(expires_at: float) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": int(expires_at)}).encode())
+    return f"header.{payload.decode().rstrip('=')}.signature"
+
+
+class TestGarminClientAuthentication:
+    """The garminconnect internals used to authenticate `AsyncGarminClient` requests."""
+
+    def test_api_headers_use_current_token(self):
+        client = GarminClient("user", "password")
+        client.client.di_token = jwt(time.time() + 3600)
+
+        assert (
+            client.api_headers()["Authorization"] == f"Bearer {client.client.di_token}"
+        )
+        assert client.api_base_url.startswith("https://connectapi.garmin.")
+
+    def test_tokens_expire_soon(self):
+        client = GarminClient("user", "password")
+
+        client.client.di_token = jwt(time.time() + 3600)
+        assert not client.tokens_expire_soon()
+        client.client.di_token = jwt(time.time() - 60)
+        assert client.tokens_expire_soon()
+
+    def test_refresh_tokens(self, mocker):
+        client = GarminClient("user", "password")
+        refresh = mocker.patch.object(client.client, "_refresh_session")
+
+        client.refresh_tokens()
+
+        refresh.assert_called_once_with()
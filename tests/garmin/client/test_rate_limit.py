@@ -0,0 +1,246 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from garminconnect import (
+    GarminConnectConnectionError,
+    GarminConnectTooManyRequestsError,
+)
+
+from pywhooshconnect.garmin.client.GarminClient import GarminClient
+from pywhooshconnect.garmin.client.rate_limit import (
+    AdaptiveConcurrencyLimiter,
+    RateLimiter,
+    RetryPolicy,
+    TokenBucket,
+    status_code_of,
+)
+
+
+class ScriptedGarmin:
+    """Local stub answering requests with a scripted sequence of statuses."""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def connectapi(self, path, **kwargs):
+        with self._lock:
+            self.calls += 1
+            status = self.statuses.pop(0) if self.statuses else 200
+        if status == 429:
+            raise GarminConnectTooManyRequestsError("Rate limit exceeded")
+        if status >= 400:
+            raise GarminConnectConnectionError(f"HTTP error: API Error {status} - ")
+        return {"path": path}
+
+
+@pytest.fixture
+def sleeps():
+    return []
+
+
+@pytest.fixture
+def rate_limiter(sleeps):
+    return RateLimiter(
+        token_bucket=TokenBucket(rate=1000, capacity=1000),
+        retry_policy=RetryPolicy(max_attempts=4, base_delay_seconds=1),
+        sleep=sleeps.append,
+    )
+
+
+class TestStatusCode:
+    def test_status_code_of_known_errors(self):
+        assert status_code_of(GarminConnectTooManyRequestsError("slow down")) == 429
+        assert status_code_of(GarminConnectConnectionError("API Error 503 - ")) == 503
+        assert status_code_of(GarminConnectConnectionError("Connection error")) is None
+
+
+class TestRateLimiter:
+    def test_retries_scripted_429_sequence(self, rate_limiter, sleeps):
+        stub = ScriptedGarmin([429, 429, 503])
+
+        assert rate_limiter.call(stub.connectapi, "/path") == {"path": "/path"}
+        assert stub.calls == 4
+        assert len(sleeps) == 3
+        # Exponential backoff with full jitter
+        assert all(0 <= delay <= 2**i for i, delay in enumerate(sleeps))
+
+    def test_gives_up_after_max_attempts(self, rate_limiter):
+        stub = ScriptedGarmin([429] * 10)
+
+        with pytest.raises(GarminConnectTooManyRequestsError):
+            rate_limiter.call(stub.connectapi, "/path")
+        assert stub.calls == 4
+
+    def test_client_errors_are_not_retried(self, rate_limiter):
+        stub = ScriptedGarmin([404])
+
+        with pytest.raises(GarminConnectConnectionError):
+            rate_limiter.call(stub.connectapi, "/path")
+        assert stub.calls == 1
+
+    def test_garmin_client_retries_throttled_requests(self, rate_limiter, mocker):
+        stub = ScriptedGarmin([429, 200])
+        mocker.patch("garminconnect.Garmin.connectapi", side_effect=stub.connectapi)
+        client = GarminClient("user", "password", rate_limiter=rate_limiter)
+
+        assert client.get_power_zones() == {
+            "path": "/biometric-service/powerZones/sports/all"
+        }
+        assert stub.calls == 2
+
+    def test_async_requests_are_retried(self):
+        limiter = RateLimiter(
+            token_bucket=TokenBucket(rate=1000, capacity=1000),
+            retry_policy=RetryPolicy(max_attempts=4, base_delay_seconds=0),
+        )
+        stub = ScriptedGarmin([429, 503])
+
+        async def connectapi(path):
+            return stub.connectapi(path)
+
+        assert asyncio.run(limiter.acall(connectapi, "/path")) == {"path": "/path"}
+        assert stub.calls == 3
+
+        stub.statuses = [404]
+        with pytest.raises(GarminConnectConnectionError):
+            asyncio.run(limiter.acall(connectapi, "/path"))
+        assert stub.calls == 4
+
+
+class TestAdaptiveConcurrencyLimiter:
+    def test_additive_increase(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=3)
+        for _ in range(2):
+            limiter.on_success()
+
+        assert limiter.limit == pytest.approx(2 + 1 / 2 + 1 / 2.5)
+
+        for _ in range(100):
+            limiter.on_success()
+        assert limiter.limit == 3
+
+    def test_multiplicative_decrease_once_per_window(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+        with limiter.slot() as first, limiter.slot() as second:
+            limiter.on_throttle(first)
+            limiter.on_throttle(second)
+
+        assert limiter.limit == 4
+
+        with limiter.slot() as window:
+            limiter.on_throttle(window)
+        assert limiter.limit == 2
+
+    def test_in_flight_requests_are_bounded_by_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+        in_flight, max_seen = 0, 0
+        lock = threading.Lock()
+
+        def request():
+            nonlocal in_flight, max_seen
+            with limiter.slot():
+                with lock:
+                    in_flight += 1
+                    max_seen = max(max_seen, in_flight)
+                time.sleep(0.01)
+                with lock:
+                    in_flight -= 1
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert max_seen == 2
+
+    def test_async_in_flight_requests_are_bounded_by_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+        in_flight, max_seen = 0, 0
+
+        async def request():
+            nonlocal in_flight, max_seen
+            async with limiter.slot_async():
+                in_flight += 1
+                max_seen = max(max_seen, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        async def run_all():
+            await asyncio.gather(*(request() for _ in range(8)))
+
+        asyncio.run(run_all())
+
+        assert max_seen == 2
+
+    def test_async_waiter_is_woken_by_a_thread(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        released = threading.Event()
+
+        def hold_slot():
+            with limiter.slot():
+                time.sleep(0.05)
+                released.set()
+
+        async def request():
+            thread = threading.Thread(target=hold_slot)
+            thread.start()
+            await asyncio.sleep(0.01)  # let the thread take the slot
+            async with limiter.slot_async():
+                assert released.is_set()
+            await asyncio.to_thread(thread.join)
+
+        asyncio.run(asyncio.wait_for(request(), timeout=5))
+
+    def test_cancelled_async_waiter_does_not_take_a_slot(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+
+        async def wait_for_slot():
+            async with limiter.slot_async():
+                pass
+
+        async def run():
+            async with limiter.slot_async():
+                waiter = asyncio.create_task(wait_for_slot())
+                await asyncio.sleep(0)
+                waiter.cancel()
+            async with limiter.slot_async():
+                pass
+
+        asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+    def test_limit_settles_under_scripted_throttling(self, sleeps):
+        # The server accepts 3 requests out of 4: the limit must neither collapse to the
+        # minimum nor grow to the maximum.
+        limiter = RateLimiter(
+            token_bucket=TokenBucket(rate=1000, capacity=1000),
+            concurrency=AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=64),
+            retry_policy=RetryPolicy(max_attempts=10, base_delay_seconds=0),
+            sleep=sleeps.append,
+        )
+        stub = ScriptedGarmin([200, 200, 200, 429] * 50)
+
+        for i in range(150):
+            limiter.call(stub.connectapi, f"/path/{i}")
+
+        assert 1 < limiter.concurrency.limit < 64
+
+
+class TestTokenBucket:
+    def test_waits_when_empty(self):
+        now = [0.0]
+        waits = []
+
+        def sleep(seconds):
+            waits.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0], sleep=sleep)
+        for _ in range(4):
+            bucket.acquire()
+
+        assert sum(waits) == pytest.approx(1.0)
@@ -0,0 +1,167 @@
+import json
+import os
+from datetime import timedelta
+
+import pytest
+
+from pywhooshconnect.garmin.client.GarminClient import GarminClient
+from pywhooshconnect.garmin.client import response_cache
+from pywhooshconnect.garmin.client.response_cache import (
+    CachedEndpoint,
+    ResponseCache,
+)
+
+PLAN_URL = "/trainingplan-service/trainingplan/phased/1"
+SCHEDULE_URL = "/workout-service/schedule/1"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(directory=tmp_path)
+
+
+class TestResponseCache:
+    def test_get_returns_stored_response(self, cache):
+        cache.set(PLAN_URL, {}, {"taskList": []})
+
+        assert cache.get(PLAN_URL, {}) == {"taskList": []}
+
+    def test_get_misses_on_different_params_or_namespace(self, cache):
+        cache.set(PLAN_URL, {"params": {"a": 1}}, {"taskList": []}, namespace="user")
+
+        assert cache.get(PLAN_URL, {"params": {"a": 2}}, namespace="user") is None
+        assert cache.get(PLAN_URL, {"params": {"a": 1}}, namespace="other") is None
+
+    def test_uncached_endpoints_are_not_stored(self, cache, tmp_path):
+        cache.set("/userprofile-service/socialProfile", {}, {"displayName": "me"})
+
+        assert cache.get("/userprofile-service/socialProfile", {}) is None
+        assert not list(tmp_path.glob("*.json"))
+
+    def test_expired_entries_are_ignored(self, tmp_path):
+        cache = ResponseCache(
+            directory=tmp_path,
+            ttls={CachedEndpoint.TRAINING_PLANS: timedelta(seconds=-1)},
+        )
+        cache.set(PLAN_URL, {}, {"taskList": []})
+        cache.set(SCHEDULE_URL, {}, {"workoutScheduleId": 1})
+
+        assert cache.get(PLAN_URL, {}) is None
+        assert cache.get(SCHEDULE_URL, {}) == {"workoutScheduleId": 1}
+
+    def test_refresh_ignores_cached_responses(self, tmp_path):
+        ResponseCache(directory=tmp_path).set(PLAN_URL, {}, {"taskList": []})
+
+        assert ResponseCache(directory=tmp_path, refresh=True).get(PLAN_URL, {}) is None
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        cache = ResponseCache(directory=tmp_path)
+        paths = [f"/workout-service/schedule/{i}" for i in range(4)]
+        for age, path in zip((30, 20, 10), paths):
+            cache.set(path, {}, {"path": path})
+            entry = cache._entry_path(path, {}, "")
+            os.utime(entry, (entry.stat().st_atime, entry.stat().st_mtime - age))
+        entry_size = max(
+            cache._entry_path(path, {}, "").stat().st_size for path in paths[:3]
+        )
+
+        # Use the oldest entry, so that it becomes the most recently used one
+        assert cache.get(paths[0], {}) == {"path": paths[0]}
+
+        cache.max_size_bytes = 3 * entry_size + entry_size // 2
+        cache.set(paths[3], {}, {"path": paths[3]})
+
+        assert cache.get(paths[0], {}) is not None
+        assert cache.get(paths[1], {}) is None
+        assert cache.get(paths[2], {}) is not None
+        assert cache.get(paths[3], {}) is not None
+
+    def test_raw_body_is_stored_as_is(self, cache):
+        body = b'{"workoutScheduleId": 1,\n "calendarDate": "2024-01-01"}'
+        cache.set_raw(SCHEDULE_URL, {}, body)
+
+        assert cache.get_raw(SCHEDULE_URL, {}) == body
+        assert cache.get(SCHEDULE_URL, {}) == {
+            "workoutScheduleId": 1,
+            "calendarDate": "2024-01-01",
+        }
+
+    def test_decoded_response_is_served_raw(self, cache):
+        cache.set(SCHEDULE_URL, {}, {"workoutScheduleId": 1})
+
+        assert json.loads(cache.get_raw(SCHEDULE_URL, {})) == {"workoutScheduleId": 1}
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            '{"path": "/workout-service/schedule/1"}',
+            '{"stored_at": 0}',
+            '{"stored_at": 9e99}\n{"workoutSchedul',
+            "[]",
+            '{"stored_',
+            "\xff",
+        ],
+    )
+    def test_malformed_entries_are_cache_misses(self, cache, content):
+        cache.set(SCHEDULE_URL, {}, {"workoutScheduleId": 1})
+        entry = cache._entry_path(SCHEDULE_URL, {}, "")
+        entry.write_bytes(content.encode("latin-1"))
+
+        assert cache.get(SCHEDULE_URL, {}) is None
+        assert not entry.exists()
+
+    def test_directory_is_scanned_only_over_the_size_limit(self, cache, mocker):
+        scan = mocker.patch.object(
+            response_cache,
+            "evict_least_recently_used",
+            wraps=response_cache.evict_least_recently_used,
+        )
+        for i in range(10):
+            cache.set(f"/workout-service/schedule/{i}", {}, {"workoutScheduleId": i})
+
+        assert scan.call_count == 1
+
+        cache.max_size_bytes = 1
+        cache.set(SCHEDULE_URL, {}, {"workoutScheduleId": 1})
+
+        assert scan.call_count == 2
+        assert cache.get(SCHEDULE_URL, {}) is None
+
+
+class TestGarminClientResponseCache:
+    def test_connectapi_uses_cache(self, cache, mocker):
+        connectapi = mocker.patch(
+            "garminconnect.Garmin.connectapi", return_value={"taskList": []}
+        )
+        client = GarminClient("user", "password", response_cache=cache)
+
+        assert client.connectapi(PLAN_URL) == {"taskList": []}
+        assert client.connectapi(PLAN_URL) == {"taskList": []}
+        connectapi.assert_called_once_with(PLAN_URL)
+
+    def test_connectapi_without_cache(self, mocker):
+        connectapi = mocker.patch(
+            "garminconnect.Garmin.connectapi", return_value={"taskList": []}
+        )
+        client = GarminClient("user", "password")
+
+        client.connectapi(PLAN_URL)
+        client.connectapi(PLAN_URL)
+        assert connectapi.call_count == 2
+
+    def test_connectapi_raw_caches_raw_response(self, cache, mocker):
+        client = GarminClient("user", "password", response_cache=cache)
+        request = mocker.patch.object(
+            client.client,
+            "request",
+            return_value=mocker.Mock(content=b'{"taskList": []}'),
+        )
+        loads = mocker.spy(response_cache.json, "loads")
+
+        assert client.connectapi_raw(PLAN_URL) == b'{"taskList": []}'
+        assert client.connectapi_raw(PLAN_URL) == b'{"taskList": []}'
+        request.assert_called_once_with("GET", "connectapi", PLAN_URL)
+        # Only the entry headers are decoded
+        assert all(b"taskList" not in call.args[0] for call in loads.call_args_list)
+
+        assert client.connectapi(PLAN_URL) == {"taskList": []}
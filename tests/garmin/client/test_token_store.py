@@ -0,0 +1,122 @@
+import threading
+
+import pytest
+from garminconnect import GarminConnectAuthenticationError
+
+from pywhooshconnect.garmin.client.GarminClient import GarminClient
+from pywhooshconnect.garmin.client.token_store import TokenStore
+
+
+@pytest.fixture
+def token_store(tmp_path):
+    return TokenStore(tmp_path / "tokens", lock_timeout_seconds=0.2)
+
+
+class TestTokenStore:
+    def test_default_directory_from_environment(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("GARMINTOKENS", str(tmp_path))
+
+        assert TokenStore().directory == tmp_path.resolve()
+
+    def test_default_directory_per_user(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("GARMINTOKENS", str(tmp_path))
+
+        alice = TokenStore(user="alice@example.com")
+        bob = TokenStore(user="bob@example.com")
+
+        assert alice.directory == (tmp_path / "alice@example.com").resolve()
+        assert alice.directory != bob.directory
+        assert TokenStore(tmp_path, user="bob@example.com").directory == tmp_path
+
+    def test_has_tokens_and_clear(self, token_store):
+        assert not token_store.has_tokens()
+
+        token_store.directory.mkdir(parents=True)
+        token_store.token_file.write_text("{}")
+        assert token_store.has_tokens()
+
+        token_store.clear()
+        assert not token_store.has_tokens()
+
+    def test_lock_is_exclusive(self, token_store):
+        errors = []
+
+        def acquire():
+            try:
+                with token_store.lock():
+                    pass
+            except TimeoutError as e:
+                errors.append(e)
+
+        with token_store.lock():
+            thread = threading.Thread(target=acquire)
+            thread.start()
+            thread.join()
+
+        assert len(errors) == 1
+        acquire()
+        assert len(errors) == 1
+
+    def test_lock_is_reentrant(self, token_store):
+        with token_store.lock():
+            token_store.save('{"di_token": "token"}')
+
+        assert token_store.token_file.read_text() == '{"di_token": "token"}'
+        assert sorted(p.name for p in token_store.directory.iterdir()) == [
+            TokenStore.LOCK_FILENAME,
+            TokenStore.TOKEN_FILENAME,
+        ]
+
+
+class TestGarminClientTokenStore:
+    def test_login_uses_token_directory(self, token_store, mocker):
+        login = mocker.patch("garminconnect.Garmin.login", return_value=(None, None))
+        client = GarminClient("user", "password", token_store=token_store)
+
+        client.login()
+
+        login.assert_called_once_with(str(token_store.directory))
+
+    def test_login_with_rejected_tokens_falls_back_to_credentials(
+        self, token_store, mocker
+    ):
+        token_store.directory.mkdir(parents=True)
+        token_store.token_file.write_text("{}")
+
+        def login(tokenstore):
+            if token_store.has_tokens():
+                raise GarminConnectAuthenticationError("401 Unauthorized")
+            return None, None
+
+        garmin_login = mocker.patch("garminconnect.Garmin.login", side_effect=login)
+        client = GarminClient("user", "password", token_store=token_store)
+
+        assert client.login() == (None, None)
+        assert garmin_login.call_count == 2
+        assert not token_store.has_tokens()
+
+    def test_refreshed_tokens_are_saved_under_the_lock(self, token_store):
+        client = GarminClient("user", "password", token_store=token_store)
+        client.client.di_token = "refreshed"
+        saved = threading.Event()
+
+        def refresh():
+            # As garminconnect does after refreshing the tokens mid-run
+            client.client.dump(str(token_store.directory))
+            saved.set()
+
+        with token_store.lock():
+            thread = threading.Thread(target=refresh)
+            thread.start()
+            assert not saved.wait(0.05)
+        thread.join()
+
+        assert saved.is_set()
+        assert token_store.token_file.read_text() == client.client.dumps()
+
+    def test_login_without_token_store(self, mocker):
+        login = mocker.patch("garminconnect.Garmin.login", return_value=(None, None))
+
+        GarminClient("user", "password").login()
+
+        login.assert_called_once_with(None)
@@ -0,0 +1,136 @@
+import json
+from dataclasses import replace
+from datetime import date
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from pywhooshconnect.common.mapper.base import PowerZonesOptions
+from pywhooshconnect.common.model.power_zones import PowerZones
+
+from pywhooshconnect.garmin.mapper.garmin_to_generic_workout import (
+    GarminToGenericScheduledWorkoutMapper,
+)
+from pywhooshconnect.garmin.model.decoding import (
+    GarminValidation,
+    decode,
+    decode_scheduled_workout,
+    type_adapter,
+    validate_fully,
+)
+from pywhooshconnect.garmin.model.garmin_power_zones_dto import GarminPowerZones
+from pywhooshconnect.garmin.model.garmin_projection_dto import (
+    GarminScheduledWorkoutProjection,
+)
+from pywhooshconnect.garmin.model.garmin_scheduled_workout_dto import (
+    GarminScheduledWorkout,
+)
+from pywhooshconnect.garmin.model.garmin_training_plan_dto import (
+    GarminTrainingPlanDetail,
+)
+
+
+def read_bytes(filename: str) -> bytes:
+    """Raw content of a Garmin JSON test file."""
+    return (Path(__file__).parents[2] / "resources" / "garmin" / filename).read_bytes()
+
+
+class TestDecode:
+
+    @pytest.mark.parametrize(
+        "filename",
+        [
+            "garmin_scheduled_workout_1408447427.json",
+            "garmin_scheduled_workout_1408447448.json",
+        ],
+    )
+    def test_scheduled_workout_from_bytes(self, filename):
+        data = read_bytes(filename)
+
+        result = decode(GarminScheduledWorkout, data)
+
+        assert result == GarminScheduledWorkout(**json.loads(data))
+
+    def test_power_zones_from_bytes(self):
+        data = read_bytes("garmin_power_zones.json")
+
+        result = decode(List[GarminPowerZones], data)
+
+        assert result == [GarminPowerZones(**p) for p in json.loads(data)]
+
+    def test_training_plan_keeps_only_declared_fields(self):
+        result = decode(
+            GarminTrainingPlanDetail, read_bytes("training_plan_details.json")
+        )
+
+        assert set(result) == {"trainingPlanId", "taskList"}
+        task = next(t for t in result["taskList"] if t["taskWorkout"])
+        assert set(task) == {"calendarDate", "taskWorkout"}
+        assert set(task["taskWorkout"]) == {
+            "workoutId",
+            "workoutScheduleId",
+            "scheduledDate",
+            "workoutUpdatedDate",
+        }
+
+    def test_decoded_response_is_validated_as_is(self):
+        data = json.loads(read_bytes("garmin_scheduled_workout_1408447448.json"))
+
+        assert decode(GarminScheduledWorkout, data) == GarminScheduledWorkout(**data)
+
+    def test_type_adapters_are_built_once(self):
+        assert type_adapter(GarminScheduledWorkout) is type_adapter(
+            GarminScheduledWorkout
+        )
+
+
+SCHEDULED_WORKOUTS = [
+    "garmin_scheduled_workout_1408447427.json",
+    "garmin_scheduled_workout_1408447448.json",
+]
+
+
+class TestDecodeScheduledWorkoutProjection:
+
+    @pytest.fixture
+    def options(self):
+        return PowerZonesOptions(power_zones=PowerZones(ftp=250))
+
+    @pytest.mark.parametrize("filename", SCHEDULED_WORKOUTS)
+    def test_projection_maps_like_the_full_dto(self, filename, options):
+        data = read_bytes(filename)
+        mapper = GarminToGenericScheduledWorkoutMapper()
+
+        projection = decode_scheduled_workout(data, GarminValidation.PROJECTION)
+        full = decode_scheduled_workout(data, GarminValidation.FULL)
+
+        assert isinstance(projection, GarminScheduledWorkoutProjection)
+        assert mapper.map(projection, options) == mapper.map(full, options)
+        assert projection.workout.updatedDate == full.workout.updatedDate
+
+    def test_projection_skips_unused_fields(self):
+        data = json.loads(read_bytes(SCHEDULED_WORKOUTS[0]))
+        data["ownerId"] = "not an id"
+        data["workout"]["workoutThumbnailUrl"] = 42
+
+        projection = decode_scheduled_workout(data, GarminValidation.PROJECTION)
+
+        assert projection.raw is data
+        with pytest.raises(ValueError):
+            validate_fully(projection)
+
+    def test_validate_fully_keeps_the_schedule_entry(self):
+        data = read_bytes(SCHEDULED_WORKOUTS[1])
+        projection = decode_scheduled_workout(data, GarminValidation.PROJECTION)
+        rescheduled = replace(
+            projection, workoutScheduleId=1, calendarDate=date(2025, 11, 6)
+        )
+
+        result = validate_fully(rescheduled)
+
+        assert result == replace(
+            decode(GarminScheduledWorkout, data),
+            workoutScheduleId=1,
+            calendarDate=date(2025, 11, 6),
+        )
@@ -1,16 +1,23 @@
 import json
+import time
 from datetime import date
 from pathlib import Path
 from typing import List
 
 import pytest
 
+from pywhooshconnect.garmin.model.decoding import GarminValidation
 from pywhooshconnect.garmin.model.garmin_power_zones_dto import GarminPowerZones
+from pywhooshconnect.garmin.model.garmin_projection_dto import (
+    GarminScheduledWorkoutProjection,
+)
 from pywhooshconnect.garmin.model.garmin_scheduled_workout_dto import (
     GarminScheduledWorkout,
 )
 from pywhooshconnect.garmin.model.garmin_workout_dto import GarminSport, GarminWorkout
 from pywhooshconnect.garmin.service.garmin_training_plan_service import (
+    GarminFetchStrategy,
+    GarminScheduledWorkoutRef,
     GarminTrainingPlanService,
 )
 
@@ -27,6 +34,23 @@ def garmin_workout(filename: str) -> GarminWorkout:
     return GarminWorkout(**workout_data)
 
 
+def load_file(filename: str):
+    """Load JSON test data from resources directory."""
+    with open(json_path(filename), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def calendar_item(scheduled_workout: dict) -> dict:
+    """Build the calendar item referencing a scheduled workout."""
+    return {
+        "id": scheduled_workout["workoutScheduleId"],
+        "itemType": "workout",
+        "date": scheduled_workout["calendarDate"],
+        "workoutId": scheduled_workout["workout"]["workoutId"],
+        "sportTypeKey": scheduled_workout["workout"]["sportType"]["sportTypeKey"],
+    }
+
+
 def garmin_power_zones(filename: str) -> List[GarminPowerZones]:
     """Load GarminPowerZones  from JSON file."""
     with open(json_path(filename), encoding="utf-8") as f:
@@ -114,3 +138,267 @@ class TestGarminTrainingPlanService:
         assert result is not None
         assert result.sport == "CYCLING"
         mock_client.get_power_zones.assert_called_once()
+
+    def test_get_scheduled_workouts_concurrently_preserves_order(self, mock_client):
+        # Arrange
+        service = GarminTrainingPlanService(mock_client, max_workers=4)
+        workout = garmin_workout("garmin_workout.json")
+        schedule_ids = [101, 102, 103, 104, 105]
+
+        mock_client.get_training_plans.return_value = [{"trainingPlanId": 1}]
+        mock_client.get_training_plan_by_id.return_value = {
+            "taskList": [
+                {
+                    "calendarDate": f"2025-01-{day:02d}",
+                    "taskWorkout": {
+                        "workoutId": schedule_id,
+                        "workoutScheduleId": schedule_id,
+                        "scheduledDate": f"2025-01-{day:02d}T10:00:00",
+                    },
+                }
+                for day, schedule_id in enumerate(schedule_ids, start=1)
+            ]
+        }
+
+        def get_scheduled_workout_by_id(scheduled_workout_id):
+            # Earlier workouts answer last
+            time.sleep((110 - scheduled_workout_id) / 1000)
+            return GarminScheduledWorkout(
+                workoutScheduleId=scheduled_workout_id,
+                workout=workout,
+                calendarDate=date(2025, 1, scheduled_workout_id - 100),
+                createdDate=date(2025, 1, 1),
+                ownerId=1,
+            ).__dict__
+
+        mock_client.get_scheduled_workout_by_id.side_effect = (
+            get_scheduled_workout_by_id
+        )
+
+        # Act
+        result = service.get_scheduled_workouts(
+            sport=GarminSport.CYCLING,
+            from_date=date(2025, 1, 1),
+            to_date=date(2025, 1, 31),
+        )
+
+        # Assert
+        assert [w.workoutScheduleId for w in result] == schedule_ids
+        assert mock_client.get_scheduled_workout_by_id.call_count == len(schedule_ids)
+
+    def test_get_scheduled_workouts_fetches_each_workout_once(self, mock_client):
+        # Arrange
+        service = GarminTrainingPlanService(mock_client)
+        scheduled_workout = load_file("garmin_scheduled_workout_1408447448.json")
+        workout_id = scheduled_workout["workout"]["workoutId"]
+        tasks = [(1408447448, "2025-10-30"), (2001, "2025-11-06"), (2002, "2025-11-13")]
+
+        mock_client.get_training_plans.return_value = [{"trainingPlanId": 1}]
+        mock_client.get_training_plan_by_id.return_value = {
+            "taskList": [
+                {
+                    "calendarDate": calendar_date,
+                    "taskWorkout": {
+                        "workoutId": workout_id,
+                        "workoutScheduleId": schedule_id,
+                        "scheduledDate": f"{calendar_date}T00:00:00.0",
+                    },
+                }
+                for schedule_id, calendar_date in tasks
+            ]
+        }
+        mock_client.get_scheduled_workout_by_id.return_value = scheduled_workout
+
+        # Act
+        result = service.get_scheduled_workouts(
+            sport=GarminSport.CYCLING,
+            from_date=date(2025, 10, 1),
+            to_date=date(2025, 11, 30),
+        )
+
+        # Assert
+        mock_client.get_scheduled_workout_by_id.assert_called_once_with(1408447448)
+        assert [w.workoutScheduleId for w in result] == [1408447448, 2001, 2002]
+        assert [w.calendarDate for w in result] == [
+            date(2025, 10, 30),
+            date(2025, 11, 6),
+            date(2025, 11, 13),
+        ]
+        assert all(w.workout is result[0].workout for w in result)
+
+    def test_iter_scheduled_workouts_fetches_lazily(self, mock_client):
+        # Arrange
+        service = GarminTrainingPlanService(mock_client)
+        scheduled_workout = load_file("garmin_scheduled_workout_1408447448.json")
+        mock_client.get_scheduled_workout_by_id.return_value = scheduled_workout
+        refs = [
+            GarminScheduledWorkoutRef(
+                workout_schedule_id=schedule_id,
+                workout_id=workout_id,
+                calendar_date=date(2025, 10, day),
+            )
+            for schedule_id, workout_id, day in [(1, 10, 1), (2, 20, 2), (3, 10, 3)]
+        ]
+
+        # Act
+        workouts = service.iter_scheduled_workouts(refs)
+        first = next(workouts)
+
+        # Assert
+        assert first.workoutScheduleId == 1
+        mock_client.get_scheduled_workout_by_id.assert_called_once_with(1)
+        assert [w.workoutScheduleId for w in workouts] == [2, 3]
+        assert mock_client.get_scheduled_workout_by_id.call_count == 2
+
+    def test_decode_raw_validates_response_bytes(self, mock_client):
+        # Arrange
+        service = GarminTrainingPlanService(mock_client, decode_raw=True)
+        mock_client.get_training_plans.return_value = [{"trainingPlanId": 1}]
+        mock_client.get_training_plan_by_id.return_value = json_path(
+            "training_plan_details.json"
+        ).read_bytes()
+        mock_client.get_scheduled_workout_by_id.side_effect = (
+            lambda scheduled_workout_id, raw: json_path(
+                f"garmin_scheduled_workout_{scheduled_workout_id}.json"
+            ).read_bytes()
+        )
+        mock_client.get_power_zones.return_value = json_path(
+            "garmin_power_zones.json"
+        ).read_bytes()
+
+        # Act
+        result = service.get_scheduled_workouts(
+            sport=GarminSport.CYCLING,
+            from_date=date(2025, 10, 29),
+            to_date=date(2025, 11, 2),
+        )
+        power_zones = service.get_power_zones_by_sport(GarminSport.CYCLING)
+
+        # Assert
+        assert result == [
+            GarminScheduledWorkout(**load_file(f"garmin_scheduled_workout_{i}.json"))
+            for i in (1408447448, 1408447427)
+        ]
+        mock_client.get_training_plan_by_id.assert_called_once_with(1, raw=True)
+        mock_client.get_power_zones.assert_called_once_with(raw=True)
+        assert power_zones.sport == "CYCLING"
+
+    def test_projection_validation_samples_full_validation(self, mock_client, mocker):
+        # Arrange
+        service = GarminTrainingPlanService(
+            mock_client,
+            validation=GarminValidation.PROJECTION,
+            full_validation_sample_rate=1,
+        )
+        invalid = {
+            **load_file("garmin_scheduled_workout_1408447448.json"),
+            "ownerId": "not an id",
+        }
+        mock_client.get_scheduled_workout_by_id.return_value = invalid
+        ref = GarminScheduledWorkoutRef(
+            workout_schedule_id=1408447448,
+            workout_id=1,
+            calendar_date=date(2025, 10, 30),
+        )
+
+        # Act / Assert
+        with pytest.raises(ValueError):
+            service.fetch_scheduled_workouts([ref])
+
+        service.full_validation_sample_rate = 0
+        (result,) = service.fetch_scheduled_workouts([ref])
+        assert isinstance(result, GarminScheduledWorkoutProjection)
+
+    def test_invalid_full_validation_sample_rate_raises_error(self, mock_client):
+        with pytest.raises(ValueError, match="must be between 0 and 1"):
+            GarminTrainingPlanService(mock_client, full_validation_sample_rate=2)
+
+    def test_invalid_max_workers_raises_error(self, mock_client):
+        with pytest.raises(ValueError, match="max_workers must be at least 1"):
+            GarminTrainingPlanService(mock_client, max_workers=0)
+
+
+class TestGarminTrainingPlanServiceCalendarStrategy:
+
+    @pytest.fixture
+    def mock_client(self, mocker):
+        return mocker.Mock()
+
+    @pytest.fixture
+    def service(self, mock_client):
+        return GarminTrainingPlanService(
+            mock_client, fetch_strategy=GarminFetchStrategy.CALENDAR
+        )
+
+    @pytest.fixture
+    def scheduled_workouts(self):
+        return [
+            load_file("garmin_scheduled_workout_1408447448.json"),  # 2025-10-30
+            load_file("garmin_scheduled_workout_1408447427.json"),  # 2025-11-02
+        ]
+
+    @pytest.fixture
+    def calendar(self, mock_client, scheduled_workouts):
+        months = {
+            (2025, 10): [calendar_item(scheduled_workouts[0])],
+            (2025, 11): [
+                calendar_item(scheduled_workouts[1]),
+                {"id": 1, "itemType": "activity", "date": "2025-11-01"},
+            ],
+        }
+        mock_client.get_calendar_month.side_effect = lambda year, month: {
+            "calendarItems": months.get((year, month), [])
+        }
+        workouts = {s["workout"]["workoutId"]: s["workout"] for s in scheduled_workouts}
+        mock_client.get_workout_by_id.side_effect = workouts.get
+
+    def test_get_scheduled_workouts_from_calendar(
+        self, service, mock_client, calendar, scheduled_workouts
+    ):
+        result = service.get_scheduled_workouts(
+            sport=GarminSport.CYCLING,
+            from_date=date(2025, 10, 29),
+            to_date=date(2025, 11, 2),
+        )
+
+        assert [w.workoutScheduleId for w in result] == [1408447448, 1408447427]
+        assert [w.calendarDate for w in result] == [
+            date(2025, 10, 30),
+            date(2025, 11, 2),
+        ]
+        assert (
+            result[0].workout == GarminScheduledWorkout(**scheduled_workouts[0]).workout
+        )
+        assert mock_client.get_calendar_month.call_count == 2
+        assert mock_client.get_workout_by_id.call_count == 2
+        mock_client.get_training_plan_by_id.assert_not_called()
+        mock_client.get_scheduled_workout_by_id.assert_not_called()
+
+    def test_incomplete_calendar_data_falls_back_to_schedule_endpoint(
+        self, service, mock_client, calendar, scheduled_workouts
+    ):
+        incomplete = {**scheduled_workouts[1]["workout"], "workoutSegments": None}
+        mock_client.get_workout_by_id.side_effect = lambda workout_id: (
+            incomplete
+            if workout_id == incomplete["workoutId"]
+            else scheduled_workouts[0]["workout"]
+        )
+        mock_client.get_scheduled_workout_by_id.return_value = scheduled_workouts[1]
+
+        result = service.get_scheduled_workouts(
+            sport=GarminSport.CYCLING,
+            from_date=date(2025, 10, 1),
+            to_date=date(2025, 11, 30),
+        )
+
+        assert [w.workoutScheduleId for w in result] == [1408447448, 1408447427]
+        mock_client.get_scheduled_workout_by_id.assert_called_once_with(1408447427)
+
+    def test_calendar_excludes_other_sports(self, service, calendar):
+        result = service.get_scheduled_workouts(
+            sport=GarminSport.RUNNING,
+            from_date=date(2025, 10, 1),
+            to_date=date(2025, 11, 30),
+        )
+
+        assert result == []
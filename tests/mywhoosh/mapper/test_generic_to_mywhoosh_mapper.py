@@ -221,6 +221,9 @@ class TestGenericToMyWhooshStepMapper:
         assert result[1].Id == 3
         assert result[2].Id == 2
         assert result[3].Id == 3
+        # Each occurrence is a distinct object, the intervals are mapped once
+        assert len({id(step) for step in list(result)}) == 4
+        assert [len(block) for block, _ in result.blocks] == [2]
 
     def test_map_step_with_intervals_respects_iterations(self, power_zones_options):
         """Test that iterations are correctly expanded"""
@@ -263,6 +266,18 @@ class TestGenericToMyWhooshWorkoutStepMapper:
         assert result.Time == 300
         assert result.AuthorName == "Garmin powered by pyWhooshGarmin"
 
+    def test_reschedule_workout(self, simple_workout, power_zones_options):
+        mapper = GenericToMyWhooshWorkoutMapper()
+        mapped = mapper.map(simple_workout, power_zones_options)
+
+        result = mapper.reschedule(mapped, simple_workout, datetime(2025, 1, 8))
+
+        assert result.Name == "20250108 Test Workout"
+        assert result.Id != mapped.Id
+        assert result.WorkoutStepsArray == mapped.WorkoutStepsArray
+        assert mapped.Name == "20250101 Test Workout"
+        assert simple_workout.scheduled_date == datetime(2025, 1, 1)
+
     def test_map_complex_workout(self, complex_workout, power_zones_options):
         mapper = GenericToMyWhooshWorkoutMapper()
 
@@ -456,3 +471,40 @@ class TestGenericToMyWhooshWorkoutStepMapper:
         expected_ids = [1, 2, 3, 4, 5, 6, 7]
         actual_ids = [step.Id for step in result.WorkoutStepsArray]
         assert actual_ids == expected_ids
+
+    def test_map_workout_keeps_repetitions_unexpanded(self, power_zones_options):
+        """Test that a long repeat block is mapped once, with distinct numbered steps"""
+        workout = GenericWorkout(
+            name="40x30s",
+            description="Test",
+            steps=[
+                GenericStepWithIntervals(
+                    step_id=1,
+                    steps=[
+                        GenericIntervalStep(
+                            step_id=1,
+                            duration_in_seconds=30,
+                            power_zone=6,
+                            type=StepType.INTERVAL,
+                        ),
+                        GenericIntervalStep(
+                            step_id=2,
+                            duration_in_seconds=30,
+                            power_zone=1,
+                            type=StepType.RECOVERY,
+                        ),
+                    ],
+                    iterations=40,
+                    type=StepType.INTERVAL,
+                ),
+            ],
+        )
+
+        mapper = GenericToMyWhooshWorkoutMapper()
+        result = mapper.map(workout, power_zones_options)
+
+        assert result.StepCount == 80
+        assert [len(block) for block, _ in result.WorkoutStepsArray.blocks] == [2]
+        steps = list(result.WorkoutStepsArray)
+        assert [step.Id for step in steps] == list(range(1, 81))
+        assert len({id(step) for step in steps}) == 80
@@ -0,0 +1,61 @@
+from dataclasses import FrozenInstanceError, replace
+
+import pytest
+
+from pywhooshconnect.common.mapper.base import PowerZonesOptions
+from pywhooshconnect.common.model.power_zones import PowerZones
+from pywhooshconnect.mywhoosh.mapper.power_targets import (
+    PowerTargetTable,
+    power_targets,
+)
+from pywhooshconnect.mywhoosh.mapper.power_zones_config import PowerZoneConfig
+
+
+@pytest.fixture
+def config():
+    return PowerZoneConfig(
+        config_dict={"power_zones": {"zones": {7: {"multiplier": 1.2}}}}
+    )
+
+
+class TestPowerTargetTable:
+
+    def test_compile(self, config):
+        table = PowerTargetTable.compile(PowerZones(ftp=300), config)
+
+        assert len(table.targets) == 8
+        assert table.lookup(None) == 0
+        assert table.lookup(1) == 0.275
+        assert table.lookup(3) == 0.825
+        assert table.lookup(7) == 1.50 * 1.2
+
+    @pytest.mark.parametrize("zone", [0, 8, -1])
+    def test_lookup_invalid_zone_raises_error(self, config, zone):
+        table = PowerTargetTable.compile(PowerZones(ftp=300), config)
+
+        with pytest.raises(ValueError, match="Zone must be between 1 and 7"):
+            table.lookup(zone)
+
+    def test_table_is_compiled_once_per_options(self, config, mocker):
+        options = PowerZonesOptions(power_zones=PowerZones(ftp=300), config=config)
+        compile_spy = mocker.spy(PowerTargetTable, "compile")
+
+        for zone in range(1, 8):
+            power_targets(options).lookup(zone)
+
+        assert compile_spy.call_count == 1
+
+    def test_changed_options_get_their_own_table(self, config):
+        options = PowerZonesOptions(power_zones=PowerZones(ftp=300))
+        assert power_targets(options).lookup(7) == 1.50 * 1.1
+
+        with pytest.raises(FrozenInstanceError):
+            options.config = config
+        with pytest.raises(FrozenInstanceError):
+            options.power_zones.z7_floor = 1.70
+
+        changed = replace(
+            options, power_zones=PowerZones(ftp=300, z7_floor=1.60), config=config
+        )
+        assert power_targets(changed).lookup(7) == pytest.approx(1.60 * 1.2)
+        assert power_targets(options).lookup(7) == 1.50 * 1.1
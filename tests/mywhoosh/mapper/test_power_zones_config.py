@@ -1,8 +1,11 @@
+import dataclasses
+import os
 from pathlib import Path
 
 import pytest
 import yaml
 
+from pywhooshconnect.mywhoosh.mapper import power_zones_config
 from pywhooshconnect.mywhoosh.mapper.power_zones_config import (
     PowerZoneConfig,
     PowerZoneConfigurationError,
@@ -93,6 +96,35 @@ class TestPowerZoneConfig:
         data = {"power_zones": {"zones": {7: {"multiplier": 0.9}}}}
         path = write_yaml(tmp_path, data)
 
-        config = PowerZoneConfig(str(path))
         with pytest.raises(PowerZoneConfigurationError):
-            config.get_zone7_multiplier()
+            PowerZoneConfig(str(path))
+
+    def test_config_file_is_parsed_once(self, tmp_path, mocker):
+        path = write_yaml(tmp_path, {"power_zones": {"default_zone_weight": 0.4}})
+        load_spy = mocker.spy(power_zones_config, "_load_config")
+
+        first = PowerZoneConfig(str(path))
+        second = PowerZoneConfig(str(path))
+
+        assert load_spy.call_count == 1
+        assert first.settings is second.settings
+        assert first == second and hash(first) == hash(second)
+
+    def test_modified_config_file_is_parsed_again(self, tmp_path):
+        path = write_yaml(tmp_path, {"power_zones": {"default_zone_weight": 0.4}})
+        assert PowerZoneConfig(str(path)).default_zone_weight == 0.4
+
+        write_yaml(tmp_path, {"power_zones": {"default_zone_weight": 0.6}})
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+
+        assert PowerZoneConfig(str(path)).default_zone_weight == 0.6
+
+    def test_settings_are_immutable(self):
+        config = PowerZoneConfig(
+            config_dict={"power_zones": {"zones": {1: {"weight": 0.3}}}}
+        )
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            config.settings.default_zone_weight = 0.9
+        config.zone_weights[2] = 0.9
+        assert config.get_zone_weight(2) == config.DEFAULT_ZONE_WEIGHT
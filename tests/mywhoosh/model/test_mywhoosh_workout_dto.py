@@ -0,0 +1,188 @@
+import copy
+import json
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from pywhooshconnect.mywhoosh.model.mywhoosh_workout_dto import (
+    MyWhooshWorkout,
+    MyWhooshWorkoutStep,
+    MyWhooshWorkoutSteps,
+)
+
+
+def mywhoosh_step(step_id: int = 1, power: float = 0.825) -> MyWhooshWorkoutStep:
+    return MyWhooshWorkoutStep(
+        IntervalId=0,
+        StepType="E_Normal",
+        Id=step_id,
+        WorkoutMessage=["Più veloce"],
+        Rpm=90,
+        Power=power,
+        Pace=0,
+        StartPower=0,
+        EndPower=0,
+        Time=300,
+        IsManualGrade=False,
+        ManualGradeValue=0,
+        ShowAveragePower=True,
+        FlatRoad=0,
+    )
+
+
+@pytest.fixture
+def workout():
+    step = mywhoosh_step()
+    return MyWhooshWorkout(
+        Name="20250101 Test Workout",
+        Description="A test workout",
+        StepCount=1,
+        Time=300,
+        WorkoutStepsArray=[step],
+    )
+
+
+class TestMyWhooshWorkoutSerialization:
+
+    def test_to_json_bytes_is_compact_by_default(self, workout):
+        data = workout.to_json_bytes()
+
+        assert b"\n" not in data
+        assert json.loads(data)["WorkoutStepsArray"][0]["Power"] == 0.825
+
+    def test_to_json_bytes_pretty(self, workout):
+        data = workout.to_json_bytes(pretty=True)
+
+        assert data.startswith(b'{\n    "Name": "20250101 Test Workout"')
+        assert json.loads(data) == json.loads(workout.to_json_bytes())
+
+    def test_non_ascii_characters_are_written_as_utf8(self, workout):
+        assert "Più veloce".encode("utf-8") in workout.to_json_bytes()
+
+    def test_integer_defaults_are_written_as_integers(self, workout):
+        data = workout.to_json_bytes()
+
+        assert b'"FTPMultiplier":1,"StressPoint":0,' in data
+        assert MyWhooshWorkout.from_json(data).FTPMultiplier == 1
+
+    def test_serialization_does_not_warn(self, workout, recwarn):
+        workout.to_json()
+
+        assert len(recwarn) == 0
+
+    def test_from_json_round_trip(self, workout):
+        data = workout.to_json_bytes()
+
+        assert MyWhooshWorkout.from_json(data).to_json_bytes() == data
+
+    def test_content_id_depends_on_content_and_keys(self, workout):
+        content_id = workout.content_id(1)
+        workout.Id = 42
+
+        assert workout.content_id(1) == content_id
+        assert workout.content_id(2) != content_id
+        workout.Description = "Another description"
+        assert workout.content_id(1) != content_id
+
+    def test_id_defaults_to_content_id(self, workout):
+        def copy_of(workout, **changes):
+            return MyWhooshWorkout(
+                Name=changes.get("Name", workout.Name),
+                Description=workout.Description,
+                StepCount=workout.StepCount,
+                Time=workout.Time,
+                WorkoutStepsArray=list(workout.WorkoutStepsArray),
+                Id=changes.get("Id"),
+            )
+
+        assert workout.Id == workout.content_id()
+        assert copy_of(workout).Id == workout.Id
+        assert copy_of(workout, Name="Another workout").Id != workout.Id
+        assert copy_of(workout, Id=42).Id == 42
+
+    def test_steps_have_no_instance_dict(self, workout):
+        assert not hasattr(workout.WorkoutStepsArray[0], "__dict__")
+
+
+class TestMyWhooshWorkoutSteps:
+
+    @pytest.fixture
+    def steps(self):
+        steps = MyWhooshWorkoutSteps([mywhoosh_step(1)])
+        steps.append_block([mywhoosh_step(2, 1.2), mywhoosh_step(3, 0.5)], 3)
+        steps.append_block([mywhoosh_step(4)])
+        return steps
+
+    def test_repeated_blocks_are_stored_once(self, steps):
+        assert len(steps) == 8
+        assert [len(block) for block, _ in steps.blocks] == [1, 2, 1]
+        assert [iterations for _, iterations in steps.blocks] == [1, 3, 1]
+
+    def test_occurrences_keep_ids_unless_numbered(self, steps):
+        assert [step.Id for step in steps] == [1, 2, 3, 2, 3, 2, 3, 4]
+
+        steps.numbered = True
+
+        assert [step.Id for step in steps] == [1, 2, 3, 4, 5, 6, 7, 8]
+        assert [steps[i].Id for i in range(len(steps))] == list(range(1, 9))
+
+    def test_occurrences_are_distinct(self, steps):
+        steps.numbered = True
+        occurrences = list(steps)
+
+        assert len({id(step) for step in occurrences}) == len(occurrences)
+        assert occurrences[1].Power == occurrences[3].Power == 1.2
+
+    def test_occurrences_are_read_only(self, steps):
+        steps.numbered = True
+
+        with pytest.raises(FrozenInstanceError):
+            steps[1].Power = 2.0
+        with pytest.raises(FrozenInstanceError):
+            next(iter(steps)).Id = 10
+        assert steps[1].Power == 1.2
+
+        edited = copy.copy(steps[1])
+        edited.Power = 2.0
+        assert type(edited) is MyWhooshWorkoutStep
+        assert edited.Id == 2
+        assert steps[1] != edited
+
+    def test_indexing(self, steps):
+        assert steps[-1].Id == 4
+        assert [step.Id for step in steps[2:5]] == [3, 2, 3]
+        with pytest.raises(IndexError):
+            steps[8]
+
+    def test_consecutive_single_blocks_are_merged(self):
+        steps = MyWhooshWorkoutSteps([mywhoosh_step(1)])
+        steps.extend([mywhoosh_step(2)])
+        steps.append_block([mywhoosh_step(3)], 0)
+
+        assert len(steps.blocks) == 1
+        assert steps == [mywhoosh_step(1), mywhoosh_step(2)]
+
+    def test_serialization_expands_blocks(self, steps):
+        steps.numbered = True
+        workout = MyWhooshWorkout(
+            Name="Test",
+            Description="",
+            StepCount=len(steps),
+            Time=2400,
+            WorkoutStepsArray=steps,
+            Id=1,
+        )
+        expanded = MyWhooshWorkout(
+            Name="Test",
+            Description="",
+            StepCount=len(steps),
+            Time=2400,
+            WorkoutStepsArray=list(steps),
+            Id=1,
+        )
+
+        assert workout.WorkoutStepsArray is steps
+        assert isinstance(expanded.WorkoutStepsArray, MyWhooshWorkoutSteps)
+        assert workout.to_json_bytes(pretty=True) == expanded.to_json_bytes(pretty=True)
+        data = json.loads(workout.to_json_bytes())
+        assert [step["Id"] for step in data["WorkoutStepsArray"]] == list(range(1, 9))
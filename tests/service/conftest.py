@@ -0,0 +1,112 @@
+import json
+import re
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from pywhooshconnect.garmin.client.GarminClient import GarminClient
+from pywhooshconnect.service.roster_sync_service import RosterAccount
+
+
+def load_file(filename: str):
+    """Load JSON test data from resources directory."""
+    path = Path(__file__).parents[1] / "resources" / "garmin" / filename
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def fake_responses() -> dict:
+    """Garmin Connect responses by path, with the training plans active today."""
+    training_plans = load_file("garmin_training_plan_list.json")
+    for plan in training_plans:
+        plan["startDate"] = "2000-01-01T00:00:00.0"
+        plan["endDate"] = "2100-01-01T00:00:00.0"
+    responses = {
+        "/trainingplan-service/trainingplan/plans": {
+            "trainingPlanList": training_plans
+        },
+        "/biometric-service/powerZones/sports/all": load_file(
+            "garmin_power_zones.json"
+        ),
+    }
+    for plan in training_plans:
+        responses[
+            f"/trainingplan-service/trainingplan/phased/{plan['trainingPlanId']}"
+        ] = load_file("training_plan_details.json")
+    for path in (Path(__file__).parents[1] / "resources" / "garmin").glob(
+        "garmin_scheduled_workout_*.json"
+    ):
+        schedule_id = re.search(r"(\d+)", path.name).group(1)
+        responses[f"/workout-service/schedule/{schedule_id}"] = load_file(path.name)
+    return responses
+
+
+class FakeGarminServer:
+    """Local HTTP server answering the Garmin Connect API requests of known users."""
+
+    def __init__(self, users: set[str]):
+        self.users = users
+        self.responses = fake_responses()
+        self.requests: list[tuple[str, str]] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                user = self.headers.get("Authorization", "").removeprefix("Bearer ")
+                server.requests.append((user, self.path))
+                response = server.responses.get(self.path)
+                if user not in server.users or response is None:
+                    self._send(404, {"message": f"Not found: {self.path}"})
+                else:
+                    self._send(200, response)
+
+            def _send(self, status: int, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def client_factory(self) -> "FakeClientFactory":
+        return FakeClientFactory(self.url)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@dataclass(frozen=True)
+class FakeClientFactory:
+    """
+    Create the clients of roster accounts, sending their requests to a fake server.
+
+    Picklable, so that worker processes can create clients too.
+    """
+
+    url: str
+
+    def __call__(self, account: RosterAccount) -> GarminClient:
+        client = GarminClient(account.user, account.password)
+        client.client._connectapi = self.url
+        client.client.di_token = account.name
+        return client
+
+
+@pytest.fixture
+def server():
+    server = FakeGarminServer(users={"alice", "bob"})
+    yield server
+    server.close()
@@ -0,0 +1,167 @@
+import json
+import os
+from dataclasses import replace
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+
+from pywhooshconnect.common.model.generic_workout import (
+    GenericAtomicStep,
+    GenericIntervalStep,
+    GenericStepWithIntervals,
+    GenericWorkout,
+)
+from pywhooshconnect.common.model.generic_workout_step import StepType
+from pywhooshconnect.common.model.power_zones import PowerZones
+from pywhooshconnect.garmin.model.garmin_scheduled_workout_dto import (
+    GarminScheduledWorkout,
+)
+from pywhooshconnect.mywhoosh.mapper.power_zones_config import PowerZoneSettings
+from pywhooshconnect.service.conversion_cache import (
+    CachedConversion,
+    ConversionCache,
+    conversion_key,
+)
+
+
+def load_file(filename: str):
+    """Load JSON test data from resources directory."""
+    path = Path(__file__).parents[1] / "resources" / "garmin" / filename
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ConversionCache(directory=tmp_path)
+
+
+@pytest.fixture
+def workout():
+    return GenericWorkout(
+        name="Cached Workout",
+        description="A cached test workout",
+        scheduled_date=date(2025, 1, 1),
+        steps=[
+            GenericAtomicStep(
+                step_id=1,
+                duration_in_seconds=600,
+                power_zone=2,
+                type=StepType.WARM_UP,
+                description="Warm up",
+            ),
+            GenericStepWithIntervals(
+                step_id=2,
+                steps=[
+                    GenericIntervalStep(
+                        step_id=1,
+                        duration_in_seconds=120,
+                        power_zone=5,
+                        type=StepType.INTERVAL,
+                        rpm=100,
+                    ),
+                    GenericIntervalStep(
+                        step_id=2,
+                        duration_in_seconds=60,
+                        power_zone=None,
+                        type=StepType.RECOVERY,
+                    ),
+                ],
+                iterations=4,
+                type=StepType.INTERVAL,
+                description="Main set",
+            ),
+        ],
+    )
+
+
+@pytest.fixture
+def scheduled_workout():
+    return GarminScheduledWorkout(
+        **load_file("garmin_scheduled_workout_1408447448.json")
+    )
+
+
+class TestConversionKey:
+    def test_key_is_stable(self, scheduled_workout):
+        power_zones = PowerZones(ftp=250)
+
+        assert conversion_key(
+            scheduled_workout, power_zones, PowerZoneSettings()
+        ) == conversion_key(
+            GarminScheduledWorkout(
+                **load_file("garmin_scheduled_workout_1408447448.json")
+            ),
+            PowerZones(ftp=250),
+            PowerZoneSettings(),
+        )
+
+    def test_key_changes_with_inputs(self, scheduled_workout):
+        key = conversion_key(
+            scheduled_workout, PowerZones(ftp=250), PowerZoneSettings()
+        )
+
+        assert key != conversion_key(
+            scheduled_workout, PowerZones(ftp=260), PowerZoneSettings()
+        )
+        assert key != conversion_key(
+            scheduled_workout,
+            PowerZones(ftp=250),
+            PowerZoneSettings(zone7_multiplier=3),
+        )
+        assert key != conversion_key(
+            replace(scheduled_workout, calendarDate=date(2025, 12, 1)),
+            PowerZones(ftp=250),
+            PowerZoneSettings(),
+        )
+
+
+class TestConversionCache:
+    def test_get_returns_stored_conversion(self, cache, workout):
+        cache.set("key", CachedConversion(workout, b'{"Name":"Cached Workout"}'))
+
+        cached = cache.get("key")
+
+        assert cached.generic_workout == workout
+        assert cached.mywhoosh_json == b'{"Name":"Cached Workout"}'
+
+    def test_scheduled_datetime_is_kept(self, cache, workout):
+        workout.scheduled_date = datetime(2025, 1, 1, 7, 30)
+        cache.set("key", CachedConversion(workout, b"{}"))
+
+        assert cache.get("key").generic_workout.scheduled_date == workout.scheduled_date
+
+    def test_missing_and_corrupt_entries(self, cache, tmp_path):
+        assert cache.get("missing") is None
+
+        entry = Path(tmp_path) / "corrupt.bin"
+        entry.write_bytes(b"not zlib")
+
+        assert cache.get("corrupt") is None
+        assert not entry.exists()
+
+    def test_clear(self, cache, workout):
+        cache.set("key", CachedConversion(workout, b"{}"))
+
+        cache.clear()
+
+        assert cache.get("key") is None
+
+    def test_least_recently_used_entries_are_evicted(self, cache, workout):
+        for age, key in zip((30, 20, 10), ("a", "b", "c")):
+            cache.set(key, CachedConversion(workout, key.encode() * 100))
+            entry = cache._entry_path(key)
+            os.utime(entry, (entry.stat().st_atime, entry.stat().st_mtime - age))
+        entry_size = max(cache._entry_path(key).stat().st_size for key in "abc")
+
+        # Use the oldest entry, so that it becomes the most recently used one
+        assert cache.get("a") is not None
+
+        cache.max_size_bytes = 3 * entry_size + entry_size // 2
+        cache.set("d", CachedConversion(workout, b"d" * 100))
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+        assert cache.get("d") is not None
@@ -1,12 +1,26 @@
+import asyncio
 import json
+import re
+import time
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
 
 import pytest
 
+from pywhooshconnect.garmin.mapper.garmin_to_generic_workout import (
+    GarminToGenericScheduledWorkoutMapper,
+)
+from pywhooshconnect.garmin.model.decoding import GarminValidation
+from pywhooshconnect.garmin.model.garmin_scheduled_workout_dto import (
+    GarminScheduledWorkout,
+)
 from pywhooshconnect.garmin.model.garmin_workout_dto import GarminSport
+from pywhooshconnect.service.conversion_cache import ConversionCache
+from pywhooshconnect.service.sync_state import SyncState
 from pywhooshconnect.service.workout_sync_service import (
     GarminToMyWhooshWorkoutSyncService,
+    rerender_workouts,
 )
 
 
@@ -21,12 +35,25 @@ def load_file(filename: str):
         return json.load(f)
 
 
+def workout_files(output_dir: Path) -> list[Path]:
+    """Workout files saved in an output directory, excluding the sync state."""
+    return sorted(p for p in output_dir.glob("*.json") if p.name != SyncState.FILENAME)
+
+
+def step_values(workouts: dict, field: str) -> dict:
+    """Values of a step field in MyWhoosh workouts, by file name."""
+    return {
+        name: [step[field] for step in workout["WorkoutStepsArray"]]
+        for name, workout in workouts.items()
+    }
+
+
 class TestGarminToMyWhooshWorkoutSyncService:
 
     @pytest.fixture
     def mock_client(self, mocker):
         """Create a mock Garmin client."""
-        return mocker.Mock()
+        return mocker.Mock(username="alice@example.com")
 
     @pytest.fixture
     def service(self, mock_client):
@@ -59,27 +86,424 @@ class TestGarminToMyWhooshWorkoutSyncService:
 
         assert len(mywhoosh_workouts) == 2
 
-    def test_sync_and_download_workouts(self, service, mock_workouts_data, mocker):
-        """Test that workouts are synchronized and files are created without writing to disk."""
-        # Mock file operations to prevent actual file writes
-        mock_file = mocker.mock_open()
-        mocker.patch("pywhooshconnect.service.workout_sync_service.open", mock_file)
+    def test_sync_workouts_maps_repeated_workout_once(
+        self, service, mock_client, mock_workouts_data, mocker
+    ):
+        """Test that a workout scheduled on several dates is converted only once."""
+        scheduled_workout = load_file("garmin_scheduled_workout_1408447448.json")
+        repeated = {
+            **scheduled_workout,
+            "workoutScheduleId": 1,
+            "calendarDate": "2025-11-06",
+        }
+        mocker.patch.object(
+            service.garmin_training_plan_service,
+            "get_scheduled_workouts",
+            return_value=[
+                GarminScheduledWorkout(**scheduled_workout),
+                GarminScheduledWorkout(**repeated),
+            ],
+        )
+        map_spy = mocker.spy(GarminToGenericScheduledWorkoutMapper, "map")
+
+        mywhoosh_workouts = service.sync_workouts(
+            sport=GarminSport.CYCLING,
+            from_date=datetime(2025, 10, 29),
+            to_date=datetime(2025, 11, 6),
+        )
+
+        assert map_spy.call_count == 1
+        first, second = mywhoosh_workouts
+        assert first.Name.startswith("20251030 ")
+        assert second.Name == first.Name.replace("20251030", "20251106")
+        assert first.Id != second.Id
+        assert first.WorkoutStepsArray == second.WorkoutStepsArray
+
+    def test_sync_workouts_with_projection_validation(
+        self, service, mock_client, mock_workouts_data
+    ):
+        """Test that validating only the mapped fields converts the same workouts."""
+        kwargs = dict(
+            sport=GarminSport.CYCLING,
+            from_date=datetime(2025, 10, 29),
+            to_date=datetime(2025, 11, 2),
+        )
+        projection_service = GarminToMyWhooshWorkoutSyncService(
+            mock_client, validation=GarminValidation.PROJECTION
+        )
+
+        result = projection_service.sync_workouts(**kwargs)
+
+        expected = service.sync_workouts(**kwargs)
+        assert [(w.Name, w.WorkoutStepsArray) for w in result] == [
+            (w.Name, w.WorkoutStepsArray) for w in expected
+        ]
+
+    def test_sync_workouts_reuses_cached_conversions(
+        self, mock_client, mock_workouts_data, mocker, tmp_path
+    ):
+        """Test that a second run with a conversion cache does not map workouts again."""
+        kwargs = dict(
+            sport=GarminSport.CYCLING,
+            from_date=datetime(2025, 10, 29),
+            to_date=datetime(2025, 11, 2),
+        )
+        service = GarminToMyWhooshWorkoutSyncService(
+            mock_client, conversion_cache=ConversionCache(tmp_path)
+        )
+        first = service.sync_workouts(**kwargs)
+        map_spy = mocker.spy(GarminToGenericScheduledWorkoutMapper, "map")
+
+        second = service.sync_workouts(**kwargs)
+
+        assert map_spy.call_count == 0
+        assert [(w.Name, w.WorkoutStepsArray) for w in second] == [
+            (w.Name, w.WorkoutStepsArray) for w in first
+        ]
+        assert [w.to_json(pretty=True) for w in second] == [
+            w.to_json(pretty=True) for w in first
+        ]
+
+    def test_iter_sync_workouts(self, service, mock_workouts_data):
+        """Test that the streaming variant yields the same workouts as sync_workouts."""
+        kwargs = dict(
+            sport=GarminSport.CYCLING,
+            from_date=datetime(2025, 10, 29),
+            to_date=datetime(2025, 11, 2),
+        )
+
+        mywhoosh_workouts = list(service.iter_sync_workouts(**kwargs, queue_size=1))
 
-        output_dir = "~/downloads/"
+        assert [w.Name for w in mywhoosh_workouts] == [
+            w.Name for w in service.sync_workouts(**kwargs)
+        ]
 
+    def test_sync_and_download_workouts_saves_files_as_they_arrive(
+        self, service, mock_client, mock_workouts_data, tmp_path
+    ):
+        """Test that a workout file is written before all workouts are fetched."""
+        files_when_fetched = []
+        fetch = mock_client.get_scheduled_workout_by_id.side_effect
+
+        def get_scheduled_workout_by_id(scheduled_workout_id):
+            if scheduled_workout_id == 1408447427:  # the last workout
+                # Wait for the previous workout to be saved
+                for _ in range(100):
+                    if workout_files(tmp_path):
+                        break
+                    time.sleep(0.01)
+            files_when_fetched.append(len(workout_files(tmp_path)))
+            return fetch(scheduled_workout_id)
+
+        mock_client.get_scheduled_workout_by_id.side_effect = (
+            get_scheduled_workout_by_id
+        )
+
+        service.sync_and_download_workouts(
+            sport=GarminSport.CYCLING,
+            from_date=datetime(2025, 10, 29),
+            to_date=datetime(2025, 11, 2),
+            output_dir=str(tmp_path),
+        )
+
+        assert files_when_fetched == [0, 1]
+        assert len(workout_files(tmp_path)) == 2
+
+    def test_sync_and_download_workouts(self, service, mock_workouts_data, tmp_path):
+        """Test that workouts are synchronized and saved as files in the output directory."""
+        service.sync_and_download_workouts(
+            sport=GarminSport.CYCLING,
+            from_date=datetime(2025, 10, 29),
+            to_date=datetime(2025, 11, 2),
+            output_dir=str(tmp_path),
+        )
+
+        # Verify two files were written, plus the sync state
+        files = [p.name for p in workout_files(tmp_path)]
+        assert len(files) == 2
+        assert all(name.startswith(("20251030", "20251102")) for name in files)
+        assert (tmp_path / SyncState.FILENAME).exists()
+
+    def test_sync_and_download_workouts_matches_baseline_file(
+        self, service, mock_workouts_data, tmp_path
+    ):
+        """Test that files are written byte for byte as by the original serializer."""
         service.sync_and_download_workouts(
+            sport=GarminSport.CYCLING,
+            from_date=datetime(2025, 11, 2),
+            to_date=datetime(2025, 11, 2),
+            output_dir=str(tmp_path),
+        )
+
+        (written,) = workout_files(tmp_path)
+        data = written.read_bytes()
+        baseline = (
+            Path(__file__).parents[1]
+            / "resources"
+            / "mywhoosh"
+            / "mywhoosh_workout_1408447427.json"
+        ).read_bytes()
+        # Workout Ids were random when the baseline was written
+        workout_id = re.search(rb'\n    "Id": \d+', data).group()
+        assert data == re.sub(rb'\n    "Id": \d+', workout_id, baseline)
+
+    def test_sync_and_download_workouts_skips_unchanged(
+        self, service, mock_client, mock_workouts_data, tmp_path
+    ):
+        """Test that a second sync neither fetches nor rewrites unchanged workouts."""
+        kwargs = dict(
             sport=GarminSport.CYCLING,
             from_date=datetime(2025, 10, 29),
             to_date=datetime(2025, 11, 2),
-            output_dir=output_dir,
+            output_dir=str(tmp_path),
         )
+        service.sync_and_download_workouts(**kwargs)
+        mtimes = {p: p.stat().st_mtime_ns for p in workout_files(tmp_path)}
+        mock_client.get_scheduled_workout_by_id.reset_mock()
 
-        # Verify two files were opened for writing
-        assert mock_file.call_count == 2
+        service.sync_and_download_workouts(**kwargs)
 
-        # Verify file paths are correct
-        calls = mock_file.call_args_list
-        for call in calls:
-            filepath = call[0][0]
-            assert str(filepath).startswith(str(Path(output_dir).expanduser()))
-            assert str(filepath).endswith(".json")
+        mock_client.get_scheduled_workout_by_id.assert_not_called()
+        assert {p: p.stat().st_mtime_ns for p in workout_files(tmp_path)} == mtimes
+
+    def test_sync_workouts_ids_are_stable(self, service, mock_workouts_data):
+        """Test that the same scheduled workouts get the same Ids on every run."""
+        kwargs = dict(
+            sport=GarminSport.CYCLING,
+            from_date=datetime(2025, 10, 29),
+            to_date=datetime(2025, 11, 2),
+        )
+
+        first = service.sync_workouts(**kwargs)
+        second = service.sync_workouts(**kwargs)
+
+        assert [w.Id for w in first] == [w.Id for w in second]
+        assert len({w.Id for w in first}) == len(first)
+
+    def test_sync_and_download_workouts_keeps_unchanged_files(
+        self, service, mock_workouts_data, tmp_path
+    ):
+        """Test that a full sync does not write files whose content is unchanged."""
+        kwargs = dict(
+            sport=GarminSport.CYCLING,
+            from_date=datetime(2025, 10, 29),
+            to_date=datetime(2025, 11, 2),
+            output_dir=str(tmp_path),
+        )
+        service.sync_and_download_workouts(**kwargs)
+        contents = {p: p.read_bytes() for p in workout_files(tmp_path)}
+        mtimes = {p: p.stat().st_mtime_ns for p in workout_files(tmp_path)}
+        time.sleep(0.01)
+
+        service.sync_and_download_workouts(**kwargs, full_sync=True)
+
+        assert {p: p.read_bytes() for p in workout_files(tmp_path)} == contents
+        assert {p: p.stat().st_mtime_ns for p in workout_files(tmp_path)} == mtimes
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_sync_and_download_workouts_rewrites_modified_file(
+        self, service, mock_client, mock_workouts_data, tmp_path
+    ):
+        """Test that a file modified since the last sync is written again."""
+        kwargs = dict(
+            sport=GarminSport.CYCLING,
+            from_date=datetime(2025, 10, 29),
+            to_date=datetime(2025, 11, 2),
+            output_dir=str(tmp_path),
+        )
+        service.sync_and_download_workouts(**kwargs)
+        modified = workout_files(tmp_path)[0]
+        modified.write_text("{}")
+        mock_client.get_scheduled_workout_by_id.reset_mock()
+
+        service.sync_and_download_workouts(**kwargs)
+
+        mock_client.get_scheduled_workout_by_id.assert_called_once()
+        assert modified.read_text() != "{}"
+
+    def test_sync_and_download_workouts_moves_rescheduled_workouts(
+        self, service, mock_client, mock_workouts_data, tmp_path
+    ):
+        """Test that a workout moved to another day is written again for its new date."""
+        kwargs = dict(
+            sport=GarminSport.CYCLING,
+            from_date=datetime(2025, 10, 29),
+            to_date=datetime(2025, 11, 2),
+            output_dir=str(tmp_path),
+        )
+        service.sync_and_download_workouts(**kwargs)
+
+        # Move the workout of 2025-11-02 to 2025-11-01: same schedule id and definition
+        plan_details = load_file("training_plan_details.json")
+        for task in plan_details["taskList"]:
+            if (task["taskWorkout"] or {}).get("workoutScheduleId") == 1408447427:
+                task["calendarDate"] = "2025-11-01"
+        mock_client.get_training_plan_by_id.return_value = plan_details
+        scheduled_workout = load_file("garmin_scheduled_workout_1408447427.json")
+        scheduled_workout["calendarDate"] = "2025-11-01"
+        mock_client.get_scheduled_workout_by_id.side_effect = lambda schedule_id: (
+            scheduled_workout
+            if schedule_id == 1408447427
+            else load_file(f"garmin_scheduled_workout_{schedule_id}.json")
+        )
+        service.sync_and_download_workouts(**kwargs)
+
+        files = [p.name for p in workout_files(tmp_path)]
+        assert len(files) == 2
+        assert any(name.startswith("20251101") for name in files)
+        assert not any(name.startswith("20251102") for name in files)
+        entry = SyncState.load(tmp_path).entries[1408447427]
+        assert entry.calendar_date.isoformat() == "2025-11-01"
+        assert entry.filename.startswith("20251101")
+
+    def test_sync_and_download_workouts_removes_unscheduled_workouts(
+        self, service, mock_client, mock_workouts_data, tmp_path
+    ):
+        """Test that files of workouts removed from the training plan are deleted."""
+        kwargs = dict(
+            sport=GarminSport.CYCLING,
+            from_date=datetime(2025, 10, 29),
+            to_date=datetime(2025, 11, 2),
+            output_dir=str(tmp_path),
+        )
+        service.sync_and_download_workouts(**kwargs)
+
+        plan_details = load_file("training_plan_details.json")
+        plan_details["taskList"] = [
+            task
+            for task in plan_details["taskList"]
+            if (task["taskWorkout"] or {}).get("workoutScheduleId") != 1408447427
+        ]
+        mock_client.get_training_plan_by_id.return_value = plan_details
+        service.sync_and_download_workouts(**kwargs)
+
+        files = [p.name for p in workout_files(tmp_path)]
+        assert len(files) == 1
+        assert files[0].startswith("20251030")
+        assert list(SyncState.load(tmp_path).entries) == [1408447448]
+
+    def test_sync_and_download_workouts_keeps_files_of_other_syncs(
+        self, service, mock_client, mock_workouts_data, mocker, tmp_path
+    ):
+        """Test that syncing another sport or account into the same directory removes
+        none of the files of the first sync."""
+        kwargs = dict(
+            from_date=datetime(2025, 10, 29),
+            to_date=datetime(2025, 11, 2),
+            output_dir=str(tmp_path),
+        )
+        service.sync_and_download_workouts(sport=GarminSport.CYCLING, **kwargs)
+        files = workout_files(tmp_path)
+        assert len(files) == 2
+
+        mock_client.get_training_plans.return_value = []
+        service.sync_and_download_workouts(sport=GarminSport.RUNNING, **kwargs)
+        other_client = mocker.Mock(username="bob@example.com")
+        other_client.get_training_plans.return_value = []
+        other_client.get_power_zones.return_value = (
+            mock_client.get_power_zones.return_value
+        )
+        GarminToMyWhooshWorkoutSyncService(other_client).sync_and_download_workouts(
+            sport=GarminSport.CYCLING, **kwargs
+        )
+
+        assert workout_files(tmp_path) == files
+        assert {entry.user for entry in SyncState.load(tmp_path).entries.values()} == {
+            "alice@example.com"
+        }
+
+    def test_rerender_workouts(self, mock_client, mock_workouts_data, mocker, tmp_path):
+        """Test that new power zones render the synced files again, without Garmin."""
+        cache = ConversionCache(tmp_path / "cache")
+        output_dir = tmp_path / "output"
+        GarminToMyWhooshWorkoutSyncService(
+            mock_client, conversion_cache=cache
+        ).sync_and_download_workouts(
+            sport=GarminSport.CYCLING,
+            from_date=datetime(2025, 10, 29),
+            to_date=datetime(2025, 11, 2),
+            output_dir=str(output_dir),
+        )
+        before = {p.name: json.loads(p.read_text()) for p in workout_files(output_dir)}
+        power_zones = SyncState.load(output_dir).power_zones
+        mock_client.reset_mock()
+        map_spy = mocker.spy(GarminToGenericScheduledWorkoutMapper, "map")
+
+        written = rerender_workouts(
+            output_dir, cache, replace(power_zones, z2_floor=0.6, z3_floor=0.8)
+        )
+
+        assert not mock_client.method_calls
+        assert map_spy.call_count == 0
+        after = {p.name: json.loads(p.read_text()) for p in workout_files(output_dir)}
+        assert step_values(after, "Time") == step_values(before, "Time")
+
+        # Only the files whose power targets changed are written
+        powers, previous_powers = step_values(after, "Power"), step_values(
+            before, "Power"
+        )
+        changed = {name for name in after if powers[name] != previous_powers[name]}
+        assert changed
+        assert {p.name for p in written} == changed
+
+        # Files already rendered with the same power zones are left untouched
+        assert rerender_workouts(output_dir, cache) == []
+
+    def test_rerender_workouts_skips_evicted_conversions(
+        self, mock_client, mock_workouts_data, tmp_path
+    ):
+        """Test that workouts no longer in the cache are left for the next sync."""
+        cache = ConversionCache(tmp_path / "cache")
+        output_dir = tmp_path / "output"
+        GarminToMyWhooshWorkoutSyncService(
+            mock_client, conversion_cache=cache
+        ).sync_and_download_workouts(
+            sport=GarminSport.CYCLING,
+            from_date=datetime(2025, 10, 29),
+            to_date=datetime(2025, 11, 2),
+            output_dir=str(output_dir),
+        )
+        state = SyncState.load(output_dir)
+        cache.clear()
+
+        written = rerender_workouts(
+            output_dir, cache, replace(state.power_zones, ftp=1)
+        )
+
+        assert written == []
+        assert SyncState.load(output_dir).entries == state.entries
+
+    def test_sync_workouts_async(self, service, mock_workouts_data, mocker):
+        """Test that the async variant fetches through the async client."""
+        async_client = mocker.AsyncMock()
+        async_client.get_training_plans.return_value = load_file(
+            "garmin_training_plan_list.json"
+        )
+        async_client.get_training_plan_by_id.return_value = load_file(
+            "training_plan_details.json"
+        )
+        async_client.get_scheduled_workout_by_id.side_effect = (
+            lambda scheduled_workout_id: load_file(
+                f"garmin_scheduled_workout_{scheduled_workout_id}.json"
+            )
+        )
+        async_client.get_power_zones.return_value = load_file("garmin_power_zones.json")
+
+        mywhoosh_workouts = asyncio.run(
+            service.sync_workouts_async(
+                sport=GarminSport.CYCLING,
+                from_date=datetime(2025, 10, 29),
+                to_date=datetime(2025, 11, 2),
+                async_client=async_client,
+            )
+        )
+
+        assert [w.Name for w in mywhoosh_workouts] == [
+            w.Name
+            for w in service.sync_workouts(
+                sport=GarminSport.CYCLING,
+                from_date=datetime(2025, 10, 29),
+                to_date=datetime(2025, 11, 2),
+            )
+        ]
+        assert len(mywhoosh_workouts) == 2
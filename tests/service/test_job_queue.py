@@ -0,0 +1,252 @@
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+from garminconnect import GarminConnectAuthenticationError
+
+from pywhooshconnect.garmin.client.rate_limit import RetryPolicy
+from pywhooshconnect.garmin.client.response_cache import ResponseCache
+from pywhooshconnect.service.conversion_cache import ConversionCache
+from pywhooshconnect.service.job_queue import (
+    JobQueue,
+    JobStatus,
+    JobWorker,
+    run_worker_processes,
+)
+from pywhooshconnect.service.roster_sync_service import RosterAccount
+from pywhooshconnect.service.sync_state import SyncState
+
+FROM_DATE = date(2025, 10, 29)
+TO_DATE = date(2025, 11, 2)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    return JobQueue(
+        tmp_path / "jobs.db",
+        lease_seconds=60,
+        retry_policy=RetryPolicy(
+            max_attempts=3, base_delay_seconds=10, max_delay_seconds=10
+        ),
+        clock=clock,
+    )
+
+
+def workout_files(output_dir: Path) -> list[Path]:
+    return sorted(p for p in output_dir.glob("*.json") if p.name != SyncState.FILENAME)
+
+
+class TestJobQueue:
+    def test_claim_and_complete(self, queue):
+        job_id = queue.enqueue("alice", FROM_DATE, TO_DATE)
+
+        job = queue.claim()
+
+        assert job.id == job_id
+        assert (job.account, job.from_date, job.to_date) == (
+            "alice",
+            FROM_DATE,
+            TO_DATE,
+        )
+        assert job.status == JobStatus.RUNNING
+        assert job.attempts == 1
+        assert queue.claim() is None
+        assert queue.complete(job)
+        assert queue.get(job_id).status == JobStatus.DONE
+        assert queue.unfinished() == 0
+
+    def test_completion_is_idempotent(self, queue):
+        queue.enqueue("alice", FROM_DATE, TO_DATE)
+        job = queue.claim()
+
+        assert queue.complete(job)
+        assert not queue.complete(job)
+        assert not queue.fail(job, RuntimeError("late failure"))
+        assert queue.get(job.id).status == JobStatus.DONE
+
+    def test_jobs_are_not_enqueued_twice(self, queue):
+        job_id = queue.enqueue("alice", FROM_DATE, TO_DATE)
+
+        assert queue.enqueue("alice", datetime(2025, 10, 29), TO_DATE) == job_id
+        assert queue.enqueue("bob", FROM_DATE, TO_DATE) != job_id
+
+        queue.complete(queue.claim())
+        assert queue.enqueue("alice", FROM_DATE, TO_DATE) == job_id
+        assert queue.unfinished() == 1  # bob
+
+    def test_requeue_adds_done_jobs_again(self, queue):
+        job_id = queue.enqueue("alice", FROM_DATE, TO_DATE)
+        queue.complete(queue.claim())
+
+        requeued_id = queue.enqueue("alice", FROM_DATE, TO_DATE, requeue=True)
+
+        assert requeued_id != job_id
+        assert queue.enqueue("alice", FROM_DATE, TO_DATE, requeue=True) == requeued_id
+        assert queue.enqueue("alice", FROM_DATE, TO_DATE) == requeued_id
+
+    def test_failed_jobs_are_enqueued_again(self, queue):
+        job_id = queue.enqueue("alice", FROM_DATE, TO_DATE)
+        queue.fail(queue.claim(), GarminConnectAuthenticationError("bad password"))
+
+        assert queue.enqueue("alice", FROM_DATE, TO_DATE) != job_id
+
+    def test_jobs_persist_across_queues(self, queue, tmp_path):
+        job_id = queue.enqueue("alice", FROM_DATE, TO_DATE)
+
+        assert JobQueue(tmp_path / "jobs.db").get(job_id).account == "alice"
+
+    def test_expired_lease_is_claimed_by_another_worker(self, queue, clock):
+        queue.enqueue("alice", FROM_DATE, TO_DATE)
+        crashed = queue.claim()
+
+        clock.now += 30
+        assert queue.claim() is None
+
+        clock.now += 31
+        recovered = queue.claim()
+        assert recovered.id == crashed.id
+        assert recovered.attempts == 2
+
+        # The crashed worker lost its lease: it can no longer complete the job
+        assert not queue.complete(crashed)
+        assert queue.complete(recovered)
+
+    def test_heartbeat_renews_the_lease(self, queue, clock):
+        queue.enqueue("alice", FROM_DATE, TO_DATE)
+        job = queue.claim()
+
+        clock.now += 50
+        assert queue.heartbeat(job)
+        clock.now += 50
+        assert queue.claim() is None
+
+    def test_failed_jobs_are_retried_with_backoff(self, queue, clock, mocker):
+        mocker.patch("random.uniform", side_effect=lambda low, high: high)
+        queue.enqueue("alice", FROM_DATE, TO_DATE)
+
+        for attempt in (1, 2):
+            job = queue.claim()
+            assert job.attempts == attempt
+            assert queue.fail(job, ConnectionError("timeout"))
+            assert queue.get(job.id).status == JobStatus.PENDING
+            assert queue.claim() is None
+            clock.now += 10
+
+        job = queue.claim()
+        queue.fail(job, ConnectionError("timeout"))
+
+        failed = queue.get(job.id)
+        assert failed.status == JobStatus.FAILED
+        assert failed.error == "ConnectionError: timeout"
+        assert queue.unfinished() == 0
+
+    def test_permanent_errors_are_not_retried(self, queue):
+        queue.enqueue("alice", FROM_DATE, TO_DATE)
+        job = queue.claim()
+
+        queue.fail(job, GarminConnectAuthenticationError("bad password"))
+
+        assert queue.get(job.id).status == JobStatus.FAILED
+
+    def test_job_crashing_every_attempt_fails(self, queue, clock):
+        job_id = queue.enqueue("alice", FROM_DATE, TO_DATE)
+        for _ in range(3):
+            assert queue.claim().id == job_id
+            clock.now += 61
+
+        assert queue.claim() is None
+        assert queue.get(job_id).status == JobStatus.FAILED
+
+
+class TestJobWorker:
+    def test_run(self, server, tmp_path):
+        queue = JobQueue(
+            tmp_path / "jobs.db",
+            retry_policy=RetryPolicy(
+                max_attempts=2, base_delay_seconds=0.01, max_delay_seconds=0.01
+            ),
+        )
+        accounts = [
+            RosterAccount(name, f"{name}@example.com", tmp_path / name)
+            for name in ("alice", "bob", "carol")
+        ]
+        for account in accounts:
+            queue.enqueue(account.name, FROM_DATE, TO_DATE)
+        queue.enqueue("dave", FROM_DATE, TO_DATE)  # not in the roster
+        worker = JobWorker(
+            queue,
+            accounts,
+            client_factory=server.client_factory,
+            poll_interval_seconds=0.01,
+        )
+
+        worker.run()
+
+        statuses = {job.account: job.status for job in queue.jobs()}
+        assert statuses == {
+            "alice": JobStatus.DONE,
+            "bob": JobStatus.DONE,
+            "carol": JobStatus.FAILED,  # unknown to the server, retried then failed
+            "dave": JobStatus.FAILED,
+        }
+        assert len(workout_files(tmp_path / "alice")) == 2
+        assert len(workout_files(tmp_path / "bob")) == 2
+
+    def test_run_uses_the_caches(self, server, tmp_path, mocker):
+        login = mocker.patch(
+            "pywhooshconnect.service.job_queue.login",
+            side_effect=lambda account, cache: server.client_factory(account),
+        )
+        response_cache = ResponseCache(tmp_path / "responses")
+        conversion_cache = ConversionCache(tmp_path / "conversions")
+        queue = JobQueue(tmp_path / "jobs.db")
+        account = RosterAccount("alice", "alice@example.com", tmp_path / "alice")
+        queue.enqueue(account.name, FROM_DATE, TO_DATE)
+        worker = JobWorker(
+            queue,
+            [account],
+            response_cache=response_cache,
+            conversion_cache=conversion_cache,
+        )
+
+        worker.run()
+
+        assert queue.jobs()[0].status == JobStatus.DONE
+        login.assert_called_once_with(account, response_cache)
+        assert list((tmp_path / "conversions").glob("*.bin"))
+
+
+def test_run_worker_processes(server, tmp_path):
+    roster = tmp_path / "roster.yml"
+    roster.write_text(
+        "accounts:\n"
+        + "".join(
+            f"  - {{name: {name}, user: {name}@example.com, "
+            f"output_dir: {tmp_path / name}}}\n"
+            for name in ("alice", "bob")
+        )
+    )
+    queue = JobQueue(tmp_path / "jobs.db")
+    for name in ("alice", "bob"):
+        queue.enqueue(name, FROM_DATE, TO_DATE)
+
+    run_worker_processes(
+        queue.path, roster, processes=2, client_factory=server.client_factory
+    )
+
+    assert [job.status for job in queue.jobs()] == [JobStatus.DONE, JobStatus.DONE]
+    assert len(workout_files(tmp_path / "alice")) == 2
+    assert len(workout_files(tmp_path / "bob")) == 2
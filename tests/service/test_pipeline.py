@@ -0,0 +1,64 @@
+import threading
+
+import pytest
+
+from pywhooshconnect.service.pipeline import run_in_thread
+
+
+class TestRunInThread:
+
+    def test_items_are_yielded_in_order(self):
+        assert list(run_in_thread(range(100), maxsize=3)) == list(range(100))
+
+    def test_producer_runs_at_most_maxsize_items_ahead(self):
+        produced = []
+        blocked = threading.Event()
+
+        def items():
+            for i in range(100):
+                produced.append(i)
+                if len(produced) == 4:
+                    blocked.set()
+                yield i
+
+        iterator = run_in_thread(items(), maxsize=2)
+        assert next(iterator) == 0
+        blocked.wait(timeout=1)
+
+        # One item consumed, two queued, one waiting for room in the queue
+        assert len(produced) <= 4
+        iterator.close()
+
+    def test_producer_errors_are_raised_to_the_consumer(self):
+        def items():
+            yield 1
+            raise RuntimeError("fetch failed")
+
+        iterator = run_in_thread(items())
+
+        assert next(iterator) == 1
+        with pytest.raises(RuntimeError, match="fetch failed"):
+            next(iterator)
+
+    def test_closing_stops_the_producer(self):
+        closed = threading.Event()
+
+        def items():
+            try:
+                i = 0
+                while True:
+                    yield i
+                    i += 1
+            finally:
+                closed.set()
+
+        iterator = run_in_thread(items(), maxsize=1)
+        assert next(iterator) == 0
+
+        iterator.close()
+
+        assert closed.is_set()
+
+    def test_invalid_maxsize_raises_error(self):
+        with pytest.raises(ValueError, match="maxsize must be at least 1"):
+            run_in_thread([], maxsize=0)
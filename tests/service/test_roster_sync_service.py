@@ -0,0 +1,169 @@
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from pywhooshconnect.garmin.model.garmin_workout_dto import GarminSport
+from pywhooshconnect.service.roster_sync_service import (
+    AccountSyncResult,
+    RosterAccount,
+    RosterError,
+    RosterSyncService,
+    format_report,
+    load_roster,
+)
+from pywhooshconnect.service.sync_state import SyncState
+from pywhooshconnect.service.workout_sync_service import (
+    GarminToMyWhooshWorkoutSyncService,
+)
+
+FROM_DATE = datetime(2025, 10, 29)
+TO_DATE = datetime(2025, 11, 2)
+
+
+def account(name: str, tmp_path: Path) -> RosterAccount:
+    return RosterAccount(
+        name=name, user=f"{name}@example.com", output_dir=tmp_path / name
+    )
+
+
+def workout_files(output_dir: Path) -> list[Path]:
+    return sorted(p for p in output_dir.glob("*.json") if p.name != SyncState.FILENAME)
+
+
+class TestLoadRoster:
+    def test_load_roster(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("BOB_PASSWORD", "secret")
+        roster = tmp_path / "roster.yml"
+        roster.write_text("""
+defaults:
+  config_file: ~/zones.yml
+accounts:
+  - name: alice
+    user: alice@example.com
+    password: alice-password
+    output_dir: ~/athletes/alice
+    sport: running
+  - name: bob
+    user: bob@example.com
+    password_env: BOB_PASSWORD
+    output_dir: ~/athletes/bob
+    token_dir: ~/tokens/bob
+""")
+
+        alice, bob = load_roster(roster)
+
+        assert alice.password == "alice-password"
+        assert alice.sport == GarminSport.RUNNING
+        assert alice.output_dir == Path("~/athletes/alice").expanduser()
+        assert alice.config_file == Path("~/zones.yml").expanduser()
+        assert alice.token_dir == Path("~/.garminconnect/alice").expanduser()
+        assert bob.password == "secret"
+        assert bob.sport == GarminSport.CYCLING
+        assert bob.token_dir == Path("~/tokens/bob").expanduser()
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "accounts: alice",
+            "accounts:\n  - name: alice\n    user: alice@example.com",
+            "accounts:\n  - {name: a, user: a, output_dir: a, sport: rowing}",
+            "accounts:\n  - {name: a, user: a, output_dir: a}\n"
+            "  - {name: a, user: b, output_dir: b}",
+            # Same output directory, or token directory
+            "accounts:\n  - {name: a, user: a, output_dir: out}\n"
+            "  - {name: b, user: b, output_dir: ./out/../out}",
+            "accounts:\n  - {name: a, user: a, output_dir: a, token_dir: tokens}\n"
+            "  - {name: b, user: b, output_dir: b, token_dir: tokens}",
+        ],
+    )
+    def test_invalid_roster(self, tmp_path, content):
+        roster = tmp_path / "roster.yml"
+        roster.write_text(content)
+
+        with pytest.raises(RosterError):
+            load_roster(roster)
+
+
+class TestRosterSyncService:
+    def test_sync_accounts(self, server, tmp_path):
+        """Test that every account is synchronized into its own output directory."""
+        accounts = [account("alice", tmp_path), account("bob", tmp_path)]
+        service = RosterSyncService(accounts, client_factory=server.client_factory)
+
+        results = service.sync_and_download_workouts(FROM_DATE, TO_DATE)
+
+        assert [(r.name, r.succeeded) for r in results] == [
+            ("alice", True),
+            ("bob", True),
+        ]
+        for name in ("alice", "bob"):
+            assert len(workout_files(tmp_path / name)) == 2
+            assert any(user == name for user, _ in server.requests)
+
+    def test_failing_account_does_not_stop_the_others(self, server, tmp_path):
+        """Test that an account failing to sync is reported, and the others complete."""
+        accounts = [account(name, tmp_path) for name in ("alice", "carol", "bob")]
+        service = RosterSyncService(accounts, client_factory=server.client_factory)
+
+        alice, carol, bob = service.sync_and_download_workouts(FROM_DATE, TO_DATE)
+
+        assert alice.succeeded and bob.succeeded
+        assert not carol.succeeded
+        assert "404" in carol.error
+        assert len(workout_files(tmp_path / "bob")) == 2
+        assert not workout_files(tmp_path / "carol")
+
+    def test_concurrent_accounts_are_capped(self, server, tmp_path, mocker):
+        """Test that no more than `max_concurrent_accounts` accounts sync at once."""
+        active, max_active, lock = 0, 0, threading.Lock()
+        sync = GarminToMyWhooshWorkoutSyncService.sync_and_download_workouts
+
+        def tracked_sync(self, **kwargs):
+            nonlocal active, max_active
+            with lock:
+                active += 1
+                max_active = max(max_active, active)
+            try:
+                time.sleep(0.05)
+                return sync(self, **kwargs)
+            finally:
+                with lock:
+                    active -= 1
+
+        mocker.patch.object(
+            GarminToMyWhooshWorkoutSyncService,
+            "sync_and_download_workouts",
+            tracked_sync,
+        )
+        accounts = [account(f"athlete{i}", tmp_path) for i in range(5)]
+        server.users.update(a.name for a in accounts)
+        service = RosterSyncService(
+            accounts, max_concurrent_accounts=2, client_factory=server.client_factory
+        )
+
+        results = service.sync_and_download_workouts(FROM_DATE, TO_DATE)
+
+        assert all(result.succeeded for result in results)
+        assert max_active == 2
+
+    def test_invalid_concurrency(self):
+        with pytest.raises(ValueError):
+            RosterSyncService([], max_concurrent_accounts=0)
+
+
+def test_format_report():
+    report = format_report(
+        [
+            AccountSyncResult("alice", 1.5),
+            AccountSyncResult("bob", 0.25, error="GarminConnectConnectionError: 404"),
+        ]
+    )
+
+    lines = report.splitlines()
+    assert lines[1].split() == ["alice", "ok", "1.50s"]
+    assert lines[2].split()[:3] == ["bob", "failed", "0.25s"]
+    assert lines[2].endswith("GarminConnectConnectionError: 404")
+    assert lines[-1] == "1 accounts synchronized, 1 failed, 1.75s in total"